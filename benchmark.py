@@ -0,0 +1,531 @@
+"""
+Çevrim dışı performans ölçümü.
+
+Gerçek Redmine/Mattermost sunucularına gitmeden, sentetik veri üreten yerel bir HTTP sunucusu
+(Redmine REST + Mattermost API v4'ün uygulamanın kullandığı uç noktaları) başlatır ve
+arama, filtreleme ve dışa aktarma adımlarının gecikme, verim ve en yüksek bellek kullanımını ölçer.
+
+Örnek:
+    python benchmark.py --issues 100000 --posts 100000 --rounds 3
+    python benchmark.py --issues 1000000 --scenarios redmine_mirror_build,redmine_mirror_search --json sonuc.json
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Sentetik başlık/mesajlarda kullanılan kelimeler (Türkçe harfler dahil)
+WORDS = [
+    "yama", "notu", "sunucu", "veritabanı", "İstanbul", "ılık", "rapor", "güncelleme", "hata", "düzeltme",
+    "kurulum", "pharmacircle", "entegrasyon", "ölçüm", "kullanıcı", "yetki", "şablon", "çıktı", "arşiv", "test"
+]
+HASHTAGS = ["#atp", "#yama", "#rapor", "#kurulum", "#entegrasyon"]
+TRACKERS = ["Bug", "Feature", "Support"]
+STATUSES = ["New", "In Progress", "Resolved", "Closed"]
+AUTHORS = [f"Kullanıcı {i}" for i in range(50)]
+
+# Hedef kanallar iki ayrı takımda; üçüncü kanal hedef değildir (aramanın kanal kapsamını ölçmek için)
+CHANNEL_IDS = ["benchchannel0000000000000a", "benchchannel0000000000000b"]
+OTHER_CHANNEL_ID = "benchchannel0000000000000c"
+TEAM_ID = "benchteam00000000000000000"
+SECOND_TEAM_ID = "benchteam00000000000000001"
+CHANNELS = {
+    CHANNEL_IDS[0]: {"team_id": TEAM_ID, "name": "bench-a"},
+    CHANNEL_IDS[1]: {"team_id": SECOND_TEAM_ID, "name": "bench-b"},
+    OTHER_CHANNEL_ID: {"team_id": TEAM_ID, "name": "bench-other"}
+}
+
+# ==============================================================================
+# 1. SENTETİK VERİ ÜRETİMİ
+# ==============================================================================
+def random_text(rng, word_count, hashtag_rate):
+    words = [rng.choice(WORDS) for _ in range(word_count)]
+    if rng.random() < hashtag_rate:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(HASHTAGS))
+    return " ".join(words)
+
+def generate_issues(count, seed):
+    """
+    /issues.json biçiminde sentetik Redmine issue'ları üretir
+    """
+    rng = random.Random(seed)
+    start = datetime.datetime(2022, 1, 1)
+    issues = []
+    for issue_id in range(1, count + 1):
+        created_on = start + datetime.timedelta(minutes=issue_id * 7)
+        issues.append({
+            "id": issue_id,
+            "project": {"id": 1, "name": "Bench"},
+            "tracker": {"id": 1, "name": rng.choice(TRACKERS)},
+            "status": {"id": 1, "name": rng.choice(STATUSES)},
+            "priority": {"id": 2, "name": "Normal"},
+            "author": {"id": 1, "name": rng.choice(AUTHORS)},
+            "subject": random_text(rng, rng.randint(3, 8), 0.05),
+            "description": random_text(rng, rng.randint(20, 120), 0.05),
+            "created_on": created_on.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            "updated_on": (created_on + datetime.timedelta(hours=rng.randint(0, 500))).strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+    return issues
+
+def generate_posts(count, max_thread_depth, seed):
+    """
+    Kanallara dağılmış, 0..max_thread_depth yanıtlı sentetik Mattermost thread'leri üretir
+    """
+    rng = random.Random(seed + 1)
+    start_ms = int(datetime.datetime(2022, 1, 1).timestamp() * 1000)
+    posts = {}
+    post_index = 0
+    while post_index < count:
+        channel_id = rng.choice(list(CHANNELS))
+        root_id = f"post{post_index:022d}"
+        create_at = start_ms + post_index * 60000
+        root_message = random_text(rng, rng.randint(5, 30), 0.3)
+        posts[root_id] = mattermost_post(rng, root_id, channel_id, "", root_message, create_at)
+        post_index += 1
+
+        for reply_number in range(rng.randint(0, max_thread_depth)):
+            if post_index >= count:
+                break
+            reply_id = f"post{post_index:022d}"
+            message = random_text(rng, rng.randint(3, 20), 0.2)
+            if rng.random() < 0.1:
+                message += " killed a prey"
+            posts[reply_id] = mattermost_post(rng, reply_id, channel_id, root_id, message, create_at + (reply_number + 1) * 1000)
+            # Mattermost gibi yanıt gelince kök post'un son yanıt ve değişiklik zamanı ilerler
+            posts[root_id]["last_reply_at"] = posts[root_id]["update_at"] = posts[reply_id]["create_at"]
+            post_index += 1
+    return posts
+
+def mattermost_post(rng, post_id, channel_id, root_id, message, create_at):
+    return {
+        "id": post_id,
+        "channel_id": channel_id,
+        "root_id": root_id,
+        "user_id": f"user{rng.randrange(50):022d}",
+        "message": message,
+        "hashtags": " ".join(word for word in message.split() if word.startswith('#')),
+        "create_at": create_at,
+        "update_at": create_at,
+        "delete_at": 0
+    }
+
+def mattermost_user(user_id):
+    number = int(user_id[4:])
+    return {"id": user_id, "username": f"kullanici{number}", "first_name": "Kullanıcı", "last_name": str(number)}
+
+# ==============================================================================
+# 2. YEREL SUNUCU (REDMINE + MATTERMOST)
+# ==============================================================================
+class BenchmarkData:
+    """
+    Sunucunun cevap verdiği veri kümesi ve sık kullanılan dizinler
+    """
+    def __init__(self, issues, posts, latency_ms=0):
+        self.issues = issues
+        self.issues_by_id = {issue['id']: issue for issue in issues}
+        self.posts = posts
+        self.latency = latency_ms / 1000
+        self.lock = threading.Lock()
+        self.search_index = {}  # arama terimi -> eşleşen issue ID'leri
+
+        self.threads = {}
+        self.channel_posts = {channel_id: [] for channel_id in CHANNELS}
+        for post in posts.values():
+            thread_id = post['root_id'] or post['id']
+            self.threads.setdefault(thread_id, []).append(post['id'])
+            self.channel_posts[post['channel_id']].append(post['id'])
+        for post_ids in self.channel_posts.values():
+            # Mattermost kanal sayfaları yeniden eskiye sıralıdır
+            post_ids.sort(key=lambda post_id: posts[post_id]['create_at'], reverse=True)
+
+    def redmine_search_ids(self, term):
+        folded = term.lower()
+        with self.lock:
+            if folded not in self.search_index:
+                self.search_index[folded] = [
+                    issue['id'] for issue in self.issues
+                    if folded in issue['subject'].lower() or folded in issue['description'].lower()
+                ]
+            return self.search_index[folded]
+
+class BenchmarkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive; uygulamanın bağlantı havuzu da ölçülmüş olur
+    data = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.route('GET')
+
+    def do_POST(self):
+        self.route('POST')
+
+    def route(self, method):
+        if self.data.latency:
+            time.sleep(self.data.latency)
+
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = None
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+
+        path = url.path
+        if path == '/issues.json':
+            return self.send_json(self.redmine_issues(params))
+        if path.endswith('/search.json'):
+            return self.send_json(self.redmine_search(params))
+        if path == '/api/v4/users/me/teams':
+            return self.send_json([{"id": TEAM_ID, "name": "bench"}, {"id": SECOND_TEAM_ID, "name": "bench-2"}])
+        if path.startswith('/api/v4/teams/') and path.endswith('/posts/search'):
+            return self.send_json(self.mattermost_search(path.split('/')[4], body or {}))
+        if path == '/api/v4/users/ids':
+            return self.send_json([mattermost_user(user_id) for user_id in body or [] if user_id.startswith("user")])
+        if path == '/api/v4/posts/ids':
+            return self.send_json([self.data.posts[post_id] for post_id in body or [] if post_id in self.data.posts])
+        if path.startswith('/api/v4/posts/') and path.endswith('/thread'):
+            return self.send_json(self.mattermost_thread(path.split('/')[4]))
+        if path.startswith('/api/v4/channels/') and path.endswith('/posts'):
+            return self.send_json(self.mattermost_channel_posts(path.split('/')[4], params))
+        if path.startswith('/api/v4/channels/') and path.split('/')[4] in CHANNELS:
+            channel_id = path.split('/')[4]
+            return self.send_json({"id": channel_id, **CHANNELS[channel_id]})
+        self.send_json({"error": f"unknown path {path}"}, status=404)
+
+    def redmine_issues(self, params):
+        issues = self.data.issues
+        if 'issue_id' in params:
+            issues = [
+                self.data.issues_by_id[int(issue_id)] for issue_id in params['issue_id'].split(',')
+                if int(issue_id) in self.data.issues_by_id
+            ]
+        if params.get('updated_on', '').startswith('>='):
+            since = params['updated_on'][2:]
+            issues = [issue for issue in issues if issue['updated_on'] >= since]
+
+        offset = int(params.get('offset', 0))
+        limit = min(int(params.get('limit', 25)), 100)
+        return {"issues": issues[offset:offset + limit], "total_count": len(issues), "offset": offset, "limit": limit}
+
+    def redmine_search(self, params):
+        query = params.get('q', '')
+        if params.get('all_words') == '0':
+            # all_words=0: kelimelerden (veya tırnaklı ifadelerden) herhangi birini içeren issue'lar
+            matched_ids = set()
+            for term in re.findall(r'"([^"]+)"|(\S+)', query):
+                matched_ids.update(self.data.redmine_search_ids(term[0] or term[1]))
+            issue_ids = sorted(matched_ids)
+        else:
+            issue_ids = self.data.redmine_search_ids(query)
+        offset = int(params.get('offset', 0))
+        limit = min(int(params.get('limit', 25)), 100)
+        results = [{"id": issue_id, "type": "issue"} for issue_id in issue_ids[offset:offset + limit]]
+        return {"results": results, "total_count": len(issue_ids), "offset": offset, "limit": limit}
+
+    def mattermost_search(self, team_id, body):
+        # is_or_search: hashtag terimleri post'un hashtag listesinde, diğerleri mesaj metninde aranır;
+        # in:kanal filtreleri aramayı takımın o kanallarıyla sınırlar, after:YYYY-MM-DD o günden sonrasıyla
+        terms = [term[0] or term[1] for term in re.findall(r'"([^"]+)"|(\S+)', (body.get('terms') or '').lower())]
+        channel_names = {term[3:] for term in terms if term.startswith('in:')}
+        channel_ids = {
+            channel_id for channel_id, channel in CHANNELS.items()
+            if channel['team_id'] == team_id and (not channel_names or channel['name'] in channel_names)
+        }
+        after = max([
+            int(datetime.datetime.strptime(term[6:], '%Y-%m-%d').timestamp() + 86400) * 1000
+            for term in terms if term.startswith('after:')
+        ], default=0)
+        hashtags = {term for term in terms if term.startswith('#')}
+        words = [term for term in terms if not term.startswith(('#', 'in:', 'after:'))]
+        post_ids = [
+            post_id for post_id, post in self.data.posts.items()
+            if post['channel_id'] in channel_ids and post['create_at'] >= after
+            and (hashtags & set(post['hashtags'].lower().split()) or any(word in post['message'].lower() for word in words))
+        ]
+        # Mattermost gibi yeniden eskiye sıralı ve page/per_page ile sayfalı döner
+        post_ids.sort(key=lambda post_id: self.data.posts[post_id]['create_at'], reverse=True)
+        per_page = int(body.get('per_page', 60))
+        page = int(body.get('page', 0))
+        page_ids = post_ids[page * per_page:(page + 1) * per_page]
+        return {
+            "order": page_ids,
+            "posts": {post_id: self.data.posts[post_id] for post_id in page_ids},
+            "has_next": (page + 1) * per_page < len(post_ids)
+        }
+
+    def mattermost_thread(self, post_id):
+        post = self.data.posts.get(post_id)
+        if post is None:
+            return {"order": [], "posts": {}}
+        thread_id = post['root_id'] or post['id']
+        post_ids = self.data.threads.get(thread_id, [])
+        return {"order": post_ids, "posts": {pid: self.data.posts[pid] for pid in post_ids}}
+
+    def mattermost_channel_posts(self, channel_id, params):
+        post_ids = self.data.channel_posts.get(channel_id, [])
+        if 'since' in params:
+            since = int(params['since'])
+            post_ids = [post_id for post_id in post_ids if self.data.posts[post_id]['update_at'] > since]
+            # Mattermost gibi since cevabı sayfalanmaz ve en fazla 1000 post döner
+            post_ids = sorted(post_ids, key=lambda post_id: self.data.posts[post_id]['update_at'])[:1000]
+        else:
+            per_page = int(params.get('per_page', 60))
+            page = int(params.get('page', 0))
+            post_ids = post_ids[page * per_page:(page + 1) * per_page]
+        return {"order": post_ids, "posts": {post_id: self.data.posts[post_id] for post_id in post_ids}}
+
+def start_benchmark_server(data):
+    """
+    Sunucuyu rastgele bir portta arka planda başlatır; (sunucu, temel URL) döner
+    """
+    handler = type("BoundBenchmarkHandler", (BenchmarkHandler,), {"data": data})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def configure_environment(base_url, workdir):
+    """
+    Uygulama import edilmeden önce config değerlerini yerel sunucuya ve geçici dosyalara yönlendirir
+    """
+    os.environ.update({
+        "REDMINE_API_URL": base_url,
+        "MATTERMOST_BASE_URL": f"{base_url}/api/v4",
+        "MATTERMOST_CHANNEL_1": CHANNEL_IDS[0],
+        "MATTERMOST_CHANNEL_2": CHANNEL_IDS[1],
+        "REDMINE_MIRROR_PATH": os.path.join(workdir, "redmine_mirror.db"),
+        "MATTERMOST_ARCHIVE_PATH": os.path.join(workdir, "mattermost_archive.db"),
+        # Önbellek her turda temizlenir; diske yazma ölçümü bozmasın diye bellek içi kullanılır
+        "ENTITY_CACHE_PATH": "",
+        "PERF_LOG_PATH": "",
+        "PERF_METRICS_PATH": ""
+    })
+
+# ==============================================================================
+# 3. SENARYOLAR VE ÖLÇÜM
+# ==============================================================================
+def measure(name, func, rounds, setup=None):
+    """
+    func'u rounds kez çalıştırır (her turdan önce setup) ve ayrıca tracemalloc ile bir kez daha
+    çalıştırıp Python tarafındaki en yüksek bellek kullanımını ölçer. func işlenen öğe sayısını döndürür.
+    """
+    durations = []
+    items = 0
+    for _ in range(rounds):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        items = func()
+        durations.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(durations)
+    return {
+        "scenario": name,
+        "rounds": rounds,
+        "items": items,
+        "min_s": round(min(durations), 4),
+        "median_s": round(median, 4),
+        "max_s": round(max(durations), 4),
+        "items_per_s": round(items / median, 1) if median else None,
+        "peak_mb": round(peak / (1024 * 1024), 2)
+    }
+
+def build_scenarios(app, args):
+    """
+    Senaryo adı -> (ölçülecek fonksiyon, her turdan önce çalışacak hazırlık) sözlüğü
+    """
+    cache = app.get_entity_cache()
+    term = args.term
+    state = {}
+
+    # Filtre/dışa aktarım senaryolarının hazırlığıdır; tablo zamanlanan turlardan önce bir kez oluşturulur
+    def results_frame():
+        if 'df' not in state:
+            cache.clear()
+            state['df'] = app.get_all_data_fast(term)
+        return state['df']
+
+    def redmine_mode(mode):
+        def run():
+            app.REDMINE_FETCH_MODE = mode
+            return len(app.fast_redmine_fetch(term))
+        return run
+
+    def mattermost_api(lazy):
+        def run():
+            # Diğer senaryolar config'deki tembel yükleme ayarıyla çalışmaya devam eder
+            default_lazy = app.MATTERMOST_LAZY_THREADS
+            app.MATTERMOST_FETCH_MODE = 'api'
+            app.MATTERMOST_LAZY_THREADS = lazy
+            try:
+                return len(app.fast_mattermost_fetch(term))
+            finally:
+                app.MATTERMOST_LAZY_THREADS = default_lazy
+        return run
+
+    def redmine_mirror_build():
+        app.sync_redmine_mirror(force=True)
+        return len(args.issue_data)
+
+    def reset_redmine_mirror():
+        for suffix in ("", "-wal", "-shm"):
+            path = app.REDMINE_MIRROR_PATH + suffix
+            if os.path.exists(path):
+                os.remove(path)
+
+    def mattermost_archive_build():
+        app.sync_mattermost_archive()
+        return len(args.post_data)
+
+    def reset_mattermost_archive():
+        for suffix in ("", "-wal", "-shm"):
+            path = app.MATTERMOST_ARCHIVE_PATH + suffix
+            if os.path.exists(path):
+                os.remove(path)
+
+    def ensure_mirror():
+        if not app.redmine_mirror_is_populated():
+            app.sync_redmine_mirror(force=True)
+
+    def ensure_archive():
+        if not app.mattermost_archive_is_ready():
+            app.sync_mattermost_archive()
+
+    def all_data_cold():
+        app.REDMINE_FETCH_MODE = 'mirror'
+        app.MATTERMOST_FETCH_MODE = 'api'
+        return len(app.get_all_data_fast(term))
+
+    def filtering():
+        df = results_frame()
+        app.apply_result_filters(
+            df, text_filter=args.filter_text, status_filter="Devam Eden",
+            start_date=datetime.date(2022, 6, 1), end_date=datetime.date(2030, 1, 1)
+        )
+        return len(df)
+
+    def export_csv():
+        df = results_frame()
+        app.build_csv_export(df)
+        return len(df)
+
+    def export_excel():
+        df = results_frame()
+        app.build_excel_export(df)
+        return len(df)
+
+    def export_word():
+        df = results_frame()
+        query_info = app.parse_natural_language_query(f"{term} tamamlanan")
+        app.create_word_document(df, query_info)
+        return len(df)
+
+    return {
+        "redmine_scan": (redmine_mode('scan'), cache.clear),
+        "redmine_server_search": (redmine_mode('search'), cache.clear),
+        "redmine_mirror_build": (redmine_mirror_build, reset_redmine_mirror),
+        "redmine_mirror_search": (lambda: len(app.search_redmine_mirror(term)), ensure_mirror),
+        "mattermost_api": (mattermost_api(False), cache.clear),
+        "mattermost_api_lazy": (mattermost_api(True), cache.clear),
+        "mattermost_archive_build": (mattermost_archive_build, reset_mattermost_archive),
+        "mattermost_archive_search": (lambda: len(app.search_mattermost_archive(term)), ensure_archive),
+        "all_data_cold": (all_data_cold, lambda: (cache.clear(), ensure_mirror())),
+        "all_data_cached": (all_data_cold, None),
+        "filter": (filtering, results_frame),
+        "export_csv": (export_csv, results_frame),
+        "export_excel": (export_excel, results_frame),
+        "export_word": (export_word, results_frame)
+    }
+
+def print_results(results):
+    columns = ["scenario", "rounds", "items", "min_s", "median_s", "max_s", "items_per_s", "peak_mb"]
+    widths = {column: max(len(column), *(len(str(result[column])) for result in results)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for result in results:
+        print("  ".join(str(result[column]).ljust(widths[column]) for column in columns))
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for Redmine/Mattermost search, filtering and export")
+    parser.add_argument("--issues", type=int, default=10000, help="number of synthetic Redmine issues")
+    parser.add_argument("--posts", type=int, default=100000, help="number of synthetic Mattermost posts")
+    parser.add_argument("--max-thread-depth", type=int, default=20, help="maximum replies per Mattermost thread")
+    parser.add_argument("--term", default="#atp", help="search term (hashtag, so both sources match)")
+    parser.add_argument("--filter-text", default="yama", help="in-result text filter for the filter scenario")
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated server latency per request")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", default="", help="comma separated scenario names (default: all)")
+    parser.add_argument("--json", dest="json_path", default="", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"Generating {args.issues} issues and {args.posts} posts (seed {args.seed})...")
+    args.issue_data = generate_issues(args.issues, args.seed)
+    args.post_data = generate_posts(args.posts, args.max_thread_depth, args.seed)
+
+    server, base_url = start_benchmark_server(BenchmarkData(args.issue_data, args.post_data, args.latency_ms))
+    workdir = tempfile.mkdtemp(prefix="search_benchmark_")
+    configure_environment(base_url, workdir)
+    print(f"Benchmark server listening on {base_url}, working directory {workdir}")
+
+    # config değerleri import sırasında okunduğu için uygulama ortam ayarlandıktan sonra import edilir
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import interactive_search_app as app
+
+    scenarios = build_scenarios(app, args)
+    selected = [name.strip() for name in args.scenarios.split(",") if name.strip()] or list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(scenarios)})")
+
+    results = []
+    for name in selected:
+        func, setup = scenarios[name]
+        print(f"Running {name}...")
+        try:
+            results.append(measure(name, func, args.rounds, setup))
+        except Exception as e:
+            print(f"!!!! BENCHMARK ERROR in {name}: {e} !!!!")
+
+    server.shutdown()
+    print()
+    print_results(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "issues": args.issues, "posts": args.posts, "max_thread_depth": args.max_thread_depth,
+                "term": args.term, "latency_ms": args.latency_ms, "results": results
+            }, f, indent=2)
+        print(f"Results written to {args.json_path}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -17,4 +17,105 @@ MATTERMOST_CHANNEL_1 = os.getenv('MATTERMOST_CHANNEL_1', 'x9idtdiwuinu7xminyk9op
 MATTERMOST_CHANNEL_2 = os.getenv('MATTERMOST_CHANNEL_2', 'tmbu97ry3fy8xcrsuzhaz8378c')
 
 # Target Mattermost Channels
-TARGET_MATTERMOST_CHANNELS = [MATTERMOST_CHANNEL_1, MATTERMOST_CHANNEL_2] 
\ No newline at end of file
+TARGET_MATTERMOST_CHANNELS = [MATTERMOST_CHANNEL_1, MATTERMOST_CHANNEL_2] 
+
+# Redmine Veri Çekme Modu
+# 'mirror': yerel SQLite aynası üzerinden arama (artımlı senkronizasyon)
+# 'search': sunucu tarafı /search.json ile aday issue'ları bulup toplu detay çekme
+# 'scan': her aramada tüm issue'ları sunucudan çekip tarama
+REDMINE_FETCH_MODE = os.getenv('REDMINE_FETCH_MODE', 'mirror')
+
+# Redmine Sunucu Tarafı Arama Ayarları ('search' modu ve aynanın hazır olmadığı durumlar)
+REDMINE_SEARCH_PROJECT_ID = os.getenv('REDMINE_SEARCH_PROJECT_ID', '')  # boşsa tüm projeler
+REDMINE_SEARCH_TITLES_ONLY = os.getenv('REDMINE_SEARCH_TITLES_ONLY', '0') == '1'
+REDMINE_SEARCH_OPEN_ISSUES_ONLY = os.getenv('REDMINE_SEARCH_OPEN_ISSUES_ONLY', '0') == '1'
+REDMINE_SEARCH_STATUS_ID = os.getenv('REDMINE_SEARCH_STATUS_ID', '*')
+REDMINE_SEARCH_CREATED_ON = os.getenv('REDMINE_SEARCH_CREATED_ON', '')  # örn: ">=2024-01-01"
+REDMINE_ISSUE_BATCH_SIZE = int(os.getenv('REDMINE_ISSUE_BATCH_SIZE', '100'))
+REDMINE_REQUEST_TIMEOUT = int(os.getenv('REDMINE_REQUEST_TIMEOUT', '30'))  # saniye
+
+# Redmine Paralel Sayfa Çekme Ayarları (tam tarama ve ayna doldurma)
+REDMINE_PAGE_SIZE = int(os.getenv('REDMINE_PAGE_SIZE', '100'))  # Redmine en fazla 100 kabul eder
+REDMINE_FETCH_WORKERS = int(os.getenv('REDMINE_FETCH_WORKERS', '8'))
+
+# Redmine Yerel Ayna (Mirror) Ayarları
+REDMINE_MIRROR_PATH = os.getenv('REDMINE_MIRROR_PATH', 'redmine_mirror.db')
+REDMINE_MIRROR_SYNC_INTERVAL = int(os.getenv('REDMINE_MIRROR_SYNC_INTERVAL', '60'))  # saniye
+# Artımlı eşitlemede updated_on filtresi, önceki eşitlemenin başladığı sunucu saatinden bu kadar önceye çekilir
+# (eşitleme sırasında güncellenen ve saat farkı olan issue'lar kaçmasın diye)
+REDMINE_MIRROR_SYNC_MARGIN = int(os.getenv('REDMINE_MIRROR_SYNC_MARGIN', '300'))  # saniye
+# Silinen issue'ları aynadan temizlemek için tüm issue listesinin yeniden çekilme aralığı (0 = sadece sunucudaki
+# issue sayısı aynadakinden azaldığında). Ayna arka planda REDMINE_MIRROR_SYNC_INTERVAL aralıklarla eşitlenir.
+REDMINE_MIRROR_RECONCILE_INTERVAL = int(os.getenv('REDMINE_MIRROR_RECONCILE_INTERVAL', '86400'))  # saniye (1 gün)
+
+# Mattermost Paralel Thread Çekme Ayarları
+MATTERMOST_THREAD_WORKERS = int(os.getenv('MATTERMOST_THREAD_WORKERS', '8'))  # aynı anda en fazla istek
+MATTERMOST_REQUEST_TIMEOUT = int(os.getenv('MATTERMOST_REQUEST_TIMEOUT', '30'))  # saniye
+MATTERMOST_MAX_RETRIES = int(os.getenv('MATTERMOST_MAX_RETRIES', '3'))  # 429 (rate limit) durumunda
+
+# Mattermost Arama Sayfalama Ayarları (api modu)
+# Arama sonuçları sayfa sayfa çekilir ve her sayfa geldiği anda thread çekmeye aktarılır.
+# En fazla MATTERMOST_SEARCH_MAX_RESULTS thread işlenir ve arama MATTERMOST_SEARCH_TIME_BUDGET saniyede kesilir;
+# sınırlardan birine takılan sonuçlar arayüzde "kısaltıldı" olarak gösterilir (0 = sınır yok).
+# Thread sınırı arşiv modunda da uygulanır; tüm modlarda eşleşen en yeni post'u daha yeni olan thread'ler kalır
+MATTERMOST_SEARCH_PAGE_SIZE = int(os.getenv('MATTERMOST_SEARCH_PAGE_SIZE', '100'))  # sayfa başına post
+MATTERMOST_SEARCH_MAX_RESULTS = int(os.getenv('MATTERMOST_SEARCH_MAX_RESULTS', '500'))  # thread
+MATTERMOST_SEARCH_TIME_BUDGET = float(os.getenv('MATTERMOST_SEARCH_TIME_BUDGET', '60'))  # saniye
+
+# Mattermost Tembel Thread Yükleme (api modu)
+# Açıksa aramada /thread gövdeleri çekilmez; sonuçlar kök mesaj, eşleşen yanıtlar ve sunucu tarafı
+# "killed a prey" aramasıyla belirlenen durumdan oluşan önizlemelerdir. Konuşmanın tamamı kullanıcı sonucu
+# açtığında veya dışa aktarırken çekilir
+MATTERMOST_LAZY_THREADS = os.getenv('MATTERMOST_LAZY_THREADS', '1') == '1'
+# Önizleme durum aramasının ("killed a prey") en fazla sayfa sayısı (0 = sınır yok); arama ayrıca
+# MATTERMOST_SEARCH_TIME_BUDGET ile kesilir. Sınıra takılınca durumu kesinleşmeyen thread'ler tam olarak çekilir
+MATTERMOST_STATUS_MAX_PAGES = int(os.getenv('MATTERMOST_STATUS_MAX_PAGES', '5'))
+
+# Mattermost Kullanıcı Dizini (yazar ID'lerini isimlere çevirme)
+# Sonuçlardaki tüm kullanıcı ID'leri tek bir POST /users/ids isteğiyle çözülür ve varlık önbelleğinde
+# (bellek + ENTITY_CACHE_PATH) bu süre kadar tutulur
+MATTERMOST_USER_CACHE_TTL = int(os.getenv('MATTERMOST_USER_CACHE_TTL', '86400'))  # saniye (1 gün)
+
+# Mattermost Veri Çekme Modu
+# 'archive': hedef kanalların yerel SQLite arşivi üzerinden arama (arka planda since ile eşitlenir);
+#            arşiv zaten yerel olduğundan Mattermost sonuçları sorgu önbelleğine (ENTITY_CACHE) yazılmaz ve ön yüklenmez
+# 'api': her aramada Mattermost arama API'si ve thread çekme
+MATTERMOST_FETCH_MODE = os.getenv('MATTERMOST_FETCH_MODE', 'archive')
+
+# Mattermost Yerel Arşiv Ayarları
+MATTERMOST_ARCHIVE_PATH = os.getenv('MATTERMOST_ARCHIVE_PATH', 'mattermost_archive.db')
+MATTERMOST_ARCHIVE_SYNC_INTERVAL = int(os.getenv('MATTERMOST_ARCHIVE_SYNC_INTERVAL', '60'))  # saniye
+
+# Varlık Bazlı Önbellek (issue ID'ye, thread kök ID'sine ve sorguya göre)
+# ENTITY_CACHE_PATH boş bırakılırsa sadece bellek içi önbellek kullanılır;
+# dosya verilirse önbellek yeniden başlatmalarda korunur ve Streamlit worker'ları arasında paylaşılır.
+# MATTERMOST_FETCH_MODE='archive' iken Mattermost sorguları önbelleğe alınmaz (her arama yerel arşivden yapılır)
+ENTITY_CACHE_PATH = os.getenv('ENTITY_CACHE_PATH', 'entity_cache.db')
+ENTITY_CACHE_TTL = int(os.getenv('ENTITY_CACHE_TTL', '1800'))  # saniye (30 dakika)
+ENTITY_CACHE_MAX_ITEMS = int(os.getenv('ENTITY_CACHE_MAX_ITEMS', '20000'))  # bellek içi LRU sınırı
+
+# Performans Ölçümü (arama aşamalarının zamanlama aralıkları)
+# PERF_LOG_PATH: her aralık JSON satırı olarak eklenir; dosya PERF_LOG_MAX_BYTES'ı aşınca .1, .2 ... olarak
+# döndürülür ve en fazla PERF_LOG_BACKUPS eski dosya tutulur.
+# PERF_METRICS_PATH: Prometheus metin formatında toplam sayaçlar (node_exporter textfile collector ile okunabilir);
+# her Streamlit süreci kendi dosyasına yazar (örn. search_metrics.prom -> search_metrics.<pid>.prom, pid etiketiyle).
+# Varsayılan olarak ikisi de kapalıdır (boş = yazılmaz).
+PERF_LOG_PATH = os.getenv('PERF_LOG_PATH', '')
+PERF_LOG_MAX_BYTES = int(os.getenv('PERF_LOG_MAX_BYTES', str(10 * 1024 * 1024)))  # bayt (0 = sınır yok)
+PERF_LOG_BACKUPS = int(os.getenv('PERF_LOG_BACKUPS', '3'))
+PERF_METRICS_PATH = os.getenv('PERF_METRICS_PATH', '')
+
+# Dışa Aktarım (CSV / Excel) Önbelleği
+# Oluşturulan dosyalar sonuç kümesinin özetine göre bellekte tutulur; aynı sonuçlar için tekrar üretilmez
+EXPORT_CACHE_TTL = int(os.getenv('EXPORT_CACHE_TTL', '1800'))  # saniye
+EXPORT_CACHE_MAX_ITEMS = int(os.getenv('EXPORT_CACHE_MAX_ITEMS', '32'))  # bellekte tutulacak en fazla dosya
+
+# Sık Aranan Terimler İçin Arka Plan Ön Yükleme
+# En sık aranan PREFETCH_TOP_N terimin önbellek kaydı, süresi dolmadan (PREFETCH_REFRESH_MARGIN kala)
+# arka planda yenilenir. Arama sıklığı PREFETCH_HALF_LIFE yarı ömrüyle azalarak sayılır.
+# ENTITY_CACHE_PATH verilmişse worker'lardan sadece biri (varlık önbelleği dosyasındaki kirayı alan) yeniler.
+PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', '1') == '1'
+PREFETCH_TOP_N = int(os.getenv('PREFETCH_TOP_N', '20'))
+PREFETCH_INTERVAL = int(os.getenv('PREFETCH_INTERVAL', '120'))  # saniye, kontrol aralığı
+PREFETCH_REFRESH_MARGIN = int(os.getenv('PREFETCH_REFRESH_MARGIN', '600'))  # saniye
+PREFETCH_HALF_LIFE = int(os.getenv('PREFETCH_HALF_LIFE', '86400'))  # saniye (1 gün)
\ No newline at end of file
@@ -1,13 +1,42 @@
 import streamlit as st
 import pandas as pd
-from redminelib import Redmine
+import numpy as np
 import requests
 import datetime
+import email.utils
+import functools
+import heapq
+import calendar
 import os
 import re
+import sys
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from docx import Document
 from docx.shared import Inches
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
 import io
+import json
+import hashlib
+import zipfile
+from xml.sax.saxutils import escape as xml_escape
+import queue
+import uuid
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict
+
+# Büyük Redmine sayfalarını hızlı çözmek için orjson kullanılır; kurulu değilse standart json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # Config dosyasını import et
 from config import (
@@ -15,201 +44,2947 @@ from config import (
     REDMINE_API_URL,
     MATTERMOST_TOKEN,
     MATTERMOST_BASE_URL,
-    TARGET_MATTERMOST_CHANNELS
+    TARGET_MATTERMOST_CHANNELS,
+    REDMINE_FETCH_MODE,
+    REDMINE_MIRROR_PATH,
+    REDMINE_MIRROR_SYNC_INTERVAL,
+    REDMINE_MIRROR_SYNC_MARGIN,
+    REDMINE_MIRROR_RECONCILE_INTERVAL,
+    REDMINE_SEARCH_PROJECT_ID,
+    REDMINE_SEARCH_TITLES_ONLY,
+    REDMINE_SEARCH_OPEN_ISSUES_ONLY,
+    REDMINE_SEARCH_STATUS_ID,
+    REDMINE_SEARCH_CREATED_ON,
+    REDMINE_ISSUE_BATCH_SIZE,
+    REDMINE_REQUEST_TIMEOUT,
+    REDMINE_PAGE_SIZE,
+    REDMINE_FETCH_WORKERS,
+    MATTERMOST_THREAD_WORKERS,
+    MATTERMOST_REQUEST_TIMEOUT,
+    MATTERMOST_MAX_RETRIES,
+    MATTERMOST_SEARCH_PAGE_SIZE,
+    MATTERMOST_SEARCH_MAX_RESULTS,
+    MATTERMOST_SEARCH_TIME_BUDGET,
+    MATTERMOST_LAZY_THREADS,
+    MATTERMOST_STATUS_MAX_PAGES,
+    MATTERMOST_USER_CACHE_TTL,
+    MATTERMOST_FETCH_MODE,
+    MATTERMOST_ARCHIVE_PATH,
+    MATTERMOST_ARCHIVE_SYNC_INTERVAL,
+    ENTITY_CACHE_PATH,
+    ENTITY_CACHE_TTL,
+    ENTITY_CACHE_MAX_ITEMS,
+    PERF_LOG_PATH,
+    PERF_LOG_MAX_BYTES,
+    PERF_LOG_BACKUPS,
+    PERF_METRICS_PATH,
+    EXPORT_CACHE_TTL,
+    EXPORT_CACHE_MAX_ITEMS,
+    PREFETCH_ENABLED,
+    PREFETCH_TOP_N,
+    PREFETCH_INTERVAL,
+    PREFETCH_REFRESH_MARGIN,
+    PREFETCH_HALF_LIFE
 )
 
-# ==============================================================================
-# 1. REDMINE VERİ ÇEKME FONKSİYONU (OPTİMİZE EDİLMİŞ)
-# ==============================================================================
-def fast_redmine_fetch(search_term):
+# ==============================================================================
+# 1. REDMINE VERİ ÇEKME FONKSİYONU (OPTİMİZE EDİLMİŞ)
+# ==============================================================================
+def redmine_result_row(issue_id, subject, description, tracker_name, status_name, author_name, created_on):
+    """
+    Redmine issue alanlarından sonuç kaydını oluşturur (tüm çekme modları ortak kullanır)
+    created_on: duvar saati epoch saniyesi (bkz. wall_clock_epoch)
+    """
+    return ResultRecord(
+        "Redmine",
+        int(issue_id),
+        f"Tracker: {tracker_name} (Status: {status_name})",
+        subject,
+        description,
+        author_name,
+        created_on
+    )
+
+# decode_redmine_issue'ın döndürdüğü tuple'daki alan sırası
+REDMINE_ISSUE_FIELDS = ('id', 'subject', 'description', 'tracker', 'status', 'author', 'created_on', 'updated_on')
+
+def decode_redmine_issue(issue):
+    """
+    /issues.json içindeki tek bir issue'dan sadece gereken alanları düz bir tuple olarak çıkarır
+    (REDMINE_ISSUE_FIELDS sırasıyla; tarihler Redmine'ın ISO metni olarak kalır)
+    """
+    tracker = issue.get('tracker')
+    status = issue.get('status')
+    author = issue.get('author')
+    return (
+        issue['id'],
+        issue.get('subject') or '',
+        issue.get('description') or '',
+        tracker.get('name') if tracker else None,
+        status.get('name') if status else None,
+        author.get('name') if author else None,
+        issue.get('created_on'),
+        issue.get('updated_on')
+    )
+
+def redmine_issue_to_row(issue):
+    """
+    decode_redmine_issue tuple'ından sonuç kaydını oluşturur
+    """
+    return redmine_result_row(*issue[:6], redmine_json_timestamp(issue[6]))
+
+def fast_redmine_fetch(search_term, progress=None, on_rows=None):
+    """
+    Hızlı Redmine arama - sadece başlık ve açıklamada arama yapar
+    Sıra: yerel ayna -> sunucu tarafı arama -> tüm issue'ları tarama (yedek)
+    progress verilirse progress(tamamlanan, toplam) ile ilerleme bildirilir
+    on_rows verilirse eşleşen satırlar bulundukça küçük gruplar halinde on_rows(satırlar) ile bildirilir
+    """
+    if REDMINE_FETCH_MODE == 'mirror':
+        # Ayna arka planda eşitlenir; arama ağ beklemeden yerel veriyle yapılır
+        start_redmine_mirror_sync()
+        try:
+            if redmine_mirror_is_populated():
+                collected_data = search_redmine_mirror(search_term)
+                print(f"Found {len(collected_data)} issues for '{search_term}' in local Redmine mirror.")
+                if on_rows and collected_data:
+                    on_rows(collected_data)
+                return collected_data
+            print("Redmine mirror is not ready yet. Falling back to server-side search...")
+        except Exception as e:
+            print(f"!!!! REDMINE MIRROR ERROR: {e} !!!! Falling back to server-side search...")
+    
+    if REDMINE_FETCH_MODE in ('mirror', 'search'):
+        try:
+            return redmine_server_search(search_term, progress=progress, on_rows=on_rows)
+        except Exception as e:
+            print(f"!!!! REDMINE SEARCH ERROR: {e} !!!! Falling back to full scan...")
+    
+    return redmine_full_scan(search_term, progress=progress, on_rows=on_rows)
+
+def redmine_full_scan(search_term, progress=None, on_rows=None):
+    """
+    Sunucudaki tüm issue'ları çekip başlık/açıklamada arama yapar (yedek yol)
+    """
+    print(f"Connecting to Redmine ({REDMINE_API_URL}) with {REDMINE_FETCH_WORKERS} parallel workers...")
+    collected_data = []
+    scanned_count = 0
+    
+    try:
+        query = parse_search_query(search_term)
+        
+        # Sadece temel verileri çek (journals ve attachments olmadan); her sayfa gelir gelmez filtrelenir
+        # Çok terimli sorgularda da tek geçişte tüm terimler birlikte değerlendirilir
+        for issues in iter_redmine_issue_pages({'status_id': '*'}, progress=progress):
+            scanned_count += len(issues)
+            page_matches = [redmine_issue_to_row(issue) for issue in issues if query.matches_texts(issue[1], issue[2])]
+            
+            collected_data.extend(page_matches)
+            if on_rows and page_matches:
+                on_rows(page_matches)
+        
+        print(f"Total issues scanned: {scanned_count}. Found {len(collected_data)} matches for '{search_term}'.")
+            
+    except Exception as e:
+        print(f"!!!! REDMINE ERROR: {e} !!!!")
+        
+    return collected_data
+
+# ==============================================================================
+# 1.1 REDMINE PARALEL SAYFA ÇEKME
+# ==============================================================================
+def fetch_redmine_issue_page(offset, filters):
+    """
+    Tek bir offset/limit sayfasını doğrudan /issues.json'dan çeker; (issue tuple listesi, toplam issue sayısı) döner.
+    python-redmine Resource nesneleri oluşturulmaz, her issue decode_redmine_issue ile tuple'a çevrilir.
+    """
+    params = dict(filters, offset=offset, limit=REDMINE_PAGE_SIZE)
+    with perf_span('redmine.page', offset=offset) as span:
+        response = get_redmine_session().get(f"{REDMINE_API_URL}/issues.json", params=params, timeout=REDMINE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = json_loads(response.content)
+        issues = [decode_redmine_issue(issue) for issue in data.get('issues', [])]
+        span['items'] = len(issues)
+        span['bytes'] = len(response.content)
+    return issues, data.get('total_count', 0)
+
+def iter_redmine_issue_pages(filters, progress=None):
+    """
+    Filtreye uyan issue'ları sayfa sayfa döndürür.
+    İlk sayfadan toplam sayı öğrenilir, kalan sayfalar REDMINE_FETCH_WORKERS kadar thread ile
+    aynı anda çekilir ve tamamlanma sırasına göre verilir (sayfa sırası garanti edilmez).
+    Aynı anda en fazla REDMINE_FETCH_WORKERS * 2 sayfa istenir/bekler; verilen sayfa bellekte tutulmaz.
+    """
+    first_page, total_count = fetch_redmine_issue_page(0, filters)
+    offsets = iter(range(REDMINE_PAGE_SIZE, total_count or 0, REDMINE_PAGE_SIZE))
+    total_pages = len(range(0, total_count or 0, REDMINE_PAGE_SIZE)) or 1
+    if progress:
+        progress(1, total_pages)
+    yield first_page
+    del first_page
+    
+    workers = max(1, REDMINE_FETCH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        
+        def fill_window():
+            for offset in offsets:
+                pending.add(submit_with_context(executor, fetch_redmine_issue_page, offset, filters))
+                if len(pending) >= workers * 2:
+                    break
+        
+        done_pages = 1
+        try:
+            fill_window()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    issues, _ = future.result()
+                    done_pages += 1
+                    if progress:
+                        progress(done_pages, total_pages)
+                    yield issues
+                # Verilen sayfanın sonucu sadece tüketicide kalır; pencere yeni offset'lerle doldurulur
+                del done, future, issues
+                fill_window()
+        finally:
+            # Hata ya da erken çıkışta bekleyen sayfaları boşuna çekme
+            for future in pending:
+                future.cancel()
+
+# ==============================================================================
+# 1.2 REDMINE SUNUCU TARAFI ARAMA (/search.json + TOPLU DETAY ÇEKME)
+# ==============================================================================
+# Streamlit script'i her etkileşimde yeniden çalıştırdığı için süreç boyu yaşayan nesneler
+# (oturumlar, kilitler, arka plan thread'leri) st.cache_resource ile tutulur.
+# Bu kaynaklar submit_with_context ile bağlamı kopyalanmış havuz thread'lerinden de ilk kez oluşturulabilir;
+# orada ScriptRunContext olmadığı için önbellek spinner'ı kapalıdır (show_spinner=False), aksi hâlde hata verir
+@st.cache_resource(show_spinner=False)
+def get_redmine_session():
+    """
+    Redmine REST çağrıları için paylaşılan (keep-alive) oturumu döndürür
+    """
+    session = requests.Session()
+    session.headers.update({"X-Redmine-API-Key": REDMINE_API_KEY})
+    return session
+
+def redmine_json_timestamp(value):
+    """
+    Redmine JSON zaman damgasını ('2024-01-31T10:00:00Z') epoch saniyesine çevirir
+    """
+    if not value:
+        return None
+    return calendar.timegm(time.strptime(value, '%Y-%m-%dT%H:%M:%SZ'))
+
+def redmine_search_candidate_ids(search_term):
+    """
+    Redmine'ın /search.json uç noktası ile terimi içeren issue ID'lerini sayfa sayfa toplar.
+    Çok terimli sorgularda olumlu terimlerin hepsi tek aramada "herhangi bir kelime" (all_words=0) ile istenir.
+    """
+    query = parse_search_query(search_term)
+    session = get_redmine_session()
+    if REDMINE_SEARCH_PROJECT_ID:
+        search_url = f"{REDMINE_API_URL}/projects/{REDMINE_SEARCH_PROJECT_ID}/search.json"
+    else:
+        search_url = f"{REDMINE_API_URL}/search.json"
+    
+    params = {
+        "q": search_term if query.is_single else " ".join(
+            f'"{text}"' if ' ' in text else text for text in map(query_term_text, query.positive_terms)
+        ),
+        "issues": 1,
+        "titles_only": 1 if REDMINE_SEARCH_TITLES_ONLY else 0,
+        "open_issues": 1 if REDMINE_SEARCH_OPEN_ISSUES_ONLY else 0,
+        "limit": 100,
+        "offset": 0
+    }
+    if not query.is_single:
+        params["all_words"] = 0
+    
+    candidate_ids = []
+    while True:
+        with perf_span('redmine.search', offset=params['offset']) as span:
+            response = session.get(search_url, params=params, timeout=REDMINE_REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = json_loads(response.content)
+            results = data.get('results', [])
+            span['items'] = len(results)
+            span['bytes'] = len(response.content)
+        
+        # type: 'issue', 'issue-closed', 'issue-note' ...
+        candidate_ids.extend(
+            result['id'] for result in results if str(result.get('type', '')).startswith('issue')
+        )
+        
+        params['offset'] += len(results)
+        if not results or params['offset'] >= data.get('total_count', 0):
+            break
+    
+    # Aynı issue birden fazla kez (örn. not eşleşmesi) dönebilir
+    return list(dict.fromkeys(candidate_ids))
+
+def iter_redmine_issue_batches(issue_ids, progress=None):
+    """
+    Issue detaylarını issue_id=1,2,3 şeklinde toplu isteklerle çeker; her isteğin issue tuple listesini ayrı döndürür
+    """
+    session = get_redmine_session()
+    
+    for start in range(0, len(issue_ids), REDMINE_ISSUE_BATCH_SIZE):
+        if progress:
+            progress(start, len(issue_ids))
+        batch = issue_ids[start:start + REDMINE_ISSUE_BATCH_SIZE]
+        params = {
+            "issue_id": ",".join(str(issue_id) for issue_id in batch),
+            "status_id": REDMINE_SEARCH_STATUS_ID,
+            "limit": len(batch)
+        }
+        if REDMINE_SEARCH_PROJECT_ID:
+            params["project_id"] = REDMINE_SEARCH_PROJECT_ID
+        if REDMINE_SEARCH_CREATED_ON:
+            params["created_on"] = REDMINE_SEARCH_CREATED_ON
+        
+        with perf_span('redmine.issue_batch') as span:
+            response = session.get(f"{REDMINE_API_URL}/issues.json", params=params, timeout=REDMINE_REQUEST_TIMEOUT)
+            response.raise_for_status()
+            issues = [decode_redmine_issue(issue) for issue in json_loads(response.content).get('issues', [])]
+            span['items'] = len(issues)
+            span['bytes'] = len(response.content)
+        yield issues
+
+def redmine_server_search(search_term, progress=None, on_rows=None):
+    """
+    Arama koşulunu Redmine sunucusuna gönderir; sadece aday issue'ların detaylarını indirir
+    """
+    print(f"Searching Redmine server-side for '{search_term}' ({REDMINE_API_URL})...")
+    candidate_ids = redmine_search_candidate_ids(search_term)
+    print(f"Redmine search returned {len(candidate_ids)} candidate issues. Fetching details in batches...")
+    
+    query = parse_search_query(search_term)
+    candidate_rows = {}
+    
+    def collect(rows):
+        # Sunucu kelime bazlı arar; sonuçlar diğer modlarla aynı olsun diye yerelde doğrulanır
+        matches = [row for row in rows if query.matches_texts(row.title, row.description)]
+        for row in matches:
+            candidate_rows[row.id] = row
+        if on_rows and matches:
+            on_rows(matches)
+    
+    # Önbellekte olan issue'lar tekrar indirilmez
+    cache = get_entity_cache()
+    cached_rows = {} if cache_refresh_mode.get() else cache.get_many('redmine_record', candidate_ids)
+    collect([ResultRecord.from_cache(values) for values in cached_rows.values()])
+    missing_ids = [issue_id for issue_id in candidate_ids if issue_id not in cached_rows]
+    
+    for issues in iter_redmine_issue_batches(missing_ids, progress=progress):
+        fetched_rows = {issue[0]: redmine_issue_to_row(issue) for issue in issues}
+        cache.set_many('redmine_record', {issue_id: row.to_cache() for issue_id, row in fetched_rows.items()})
+        collect(list(fetched_rows.values()))
+    
+    # Sonuçlar sunucunun döndürdüğü sırayla verilir
+    return [candidate_rows[issue_id] for issue_id in candidate_ids if issue_id in candidate_rows]
+
+# ==============================================================================
+# 1.3 REDMINE YEREL AYNA (SQLITE) - ARTIMLI SENKRONİZASYON
+# ==============================================================================
+# Şema değişirse sürüm artırılır; eski ayna silinip baştan doldurulur
+REDMINE_MIRROR_SCHEMA_VERSION = 3
+
+REDMINE_MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    tracker TEXT,
+    status TEXT,
+    author TEXT,
+    created_on TEXT,
+    updated_on TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_updated_on ON issues (updated_on);
+
+-- Başlık ve açıklamanın Türkçe kurallarıyla küçültülmüş hali; rowid = issue id.
+-- Trigram indeksi alt metin aramasını (tarama moduyla aynı anlamda) indeks üzerinden yapar.
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5 (
+    subject,
+    description,
+    tokenize = "trigram case_sensitive 1"
+);
+"""
+
+@st.cache_resource(show_spinner=False)
+def get_redmine_mirror_lock():
+    """
+    Aynı süreçte iki senkronizasyonun aynı anda çalışmasını engelleyen kilit
+    """
+    return threading.Lock()
+
+def open_redmine_mirror():
+    """
+    Redmine ayna veritabanını açar, şema yoksa veya eskiyse yeniden oluşturur
+    """
+    conn = sqlite3.connect(REDMINE_MIRROR_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+    
+    version = get_mirror_state(conn, 'schema_version')
+    if version != str(REDMINE_MIRROR_SCHEMA_VERSION):
+        print(f"Preparing Redmine mirror schema (version {REDMINE_MIRROR_SCHEMA_VERSION})...")
+        conn.execute("DROP TABLE IF EXISTS issues")
+        conn.execute("DROP TABLE IF EXISTS issues_fts")
+        conn.execute("DELETE FROM sync_state")
+        conn.executescript(REDMINE_MIRROR_SCHEMA)
+        set_mirror_state(conn, 'schema_version', REDMINE_MIRROR_SCHEMA_VERSION)
+        conn.commit()
+    
+    return conn
+
+def get_mirror_state(conn, key):
+    row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def set_mirror_state(conn, key, value):
+    conn.execute(
+        "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, str(value))
+    )
+
+def redmine_mirror_is_populated():
+    """
+    Ayna en az bir kez tam olarak doldurulduysa True döner
+    """
+    conn = open_redmine_mirror()
+    try:
+        return get_mirror_state(conn, 'updated_on_watermark') is not None
+    finally:
+        conn.close()
+
+def redmine_mirror_last_sync():
+    """
+    Aynanın son başarılı eşitlemesinin başladığı zaman (epoch); ayna henüz dolmadıysa None
+    """
+    conn = open_redmine_mirror()
+    try:
+        if get_mirror_state(conn, 'updated_on_watermark') is None:
+            return None
+        return float(get_mirror_state(conn, 'last_sync_at'))
+    finally:
+        conn.close()
+
+def redmine_mirror_row(issue):
+    """
+    decode_redmine_issue tuple'ını ayna satırına çevirir (created_on: '2024-01-31T10:00:00Z' -> '2024-01-31 10:00:00')
+    """
+    created_on = issue[6]
+    return (*issue[:6], f"{created_on[:10]} {created_on[11:19]}" if created_on else None, issue[7])
+
+def upsert_redmine_mirror_rows(conn, rows):
+    """
+    Issue satırlarını aynaya yazar ve tam metin indeksini günceller
+    """
+    conn.executemany(
+        "INSERT INTO issues (id, subject, description, tracker, status, author, created_on, updated_on) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET subject = excluded.subject, description = excluded.description, "
+        "tracker = excluded.tracker, status = excluded.status, author = excluded.author, "
+        "created_on = excluded.created_on, updated_on = excluded.updated_on",
+        rows
+    )
+    conn.executemany("DELETE FROM issues_fts WHERE rowid = ?", [(row[0],) for row in rows])
+    conn.executemany(
+        "INSERT INTO issues_fts (rowid, subject, description) VALUES (?, ?, ?)",
+        [(row[0], turkish_casefold(row[1]), turkish_casefold(row[2])) for row in rows]
+    )
+
+def sync_redmine_mirror(force=False, progress=None):
+    """
+    Yerel aynayı Redmine ile eşitler.
+    İlk çalıştırmada tüm issue'ları çeker, sonrasında sadece updated_on >= son senkronizasyonun başladığı
+    sunucu saati - REDMINE_MIRROR_SYNC_MARGIN olan issue'ları indirir. REDMINE_MIRROR_SYNC_INTERVAL içinde tekrar çağrılırsa bir şey yapmaz.
+    Redmine silinen issue'ları bildirmediği için REDMINE_MIRROR_RECONCILE_INTERVAL'da bir (veya sunucudaki issue sayısı
+    aynadakinden azsa hemen) tüm issue'lar yeniden çekilir ve sunucuda artık olmayanlar aynadan silinir.
+    """
+    populated = redmine_mirror_is_populated()
+    redmine_mirror_lock = get_redmine_mirror_lock()
+    
+    # Ayna doluysa ve başka bir thread zaten senkronize ediyorsa bekleme, mevcut veriyle devam et
+    if not redmine_mirror_lock.acquire(blocking=not populated):
+        return
+    
+    try:
+        conn = open_redmine_mirror()
+        try:
+            last_sync_at = get_mirror_state(conn, 'last_sync_at')
+            if not force and last_sync_at and time.time() - float(last_sync_at) < REDMINE_MIRROR_SYNC_INTERVAL:
+                return
+            
+            watermark = get_mirror_state(conn, 'updated_on_watermark')
+            sync_started_at = time.time()
+            server_time, server_count = redmine_server_status()
+            # Sonraki eşitleme, bu eşitlemenin başladığı sunucu saatinden (güvenlik payı düşülerek) itibaren yapılır;
+            # eşitleme sırasında güncellenip okunmuş bir sayfaya kayan issue'lar böylece bir sonrakinde yakalanır
+            new_watermark = datetime.datetime.fromtimestamp(
+                server_time - REDMINE_MIRROR_SYNC_MARGIN, datetime.timezone.utc
+            ).strftime('%Y-%m-%dT%H:%M:%SZ')
+            
+            reconcile = False
+            if watermark:
+                mirror_count = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+                last_reconcile_at = float(get_mirror_state(conn, 'last_reconcile_at') or 0)
+                reconcile = (server_count is not None and server_count < mirror_count) or bool(
+                    REDMINE_MIRROR_RECONCILE_INTERVAL and sync_started_at - last_reconcile_at >= REDMINE_MIRROR_RECONCILE_INTERVAL
+                )
+            
+            # Paralel offset sayfalaması sırasında değişmeyen bir sıralama gerekir
+            filters = {'status_id': '*', 'sort': 'id'}
+            if reconcile:
+                print("Reconciling Redmine mirror with the server (full issue list)...")
+            elif watermark:
+                # Aynı saniyede güncellenen issue'ları kaçırmamak için >= kullanılır
+                filters['updated_on'] = f">={watermark}"
+                print(f"Syncing Redmine mirror (issues updated since {watermark})...")
+            else:
+                print(f"Building Redmine mirror from scratch ({REDMINE_API_URL})...")
+            
+            synced_count = 0
+            seen_ids = set()
+            with perf_span('redmine.mirror_sync', incremental=bool(watermark) and not reconcile) as span:
+                for issues in iter_redmine_issue_pages(filters, progress=progress):
+                    batch = [redmine_mirror_row(issue) for issue in issues]
+                    if batch:
+                        upsert_redmine_mirror_rows(conn, batch)
+                        synced_count += len(batch)
+                        seen_ids.update(row[0] for row in batch)
+                span['items'] = synced_count
+            
+            deleted_count = delete_missing_redmine_issues(conn, seen_ids) if reconcile else 0
+            
+            set_mirror_state(conn, 'updated_on_watermark', new_watermark)
+            set_mirror_state(conn, 'last_sync_at', sync_started_at)
+            if reconcile or not watermark:
+                set_mirror_state(conn, 'last_reconcile_at', sync_started_at)
+            conn.commit()
+            print(f"Redmine mirror synced. {synced_count} issues downloaded, {deleted_count} deleted issues removed.")
+        finally:
+            conn.close()
+    finally:
+        redmine_mirror_lock.release()
+
+def delete_missing_redmine_issues(conn, seen_ids):
+    """
+    Tam listede görülmeyen issue'ları aynadan siler. Sayfalama sırasında silinen bir issue offset'leri kaydırıp
+    başka bir issue'yu atlatabileceğinden, görülmeyenler önce ID ile tekrar sorulur; sadece sunucuda gerçekten
+    olmayanlar silinir, bulunanlar güncellenir. Silinen issue sayısını döndürür.
+    """
+    missing_ids = [row[0] for row in conn.execute("SELECT id FROM issues ORDER BY id") if row[0] not in seen_ids]
+    deleted_ids = []
+    for start in range(0, len(missing_ids), REDMINE_PAGE_SIZE):
+        batch_ids = missing_ids[start:start + REDMINE_PAGE_SIZE]
+        issues, _ = fetch_redmine_issue_page(0, {'issue_id': ",".join(map(str, batch_ids)), 'status_id': '*'})
+        found = {issue[0]: issue for issue in issues}
+        upsert_redmine_mirror_rows(conn, [redmine_mirror_row(issue) for issue in found.values()])
+        deleted_ids.extend(issue_id for issue_id in batch_ids if issue_id not in found)
+    
+    conn.executemany("DELETE FROM issues WHERE id = ?", [(issue_id,) for issue_id in deleted_ids])
+    conn.executemany("DELETE FROM issues_fts WHERE rowid = ?", [(issue_id,) for issue_id in deleted_ids])
+    return len(deleted_ids)
+
+def redmine_mirror_sync_loop():
+    while True:
+        try:
+            sync_redmine_mirror()
+        except Exception as e:
+            print(f"!!!! REDMINE MIRROR SYNC ERROR: {e} !!!!")
+        time.sleep(REDMINE_MIRROR_SYNC_INTERVAL)
+
+@st.cache_resource(show_spinner=False)
+def start_redmine_mirror_sync():
+    """
+    Aynayı REDMINE_MIRROR_SYNC_INTERVAL aralıklarla eşitleyen arka plan thread'ini (süreç başına bir kez) başlatır
+    """
+    thread = threading.Thread(target=redmine_mirror_sync_loop, name="redmine-mirror-sync", daemon=True)
+    thread.start()
+    return thread
+
+def redmine_server_status():
+    """
+    Redmine sunucusunun saati (epoch saniye, HTTP Date başlığından) ve toplam issue sayısı; (saat, sayı) döner.
+    Saat alınamazsa yerel saat, sayı alınamazsa None kullanılır.
+    """
+    server_time, server_count = time.time(), None
+    try:
+        response = get_redmine_session().get(
+            f"{REDMINE_API_URL}/issues.json", params={'limit': 1, 'status_id': '*'}, timeout=REDMINE_REQUEST_TIMEOUT
+        )
+        server_date = response.headers.get('Date')
+        if server_date:
+            server_time = email.utils.parsedate_to_datetime(server_date).timestamp()
+        if response.ok:
+            server_count = json_loads(response.content).get('total_count')
+    except (requests.exceptions.RequestException, TypeError, ValueError) as e:
+        print(f"Warning: Could not read Redmine server status, using local clock. Error: {e}")
+    return server_time, server_count
+
+def search_redmine_mirror(search_term):
+    """
+    Yerel aynada trigram tam metin indeksi üzerinden başlık ve açıklamada arama yapar.
+    Tarama ve sunucu arama modlarıyla aynı şekilde terimler Türkçe katlanmış alt metin olarak eşleşir;
+    sorgu maliyeti toplam issue sayısına değil aday sayısına bağlıdır.
+    Çok terimli sorgularda olumlu terimler tek MATCH ifadesinde VEYA'lanır, mantıksal ifade adaylar üzerinde uygulanır.
+    """
+    query = parse_search_query(search_term)
+    positive_queries = [
+        build_fts_query(query.folded_terms[query.terms.index(term)]) for term in query.positive_terms
+    ]
+    
+    select_sql = (
+        "SELECT i.id, i.subject, i.description, i.tracker, i.status, i.author, i.created_on, "
+        "f.subject, f.description FROM issues_fts f JOIN issues i ON i.id = f.rowid "
+    )
+    conn = open_redmine_mirror()
+    try:
+        with perf_span('redmine.mirror_search', terms=len(query.terms)) as span:
+            if all(positive_queries):
+                rows = conn.execute(
+                    select_sql + "WHERE issues_fts MATCH ? ORDER BY i.id",
+                    (" OR ".join(positive_queries),)
+                ).fetchall()
+            else:
+                # 3 karakterden kısa bir terim varsa adaylar yerel aynanın tamamıdır
+                rows = conn.execute(select_sql + "ORDER BY i.id").fetchall()
+            span['items'] = len(rows)
+    finally:
+        conn.close()
+    
+    # Adaylar katlanmış sütunlarda doğrulanır (kısa terimler ve DEĞİL/VE ifadeleri için)
+    return [
+        redmine_result_row(*row[:6], parse_wall_clock(row[6]))
+        for row in rows
+        if query.matches([term in row[7] or term in row[8] for term in query.folded_terms])
+    ]
+
+# ==============================================================================
+# 1.4 TAM METİN ARAMA YARDIMCILARI (TÜRKÇE BÜYÜK/KÜÇÜK HARF)
+# ==============================================================================
+# İ/I/ı/i harflerinin hepsi 'i' olarak eşlenir; böylece "ılık", "ILIK" ve "İlik" birbirini bulur
+TURKISH_CASEFOLD_TABLE = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+
+def turkish_casefold(text):
+    """
+    Metni Türkçe harfleri de dikkate alarak büyük/küçük harf duyarsız karşılaştırma için katlar
+    """
+    return (text or '').translate(TURKISH_CASEFOLD_TABLE).casefold()
+
+def build_fts_query(folded_text):
+    """
+    Katlanmış arama metnini trigram FTS5 MATCH ifadesine çevirir; ifade metni alt metin olarak bulur.
+    Trigram indeksi 3 karakterden kısa metinleri aramaya yetmediği için bu durumda None döner.
+    """
+    if len(folded_text) < 3:
+        return None
+    return '"' + folded_text.replace('"', '""') + '"'
+
+# ==============================================================================
+# 1.5 ÇOK TERİMLİ MANTIKSAL SORGULAR (VE / VEYA / DEĞİL)
+# ==============================================================================
+# Sözdizimi: #hashtag, kelime, "tırnaklı ifade", VE/AND, VEYA/OR, DEĞİL/NOT, -terim ve parantez.
+# Öncelik: VEYA < VE < DEĞİL. Yan yana yazılan hashtag/ifadeler VE ile bağlanır ("#atp #yama" = "#atp VE #yama");
+# operatörsüz ardışık düz kelimeler ise eskisi gibi tek ifade sayılır ("yama notu").
+# Operatörler sadece büyük harfle yazıldığında geçerlidir; "yama not", "ve" gibi aramalar düz metindir.
+# Parantez ve baştaki '-' de sadece sorguda operatör varken sözdizimidir; operatörsüz "ATP (test)" ve "-foo"
+# eskisi gibi düz alt metin olarak aranır. Operatörlü sorgu hatalıysa ("NOT #atp", "#atp OR") hata verilir.
+QUERY_OPERATORS = {'AND': 'AND', 'VE': 'AND', 'OR': 'OR', 'VEYA': 'OR', 'NOT': 'NOT', 'DEĞİL': 'NOT'}
+QUERY_TOKEN_PATTERN = re.compile(r'[()]|-?"[^"]*"\*?|[^\s()]+')
+LITERAL_QUERY_TOKEN_PATTERN = re.compile(r'"[^"]*"\*?|\S+')
+# Post'ta 'hashtags' alanı yoksa (eski önbellek kayıtları) mesajdan çıkarılır; sondaki noktalama dahil edilmez
+MATTERMOST_HASHTAG_PATTERN = re.compile(r'(?<![\w#])#[^\W\d_](?:[\w.-]*\w)?')
+
+class SearchQuery:
+    """
+    Ayrıştırılmış arama sorgusu.
+    - terms: benzersiz terimler (yazıldığı haliyle, örn. '#atp', '"yama notu"', 'yama notu')
+    - expression: ('term', i), ('NOT', x), ('AND', x, y), ('OR', x, y) düğümlerinden oluşan ağaç
+    - positive_terms: DEĞİL altında kalmayan terimler; kaynaklarda aday toplamak için sadece bunlar aranır
+    """
+    __slots__ = ('terms', 'texts', 'folded_terms', 'expression', 'positive_terms')
+    
+    def __init__(self, terms, expression):
+        self.terms = tuple(terms)
+        self.texts = tuple(query_term_text(term) for term in terms)
+        self.folded_terms = tuple(turkish_casefold(text) for text in self.texts)
+        self.expression = expression
+        self.positive_terms = tuple(terms[index] for index in sorted(positive_term_indexes(expression)))
+    
+    @property
+    def is_single(self):
+        return self.expression == ('term', 0)
+    
+    def matches(self, matched):
+        """matched: her terim için (terms sırasıyla) eşleşip eşleşmediği"""
+        return evaluate_query(self.expression, matched)
+    
+    def matches_texts(self, *texts):
+        """Terimleri Türkçe katlanmış alt metin olarak verilen metinlerin herhangi birinde arar"""
+        folded_texts = [turkish_casefold(text) for text in texts]
+        return self.matches([any(term in text for text in folded_texts) for term in self.folded_terms])
+    
+    def canonical(self):
+        """Önbellek anahtarı ve istatistikler için tek tip yazım (tek terimde terimin kendisi)"""
+        return format_query(self.expression, self.terms)
+
+def query_term_text(term):
+    """Terimin aranan metni: tırnaklar ve sondaki '*' atılır"""
+    text = term.strip()
+    if len(text) >= 2 and text.startswith('"') and text.endswith('"'):
+        text = text[1:-1]
+    return text.rstrip('*').strip()
+
+def is_hashtag_term(term):
+    return term.startswith('#') and len(term) > 1 and not any(ch.isspace() for ch in term)
+
+def positive_term_indexes(node, negated=False):
+    if node[0] == 'term':
+        return set() if negated else {node[1]}
+    if node[0] == 'NOT':
+        return positive_term_indexes(node[1], not negated)
+    return positive_term_indexes(node[1], negated) | positive_term_indexes(node[2], negated)
+
+def evaluate_query(node, matched):
+    operator = node[0]
+    if operator == 'term':
+        return matched[node[1]]
+    if operator == 'NOT':
+        return not evaluate_query(node[1], matched)
+    if operator == 'AND':
+        return evaluate_query(node[1], matched) and evaluate_query(node[2], matched)
+    return evaluate_query(node[1], matched) or evaluate_query(node[2], matched)
+
+def format_query(node, terms, parent=None):
+    operator = node[0]
+    if operator == 'term':
+        term = terms[node[1]]
+        # Düz metin olarak aranan operatör kelimeleri, parantezler ve baştaki '-' tekrar ayrıştırıldığında
+        # sözdizimi sayılmasın diye tırnaklanır (tek terimli sorgu operatörsüz ayrıştırıldığı için parantez/'-' kalabilir)
+        if term.startswith(('"', '#')):
+            return term
+        if any(word in QUERY_OPERATORS for word in term.split()) or (
+                parent is not None and (term.startswith('-') or '(' in term or ')' in term)):
+            return f'"{term}"'
+        return term
+    if operator == 'NOT':
+        return f"NOT {format_query(node[1], terms, 'NOT')}"
+    text = f"{format_query(node[1], terms, operator)} {operator} {format_query(node[2], terms, operator)}"
+    return text if parent in (None, operator) else f"({text})"
+
+@functools.lru_cache(maxsize=256)
+def parse_search_query(text):
+    """
+    Arama metnini SearchQuery'ye çevirir; hatalı sorguda Türkçe mesajlı ValueError fırlatır.
+    Metinde operatör yoksa parantez ve '-' düz karakter sayılır (operatörsüz ayrıştırma).
+    """
+    has_operators = any(token in QUERY_OPERATORS for token in QUERY_TOKEN_PATTERN.findall(text or ''))
+    return build_search_query(text, QUERY_OPERATORS if has_operators else {})
+
+def build_search_query(text, operators):
+    """
+    parse_search_query'nin ayrıştırıcısı; operators sözlüğündeki (büyük harfli) kelimeler operatör sayılır.
+    operators boşsa parantez ve '-' sözdizimi değildir; hashtag ve tırnaklı ifadeler yine ayrı terimdir.
+    """
+    syntax = bool(operators)
+    token_pattern = QUERY_TOKEN_PATTERN if syntax else LITERAL_QUERY_TOKEN_PATTERN
+    tokens = []
+    for token in token_pattern.findall(text or ''):
+        operator = None if token.startswith(('"', '-"')) else operators.get(token)
+        is_paren = syntax and token in ('(', ')')
+        is_word = operator is None and not is_paren and not token.startswith(('#', '"')) and not (
+            syntax and token.startswith('-'))
+        # Operatörsüz ardışık düz kelimeler tek ifade olarak birleştirilir
+        if is_word and tokens and tokens[-1][0] == 'word':
+            tokens[-1] = ('word', f"{tokens[-1][1]} {token}")
+        else:
+            tokens.append((operator or ('word' if is_word else token if is_paren else 'term'), token))
+    
+    terms = []
+    position = 0
+    
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+    
+    def parse_or():
+        nonlocal position
+        node = parse_and()
+        while peek() == 'OR':
+            position += 1
+            node = ('OR', node, parse_and())
+        return node
+    
+    def parse_and():
+        nonlocal position
+        node = parse_not()
+        while peek() not in (None, ')', 'OR'):
+            if peek() == 'AND':
+                position += 1
+            node = ('AND', node, parse_not())
+        return node
+    
+    def parse_not():
+        nonlocal position
+        if peek() == 'NOT':
+            position += 1
+            return ('NOT', parse_not())
+        return parse_atom()
+    
+    def parse_atom():
+        nonlocal position
+        kind = peek()
+        if kind is None:
+            raise ValueError("Sorgu eksik: bir terim bekleniyordu.")
+        token = tokens[position][1]
+        position += 1
+        if kind == '(':
+            node = parse_or()
+            if peek() != ')':
+                raise ValueError("Kapanmamış parantez.")
+            position += 1
+            return node
+        if kind not in ('term', 'word'):
+            raise ValueError(f"Beklenmeyen '{token}'.")
+        negated = syntax and token.startswith('-') and len(token) > 1
+        term = token[1:] if negated else token
+        if not query_term_text(term):
+            raise ValueError(f"Boş terim: '{token}'.")
+        if term not in terms:
+            terms.append(term)
+        node = ('term', terms.index(term))
+        return ('NOT', node) if negated else node
+    
+    if not tokens:
+        raise ValueError("Aranacak bir terim yok.")
+    expression = parse_or()
+    if position < len(tokens):
+        raise ValueError(f"Beklenmeyen '{tokens[position][1]}'.")
+    if evaluate_query(expression, [False] * len(terms)):
+        raise ValueError("Sorgu en az bir aranan (DEĞİL olmayan) terim içermeli.")
+    
+    return SearchQuery(terms, expression)
+
+# ==============================================================================
+# 2. MATTERMOST VERİ ÇEKME FONKSİYONU (OPTİMİZE EDİLMİŞ)
+# ==============================================================================
+def fast_mattermost_fetch(search_term, progress=None, on_rows=None):
+    print(f"Connecting to Mattermost and searching in {len(TARGET_MATTERMOST_CHANNELS)} specific channels...")
+    collected_data = []
+    
+    if MATTERMOST_FETCH_MODE == 'archive':
+        start_mattermost_archive_sync()
+        try:
+            if mattermost_archive_is_ready():
+                collected_data = search_mattermost_archive(search_term, progress=progress, on_rows=on_rows)
+                print(f"Found {len(collected_data)} threads for '{search_term}' in local Mattermost archive.")
+                return collected_data
+            print("Mattermost archive is not ready yet. Falling back to Mattermost API search...")
+        except Exception as e:
+            print(f"!!!! MATTERMOST ARCHIVE ERROR: {e} !!!! Falling back to Mattermost API search...")
+    
+    truncated = None
+    try:
+        search_plan = get_mattermost_search_plan()
+        if not search_plan: return []
+        
+        # Tembel modda thread gövdeleri çekilmez; sadece önizlemeler kurulur
+        if MATTERMOST_LAZY_THREADS:
+            return preview_mattermost_fetch(search_term, search_plan, progress=progress, on_rows=on_rows)
+        
+        # Önce normal arama yap (Mattermost API search); çok terimli sorgularda olumlu terimler tek aramada VEYA'lanır,
+        # mantıksal ifade thread'ler kurulduktan sonra build_mattermost_thread_row içinde uygulanır.
+        # Hedef kanalların bulunduğu her takımda, sadece o kanallarda (in:) aynı anda ve sayfa sayfa aranır;
+        # her sayfa geldiği anda yeni thread'leri çekilmeye başlanır.
+        search_terms = mattermost_search_terms(search_term)
+        deadline = time.monotonic() + MATTERMOST_SEARCH_TIME_BUDGET if MATTERMOST_SEARCH_TIME_BUDGET > 0 else None
+        page_events = queue.Queue()
+        stop_paging = threading.Event()
+        
+        def page_team(team_id, channel_names):
+            try:
+                for posts in iter_mattermost_search_pages(team_id, channel_names, search_terms, stop_paging):
+                    # Hedef kanallardaki thread'ler sıralamaya eklenir (in: filtresine rağmen kanal ayrıca doğrulanır)
+                    posts = [post for post in posts if post['channel_id'] in TARGET_MATTERMOST_CHANNELS]
+                    for post in posts:
+                        ranking.add(post.get('root_id') or post['id'], post.get('create_at', 0))
+                    page_events.put(posts)
+                    if posts and ranking.is_exhausted(min(post.get('create_at', 0) for post in posts)):
+                        break
+            except Exception as search_error:
+                page_events.put(search_error)
+            finally:
+                page_events.put(None)  # Bu takımın araması bitti
+        
+        ranking = MattermostThreadRanking()
+        processed_thread_ids = set()
+        thread_summaries = []
+        pending_threads = {}
+        running_teams = len(search_plan)
+        found_post_count = 0
+        
+        with ThreadPoolExecutor(max_workers=len(search_plan)) as search_executor, \
+                ThreadPoolExecutor(max_workers=max(1, MATTERMOST_THREAD_WORKERS)) as thread_executor:
+            for team_id, channel_names in search_plan.items():
+                submit_with_context(search_executor, page_team, team_id, channel_names)
+            
+            try:
+                while running_teams or pending_threads:
+                    if deadline is not None and time.monotonic() > deadline:
+                        truncated = f"{MATTERMOST_SEARCH_TIME_BUDGET:g} sn zaman sınırı"
+                        for future in pending_threads:
+                            future.cancel()
+                        break
+                    
+                    new_threads = {}  # kök ID -> aramada görülen en yeni post sürümü
+                    if running_teams:
+                        try:
+                            posts = page_events.get(timeout=0.05)
+                        except queue.Empty:
+                            posts = []
+                        if posts is None:
+                            running_teams -= 1
+                            posts = []
+                        elif isinstance(posts, Exception):
+                            raise posts
+                        found_post_count += len(posts)
+                        
+                        # Yeni thread'lerden sadece şu an sınır içinde kalanlar çekilir; sınır sayfalar geldikçe
+                        # daraldığından dışarıda kalan thread sonradan seçilemez (çekilip sonradan düşenler atılır)
+                        cutoff = ranking.cutoff()
+                        for post in posts:
+                            thread_id = post.get('root_id') or post['id']
+                            if thread_id in new_threads:
+                                new_threads[thread_id] = max(new_threads[thread_id], mattermost_post_version(post))
+                                continue
+                            if thread_id in processed_thread_ids or not ranking.is_selected(thread_id, cutoff):
+                                continue
+                            processed_thread_ids.add(thread_id)
+                            new_threads[thread_id] = mattermost_post_version(post)
+                    elif pending_threads:
+                        wait(pending_threads, timeout=0.05, return_when=FIRST_COMPLETED)
+                    
+                    # Daha önce (herhangi bir sorguda) çekilmiş ve hâlâ güncel olan thread özetleri önbellekten kullanılır
+                    cached_threads = {} if cache_refresh_mode.get() or not new_threads else fresh_mattermost_threads(new_threads)
+                    thread_summaries.extend(cached_threads.values())
+                    cached_rows = build_mattermost_rows(cached_threads.values(), search_term, fetch_users=False)
+                    collected_data.extend(cached_rows)
+                    if on_rows and cached_rows:
+                        on_rows(cached_rows)
+                    
+                    # Kalan thread'leri paylaşılan oturum üzerinden aynı anda çek (en fazla MATTERMOST_THREAD_WORKERS istek)
+                    for thread_id in new_threads:
+                        if thread_id not in cached_threads:
+                            future = submit_with_context(
+                                thread_executor, mattermost_request, 'GET', f"/posts/{thread_id}/thread", stage='mattermost.thread'
+                            )
+                            pending_threads[future] = thread_id
+                    
+                    for future in [future for future in pending_threads if future.done()]:
+                        thread_id = pending_threads.pop(future)
+                        try:
+                            thread = summarize_mattermost_thread(future.result())
+                            cache_mattermost_thread(thread_id, thread)
+                            thread_summaries.append(thread)
+                            rows = build_mattermost_rows([thread], search_term, fetch_users=False)
+                            collected_data.extend(rows)
+                            if on_rows and rows:
+                                on_rows(rows)
+                        except Exception as thread_error:
+                            print(f"Warning: Could not process Mattermost thread for ID {thread_id}. Error: {thread_error}")
+                    
+                    if progress:
+                        progress(len(processed_thread_ids) - len(pending_threads), len(processed_thread_ids))
+            finally:
+                stop_paging.set()
+        
+        # Sınır içinde kalan thread'ler sıralamadaki sırayla kesinleştirilir; akış sırasında bilinmeyen yazarlar
+        # da dahil tüm kullanıcılar tek istekle çözülür
+        selected_ids, capped = ranking.selected()
+        if capped and not truncated:
+            truncated = f"ilk {MATTERMOST_SEARCH_MAX_RESULTS} thread"
+        summaries_by_id = {thread['id']: thread for thread in thread_summaries if thread}
+        thread_summaries = [summaries_by_id[thread_id] for thread_id in selected_ids if thread_id in summaries_by_id]
+        collected_data = build_mattermost_rows(thread_summaries, search_term)
+        
+        print(f"Found {found_post_count} potential posts with '{search_term}' in {len(search_plan)} teams, "
+              f"{len(processed_thread_ids)} threads processed.")
+        if truncated:
+            print(f"Mattermost results for '{search_term}' truncated ({truncated}).")
+                
+    except requests.exceptions.RequestException as e:
+        print(f"!!!! MATTERMOST ERROR: {e} !!!!")
+        
+    return SourceResults(collected_data, truncated=truncated)
+
+def mattermost_search_terms(search_term, negative=False):
+    """
+    posts/search 'terms' değeri: tek hashtag'de kendisi, diğer sorgularda olumlu terimler (ifadeler tırnaklı).
+    negative=True ise sadece DEĞİL ile dışlanan terimler döner (yoksa boş metin).
+    """
+    query = parse_search_query(search_term)
+    if not negative and query.is_single and is_hashtag_term(search_term):
+        return search_term
+    return " ".join(
+        f'"{query.texts[index]}"' if ' ' in query.texts[index] else query.texts[index]
+        for index, term in enumerate(query.terms) if (term in query.positive_terms) != negative
+    )
+
+# Tamamlanmış thread özetlerinin önbellek süresi (süresiz; bellekte sadece LRU ile düşer)
+THREAD_CACHE_FOREVER = float('inf')
+
+def cache_mattermost_thread(thread_id, thread):
+    """
+    Thread özetini önbelleğe yazar; tamamlanmış thread'ler değişmediği sürece süresiz tutulur
+    """
+    if thread is None:
+        return
+    ttl = THREAD_CACHE_FOREVER if thread['status'] == "tamamlandi" else None
+    get_entity_cache().set('mattermost_thread_summary', thread_id, thread, ttl=ttl)
+
+def fresh_mattermost_threads(seen_versions):
+    """
+    {kök ID: aramada görülen post sürümü} için önbellekteki hâlâ geçerli thread özetlerini {kök ID: özet} döndürür.
+    - Aramada özetten daha yeni bir post görüldüyse özet geçersizdir
+    - Tamamlanmış thread'ler başka kontrol yapılmadan kullanılır
+    - Devam eden thread'lerin kök post'ları tek bir POST /posts/ids isteğiyle çekilir; son yanıt/değişiklik zamanı
+      özetteki sürümden yeni olanlar dışarıda bırakılır (yeniden çekilir)
+    """
+    cached = get_entity_cache().get_many('mattermost_thread_summary', list(seen_versions))
+    fresh = {}
+    recheck = {}
+    for thread_id, thread in cached.items():
+        if thread['version'] < seen_versions[thread_id]:
+            continue
+        if thread['status'] == "tamamlandi":
+            fresh[thread_id] = thread
+        else:
+            recheck[thread_id] = thread
+    
+    if recheck:
+        try:
+            root_posts = mattermost_request('POST', "/posts/ids", stage='mattermost.recheck', json=list(recheck))
+            root_versions = {post['id']: mattermost_post_version(post) for post in root_posts or []}
+            for thread_id, thread in recheck.items():
+                if root_versions.get(thread_id, float('inf')) <= thread['version']:
+                    fresh[thread_id] = thread
+        except requests.exceptions.RequestException as e:
+            print(f"Warning: Could not recheck {len(recheck)} in-progress Mattermost threads, fetching them again. Error: {e}")
+    
+    return fresh
+
+def mattermost_post_version(post):
+    """
+    Post'un en son değişiklik zamanı (ms); kök post'ta son yanıt zamanı (last_reply_at) da dahildir
+    """
+    return max(post.get('update_at') or 0, post.get('last_reply_at') or 0, post.get('create_at') or 0)
+
+def mattermost_post_hashtags(post):
+    """
+    Post'un küçük harfli hashtag listesi; 'hashtags' alanı yoksa (eski kayıtlar) mesajdan çıkarılır
+    """
+    hashtags = post.get('hashtags')
+    if hashtags is None:
+        hashtags = " ".join(MATTERMOST_HASHTAG_PATTERN.findall(post.get('message', '')))
+    return hashtags.lower()
+
+def summarize_mattermost_thread(full_thread):
+    """
+    /posts/{id}/thread cevabını (veya yerel arşivden kurulan aynı yapıyı) arama teriminden bağımsız thread özetine çevirir.
+    Özet önbelleğe yazılır; sıralama ve "killed a prey" durum taraması her thread sürümü için bir kez yapılır.
+    - version: thread'deki en son değişiklik zamanı (ms)
+    - posts: kök mesaj başta, yanıtlar oluşturulma zamanına göre [create_at, user_id, message, hashtags]
+    Boş thread için None döner.
+    """
+    posts = full_thread.get('posts') or {}
+    if not posts: return None
+    
+    # API 'order' listesini yeniden eskiye sıralayabildiği için kök mesaj root_id'den bulunur,
+    # yanıtlar oluşturulma zamanına göre sıralanır
+    ordered_posts = sorted(posts.values(), key=lambda post: post.get('create_at', 0))
+    root_post = next((post for post in ordered_posts if not post.get('root_id')), ordered_posts[0])
+    thread_posts = [root_post] + [post for post in ordered_posts if post is not root_post]
+    
+    thread_contains_killed_prey = any("killed a prey" in post.get('message', '').lower() for post in thread_posts)
+    
+    return {
+        "id": root_post.get('id', 'Unknown'),
+        "channel_id": root_post.get('channel_id', 'Unknown'),
+        "version": max(mattermost_post_version(post) for post in thread_posts),
+        "status": "tamamlandi" if thread_contains_killed_prey else "devam_ediyor",
+        "posts": [
+            [post.get('create_at', 0), post.get('user_id', 'User'), post.get('message', ''), mattermost_post_hashtags(post)]
+            for post in thread_posts
+        ]
+    }
+
+def mattermost_thread_matches(query, thread_posts):
+    """
+    Thread'in (tüm mesajlarıyla birlikte) sorguyu sağlayıp sağlamadığını döndürür.
+    Hashtag terimleri Mattermost'taki gibi post'un hashtag listesinde birebir, diğer terimler mesaj metninde aranır.
+    """
+    hashtags = set()
+    folded_messages = []
+    for _, _, message, post_hashtags in thread_posts:
+        hashtags.update(post_hashtags.split())
+        folded_messages.append(turkish_casefold(message))
+    
+    return query.matches([
+        text.lower() in hashtags if is_hashtag_term(term) else any(folded in message for message in folded_messages)
+        for term, text, folded in zip(query.terms, query.texts, query.folded_terms)
+    ])
+
+def build_mattermost_rows(threads, search_term, fetch_users=True):
+    """
+    Thread özetlerinden sonuç kayıtlarını oluşturur; tüm yazar ID'leri tek seferde isimlere çevrilir
+    (fetch_users=False ise sadece kullanıcı önbelleğindeki isimler kullanılır)
+    """
+    threads = [thread for thread in threads if thread]
+    users = resolve_mattermost_users(
+        (post[1] for thread in threads for post in thread['posts']), fetch_missing=fetch_users
+    )
+    rows = [build_mattermost_thread_row(thread, search_term, users) for thread in threads]
+    return [row for row in rows if row is not None]
+
+def build_mattermost_thread_row(thread, search_term, users=None):
+    """
+    Thread özetinden (summarize_mattermost_thread) arama terimine göre sonuç kaydını oluşturur.
+    users verilirse ({kullanıcı ID: isim}) yazarlar isimleriyle gösterilir.
+    Kök mesaj dışında ilgili bir yanıt yoksa veya thread sorguyu sağlamıyorsa None döner.
+    Önizlemelerde (preview_mattermost_fetch) sorgu sadece bilinen mesajlar üzerinde doğrulanır ve
+    kayıt tipi MATTERMOST_PREVIEW_CONTENT_TYPE olur.
+    """
+    if not thread: return None
+    users = users or {}
+    
+    def user_label(user_id):
+        # İsmi bilinmeyen kullanıcılar eskisi gibi ID ile gösterilir
+        return users.get(user_id) or f"User {user_id}"
+    
+    # Tek hashtag araması Mattermost'un kendi eşleşmesine bırakılır; diğer sorgular thread üzerinde doğrulanır
+    query = parse_search_query(search_term)
+    if not (query.is_single and is_hashtag_term(search_term)) and not mattermost_thread_matches(query, thread['posts']):
+        return None
+    
+    positive_texts = [query.texts[query.terms.index(term)].lower() for term in query.positive_terms]
+    root_created, root_author, root_message, _ = thread['posts'][0]
+    root_datetime = datetime.datetime.fromtimestamp(root_created / 1000)
+    root_date = root_datetime.strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Kök mesajı her zaman ekle (bağlam için)
+    relevant_messages = [f"--- KONU BAŞLANGICI ---\n[{root_date} - {user_label(root_author)}]:\n{root_message}"]
+    
+    # Thread içindeki tüm yanıtları kontrol et
+    for created, author, message, _ in thread['posts'][1:]:
+        message_lower = message.lower()
+        
+        # Aranan terimlerden biri bu mesajda var mı? (bağlam için ekle)
+        if any(text in message_lower for text in positive_texts):
+            reply_date = datetime.datetime.fromtimestamp(created / 1000).strftime('%H:%M:%S')
+            relevant_messages.append(f"--- İLGİLİ YANIT ---\n[{reply_date} - {user_label(author)}]:\n{message}")
+        
+        # "killed a prey" bu mesajda var mı?
+        if "killed a prey" in message_lower:
+            reply_date = datetime.datetime.fromtimestamp(created / 1000).strftime('%H:%M:%S')
+            relevant_messages.append(f"--- İLGİLİ YANIT (KILLED A PREY) ---\n[{reply_date} - {user_label(author)}]:\n{message}")
+    
+    # En az kök mesajı ve bir yanıt olmalı
+    if len(relevant_messages) <= 1:
+        return None
+    
+    return ResultRecord(
+        "Mattermost",
+        thread['id'],
+        MATTERMOST_PREVIEW_CONTENT_TYPE if thread.get('preview') else "Mattermost Thread",
+        f"Mattermost Konusu: {thread['id']}",
+        "\n\n".join(relevant_messages),
+        users.get(root_author) or root_author,
+        wall_clock_epoch(root_datetime),
+        channel_id=thread['channel_id'],
+        status=thread['status']  # Durum özet çıkarılırken bir kez hesaplanır
+    )
+
+# ==============================================================================
+# 2.1 MATTERMOST HTTP OTURUMU (KEEP-ALIVE + RATE LIMIT)
+# ==============================================================================
+@st.cache_resource(show_spinner=False)
+def get_mattermost_session():
+    """
+    Tüm Mattermost çağrılarının paylaştığı keep-alive bağlantı havuzlu oturumu döndürür
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, MATTERMOST_THREAD_WORKERS))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({"Authorization": f"Bearer {MATTERMOST_TOKEN}"})
+    return session
+
+def mattermost_retry_delay(response, attempt):
+    """
+    429 cevabı için beklenecek süreyi (saniye) Retry-After / X-Ratelimit-Reset başlıklarından hesaplar
+    """
+    for header in ('Retry-After', 'X-Ratelimit-Reset'):
+        value = response.headers.get(header)
+        if value:
+            try:
+                return min(max(float(value), 0.1), 60)
+            except ValueError:
+                pass
+    return min(2 ** attempt, 60)
+
+def mattermost_request(method, path, stage='mattermost.request', **kwargs):
+    """
+    Mattermost API çağrısı yapar ve JSON cevabı döndürür.
+    429 (rate limit) cevaplarında MATTERMOST_MAX_RETRIES kez bekleyip tekrar dener.
+    stage: çağrının performans ölçümünde görüneceği aşama adı (bkz. perf_span)
+    """
+    session = get_mattermost_session()
+    url = f"{MATTERMOST_BASE_URL}{path}"
+    
+    with perf_span(stage) as span:
+        for attempt in range(MATTERMOST_MAX_RETRIES + 1):
+            response = session.request(method, url, timeout=MATTERMOST_REQUEST_TIMEOUT, **kwargs)
+            if response.status_code == 429 and attempt < MATTERMOST_MAX_RETRIES:
+                delay = mattermost_retry_delay(response, attempt)
+                print(f"Mattermost rate limit hit for {path}. Retrying in {delay:.1f}s...")
+                span['retries'] = attempt + 1
+                time.sleep(delay)
+                continue
+            response.raise_for_status()
+            data = json_loads(response.content)
+            span['bytes'] = len(response.content)
+            posts = data.get('posts') if isinstance(data, dict) else data
+            span['items'] = len(posts) if isinstance(posts, (dict, list)) else 1
+            return data
+
+# ==============================================================================
+# 2.2 MATTERMOST YEREL ARŞİV (SQLITE) - SINCE İLE ARTIMLI KANAL EŞİTLEME
+# ==============================================================================
+# Şema değişirse sürüm artırılır; eski arşiv silinip baştan doldurulur
+MATTERMOST_ARCHIVE_SCHEMA_VERSION = 1
+
+MATTERMOST_ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    root_id TEXT NOT NULL DEFAULT '',
+    user_id TEXT,
+    message TEXT NOT NULL DEFAULT '',
+    hashtags TEXT NOT NULL DEFAULT '',
+    create_at INTEGER NOT NULL,
+    update_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_root_id ON posts (root_id);
+CREATE INDEX IF NOT EXISTS posts_channel_id ON posts (channel_id);
+
+-- Kanal başına son görülen değişiklik zamanı (ms); bir sonraki since değeri
+CREATE TABLE IF NOT EXISTS channel_sync (
+    channel_id TEXT PRIMARY KEY,
+    watermark INTEGER NOT NULL,
+    last_sync_at REAL NOT NULL
+);
+"""
+
+ARCHIVE_PAGE_SIZE = 200  # Mattermost kanal sayfalamasında izin verilen en büyük değer
+ARCHIVE_SINCE_LIMIT = 1000  # Mattermost'un tek bir since cevabında döndürdüğü en fazla post (sayfalanamaz)
+
+def open_mattermost_archive():
+    """
+    Mattermost arşiv veritabanını açar, şema yoksa veya eskiyse yeniden oluşturur
+    """
+    conn = sqlite3.connect(MATTERMOST_ARCHIVE_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS archive_state (key TEXT PRIMARY KEY, value TEXT)")
+    
+    row = conn.execute("SELECT value FROM archive_state WHERE key = 'schema_version'").fetchone()
+    if row is None or row[0] != str(MATTERMOST_ARCHIVE_SCHEMA_VERSION):
+        print(f"Preparing Mattermost archive schema (version {MATTERMOST_ARCHIVE_SCHEMA_VERSION})...")
+        conn.execute("DROP TABLE IF EXISTS posts")
+        conn.execute("DROP TABLE IF EXISTS channel_sync")
+        conn.executescript(MATTERMOST_ARCHIVE_SCHEMA)
+        conn.execute(
+            "INSERT OR REPLACE INTO archive_state (key, value) VALUES ('schema_version', ?)",
+            (str(MATTERMOST_ARCHIVE_SCHEMA_VERSION),)
+        )
+        conn.commit()
+    
+    return conn
+
+@st.cache_resource(show_spinner=False)
+def get_mattermost_archive_lock():
+    """
+    Aynı süreçte arşivin aynı anda iki kez eşitlenmesini engelleyen kilit
+    """
+    return threading.Lock()
+
+def mattermost_archive_is_ready():
+    """
+    Tüm hedef kanallar en az bir kez tam olarak arşivlendiyse True döner
+    """
+    conn = open_mattermost_archive()
+    try:
+        synced_channels = {row[0] for row in conn.execute("SELECT channel_id FROM channel_sync")}
+    finally:
+        conn.close()
+    return all(channel_id in synced_channels for channel_id in TARGET_MATTERMOST_CHANNELS)
+
+def apply_mattermost_posts(conn, posts):
+    """
+    API'den gelen post'ları arşive yazar; silinmiş (delete_at > 0) post'ları arşivden kaldırır.
+    Görülen en büyük değişiklik zamanını (ms) döndürür.
+    """
+    latest_change = 0
+    upserts = []
+    deletes = []
+    for post in posts:
+        latest_change = max(latest_change, post.get('update_at', 0), post.get('create_at', 0), post.get('delete_at', 0))
+        if post.get('delete_at'):
+            deletes.append((post['id'],))
+            continue
+        upserts.append((
+            post['id'],
+            post['channel_id'],
+            post.get('root_id') or '',
+            post.get('user_id'),
+            post.get('message') or '',
+            (post.get('hashtags') or '').lower(),
+            post.get('create_at', 0),
+            post.get('update_at', 0)
+        ))
+    
+    if upserts:
+        conn.executemany(
+            "INSERT OR REPLACE INTO posts (id, channel_id, root_id, user_id, message, hashtags, create_at, update_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            upserts
+        )
+    if deletes:
+        conn.executemany("DELETE FROM posts WHERE id = ?", deletes)
+    
+    return latest_change
+
+def sync_mattermost_channel(conn, channel_id):
+    """
+    Tek bir kanalı eşitler. İlk seferde tüm kanal sayfa sayfa indirilir,
+    sonrasında /channels/{id}/posts?since= ile sadece yeni, düzenlenen veya silinen post'lar çekilir.
+    since cevabı sunucu sınırına (ARCHIVE_SINCE_LIMIT) ulaşırsa değişikliklerin bir kısmı dönmemiş olabilir;
+    bu durumda watermark ilerletilmez, kanal aynı işlemde baştan indirilir.
+    """
+    row = conn.execute("SELECT watermark FROM channel_sync WHERE channel_id = ?", (channel_id,)).fetchone()
+    synced_count = 0
+    rebuild = row is None
+    
+    if not rebuild:
+        watermark = row[0]
+        post_list = mattermost_request('GET', f"/channels/{channel_id}/posts", params={"since": watermark})
+        posts = list((post_list.get('posts') or {}).values())
+        if len(posts) < ARCHIVE_SINCE_LIMIT:
+            watermark = max(watermark, apply_mattermost_posts(conn, posts))
+            synced_count = len(posts)
+        else:
+            print(f"Mattermost since sync for channel {channel_id} reached the server limit ({len(posts)} posts); rebuilding channel...")
+            # Eski kayıtlar yeni sayfalarla aynı işlemde değişir; arama yapanlar commit'e kadar eski arşivi görür
+            conn.execute("DELETE FROM posts WHERE channel_id = ?", (channel_id,))
+            rebuild = True
+    
+    if rebuild:
+        print(f"Building Mattermost archive for channel {channel_id}...")
+        watermark = 0
+        page = 0
+        while True:
+            post_list = mattermost_request(
+                'GET', f"/channels/{channel_id}/posts", params={"page": page, "per_page": ARCHIVE_PAGE_SIZE}
+            )
+            posts = [post_list['posts'][post_id] for post_id in post_list.get('order', [])]
+            if not posts:
+                break
+            watermark = max(watermark, apply_mattermost_posts(conn, posts))
+            synced_count += len(posts)
+            page += 1
+    
+    conn.execute(
+        "INSERT OR REPLACE INTO channel_sync (channel_id, watermark, last_sync_at) VALUES (?, ?, ?)",
+        (channel_id, watermark, time.time())
+    )
+    conn.commit()
+    return synced_count
+
+def sync_mattermost_archive():
+    """
+    Tüm hedef kanalları arşivle eşitler. Başka bir thread eşitleme yapıyorsa hemen döner.
+    """
+    lock = get_mattermost_archive_lock()
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        conn = open_mattermost_archive()
+        try:
+            for channel_id in TARGET_MATTERMOST_CHANNELS:
+                try:
+                    with perf_span('mattermost.archive_sync', channel_id=channel_id) as span:
+                        synced_count = sync_mattermost_channel(conn, channel_id)
+                        span['items'] = synced_count
+                    if synced_count:
+                        print(f"Mattermost archive: {synced_count} changed posts synced for channel {channel_id}.")
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Warning: Could not sync Mattermost channel {channel_id}. Error: {e}")
+        finally:
+            conn.close()
+    finally:
+        lock.release()
+
+def mattermost_archive_sync_loop():
+    while True:
+        try:
+            sync_mattermost_archive()
+        except Exception as e:
+            print(f"!!!! MATTERMOST ARCHIVE SYNC ERROR: {e} !!!!")
+        time.sleep(MATTERMOST_ARCHIVE_SYNC_INTERVAL)
+
+@st.cache_resource(show_spinner=False)
+def start_mattermost_archive_sync():
+    """
+    Arşivi MATTERMOST_ARCHIVE_SYNC_INTERVAL aralıklarla eşitleyen arka plan thread'ini (süreç başına bir kez) başlatır
+    """
+    thread = threading.Thread(target=mattermost_archive_sync_loop, name="mattermost-archive-sync", daemon=True)
+    thread.start()
+    return thread
+
+def load_archived_threads(conn, root_ids):
+    """
+    Verilen kök ID'leri için thread'leri arşivden /posts/{id}/thread cevabı biçiminde kurar
+    """
+    threads = {root_id: {"order": [], "posts": {}} for root_id in root_ids}
+    
+    # SQLite değişken sınırına takılmamak için parça parça sorgula
+    for start in range(0, len(root_ids), 400):
+        chunk = root_ids[start:start + 400]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            "SELECT id, channel_id, root_id, user_id, message, hashtags, create_at, update_at FROM posts "
+            f"WHERE id IN ({placeholders}) OR root_id IN ({placeholders}) ORDER BY create_at",
+            chunk + chunk
+        )
+        for post_id, channel_id, root_id, user_id, message, hashtags, create_at, update_at in rows:
+            thread = threads[root_id or post_id]
+            thread["order"].append(post_id)
+            thread["posts"][post_id] = {
+                "id": post_id,
+                "channel_id": channel_id,
+                "root_id": root_id,
+                "user_id": user_id,
+                "message": message,
+                "hashtags": hashtags,
+                "create_at": create_at,
+                "update_at": update_at
+            }
+    
+    return threads
+
+def search_mattermost_archive(search_term, progress=None, on_rows=None):
+    """
+    Arama, thread kurulumunu ve "killed a prey" durum kontrolünü tamamen yerel arşivde yapar.
+    Çok terimli sorgularda olumlu terimlerin koşulları tek sorguda VEYA'lanır.
+    API modlarıyla aynı şekilde en fazla MATTERMOST_SEARCH_MAX_RESULTS thread (MattermostThreadRanking sırasıyla) döner.
+    """
+    query = parse_search_query(search_term)
+    placeholders = ",".join("?" * len(TARGET_MATTERMOST_CHANNELS))
+    
+    term_conditions = []
+    term_params = []
+    for term, text, folded in zip(query.terms, query.texts, query.folded_terms):
+        if term not in query.positive_terms:
+            continue
+        if is_hashtag_term(term):
+            # Mattermost hashtag aramasıyla aynı şekilde: post'un hashtag listesinde birebir eşleşme
+            term_conditions.append("instr(' ' || hashtags || ' ', ?) > 0")
+            term_params.append(f" {text.lower()} ")
+        else:
+            term_conditions.append("instr(turkish_casefold(message), ?) > 0")
+            term_params.append(folded)
+    
+    conn = open_mattermost_archive()
+    conn.create_function('turkish_casefold', 1, turkish_casefold, deterministic=True)
+    try:
+        with perf_span('mattermost.archive_search', terms=len(query.terms)) as span:
+            ranking = MattermostThreadRanking()
+            for root_id, created in conn.execute(
+                "SELECT CASE WHEN root_id != '' THEN root_id ELSE id END AS thread_id, MAX(create_at) FROM posts "
+                f"WHERE channel_id IN ({placeholders}) AND ({' OR '.join(term_conditions)}) GROUP BY thread_id",
+                list(TARGET_MATTERMOST_CHANNELS) + term_params
+            ):
+                ranking.add(root_id, created)
+            root_ids, capped = ranking.selected()
+            threads = load_archived_threads(conn, root_ids)
+            span['items'] = len(threads)
+            span['truncated'] = 1 if capped else 0
+    finally:
+        conn.close()
+    
+    thread_summaries = []
+    for done_count, (root_id, full_thread) in enumerate(threads.items(), start=1):
+        if progress:
+            progress(done_count, len(threads))
+        try:
+            thread_summaries.append(summarize_mattermost_thread(full_thread))
+        except Exception as thread_error:
+            print(f"Warning: Could not process archived Mattermost thread for ID {root_id}. Error: {thread_error}")
+    
+    collected_data = build_mattermost_rows(thread_summaries, search_term)
+    if on_rows and collected_data:
+        on_rows(collected_data)
+    return SourceResults(collected_data, truncated=f"ilk {MATTERMOST_SEARCH_MAX_RESULTS} thread" if capped else None)
+
+# ==============================================================================
+# 2.3 MATTERMOST ARAMA PLANI (TAKIM VE KANAL KAPSAMLI ARAMA)
+# ==============================================================================
+@st.cache_resource(show_spinner=False)
+def get_mattermost_search_plan():
+    """
+    Hedef kanalları sahibi olan takımlara göre gruplar: {team_id: [kanal adı, ...]}.
+    Kanal ve takım bilgisi süreç boyunca bir kez çekilir; takımsız (DM/grup) kanallar herhangi bir takımda aranabilir.
+    """
+    plan = {}
+    teamless_channels = []
+    for channel_id in TARGET_MATTERMOST_CHANNELS:
+        channel = mattermost_request('GET', f"/channels/{channel_id}", stage='mattermost.channel')
+        if channel.get('team_id'):
+            plan.setdefault(channel['team_id'], []).append(channel['name'])
+        else:
+            teamless_channels.append(channel['name'])
+    
+    if teamless_channels:
+        team_id = next(iter(plan), None)
+        if team_id is None:
+            teams = mattermost_request('GET', "/users/me/teams")
+            if not teams:
+                return plan
+            team_id = teams[0]['id']
+        plan.setdefault(team_id, []).extend(teamless_channels)
+    
+    print(f"Mattermost search plan: {sum(len(names) for names in plan.values())} channels in {len(plan)} teams.")
+    return plan
+
+def iter_mattermost_search_pages(team_id, channel_names, search_terms, stop=None):
+    """
+    Bir takımda sadece verilen kanallarda (in:kanal filtreleri) arama yapar; sonuçları sayfa sayfa
+    (post listesi olarak) geldikçe döndürür. stop (threading.Event) kurulursa sonraki sayfa istenmez.
+    """
+    channel_filters = " ".join(f"in:{name}" for name in channel_names)
+    page = 0
+    while stop is None or not stop.is_set():
+        payload = {
+            "terms": f"{search_terms} {channel_filters}",
+            "is_or_search": True,
+            "page": page,
+            "per_page": MATTERMOST_SEARCH_PAGE_SIZE
+        }
+        search_results = mattermost_request('POST', f"/teams/{team_id}/posts/search", stage='mattermost.search', json=payload)
+        posts = search_results.get('posts') or {}
+        order = search_results.get('order') or list(posts)
+        yield [posts[post_id] for post_id in order if post_id in posts]
+        
+        # Eski sunucular has_next döndürmez; eksik sayfa son sayfadır
+        if not search_results.get('has_next', len(order) >= MATTERMOST_SEARCH_PAGE_SIZE):
+            break
+        page += 1
+
+class MattermostThreadRanking:
+    """
+    Aranan terimle eşleşen thread'leri arşiv, tam ve tembel modda aynı sırayla seçer: eşleşen en yeni post'un
+    tarihi (yeniden eskiye), eşitlikte kök ID. MATTERMOST_SEARCH_MAX_RESULTS sınırı bu sıralamadan sonra uygulanır;
+    böylece takımların sayfa geliş sırası hangi thread'lerin kalacağını değiştirmez. Thread-safe.
+    """
+    def __init__(self, limit=None):
+        self.limit = MATTERMOST_SEARCH_MAX_RESULTS if limit is None else limit
+        self.lock = threading.Lock()
+        self.times = {}  # kök ID -> eşleşen en yeni post'un create_at değeri
+    
+    def add(self, thread_id, created):
+        """Thread'i (veya daha yeni eşleşmesini) kaydeder; thread ilk kez görülüyorsa True"""
+        with self.lock:
+            is_new = thread_id not in self.times
+            self.times[thread_id] = max(created, self.times.get(thread_id, created))
+            return is_new
+    
+    def cutoff(self):
+        """Sınırdaki (limit'inci) thread'in sıralama anahtarı; sınır yoksa veya dolmadıysa None"""
+        with self.lock:
+            if not self.limit or len(self.times) < self.limit:
+                return None
+            return heapq.nsmallest(self.limit, ((-created, thread_id) for thread_id, created in self.times.items()))[-1]
+    
+    def is_selected(self, thread_id, cutoff):
+        with self.lock:
+            return cutoff is None or (-self.times[thread_id], thread_id) <= cutoff
+    
+    def is_exhausted(self, oldest_created):
+        """
+        Takımın arama sayfaları yeniden eskiye sıralı geldiğinden, sayfadaki en eski post sınırdaki thread'den de
+        eskiyse sonraki sayfalar seçilecek thread getiremez; o takımın sayfalaması durdurulabilir
+        """
+        cutoff = self.cutoff()
+        return cutoff is not None and -oldest_created > cutoff[0]
+    
+    def selected(self):
+        """(sıralı seçilen kök ID'ler, sınıra takıldı mı) döner"""
+        with self.lock:
+            ordered = sorted(self.times, key=lambda thread_id: (-self.times[thread_id], thread_id))
+        if self.limit and len(ordered) > self.limit:
+            return ordered[:self.limit], True
+        return ordered, False
+
+# ==============================================================================
+# 2.4 MATTERMOST KULLANICI DİZİNİ (TOPLU ID ÇÖZÜMLEME)
+# ==============================================================================
+def mattermost_user_label(user):
+    """
+    Kullanıcının görünen ismi: "Ad Soyad (@kullanıcı)", ad yoksa "@kullanıcı"
+    """
+    full_name = " ".join(part for part in (user.get('first_name'), user.get('last_name')) if part)
+    username = user.get('username') or user.get('id', '')
+    return f"{full_name} (@{username})" if full_name else f"@{username}"
+
+def resolve_mattermost_users(user_ids, fetch_missing=True):
+    """
+    Kullanıcı ID'lerini görünen isimlere çevirir: {ID: isim}.
+    Varlık önbelleğinde (bellek + disk, MATTERMOST_USER_CACHE_TTL) olmayanlar tek bir POST /users/ids isteğiyle çekilir;
+    fetch_missing=False ise sadece önbellek kullanılır. Çözülemeyen ID'ler sonuçta yer almaz.
+    """
+    user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id]
+    if not user_ids:
+        return {}
+    
+    cache = get_entity_cache()
+    found = cache.get_many('mattermost_user', user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in found]
+    if missing and fetch_missing:
+        try:
+            users = mattermost_request('POST', "/users/ids", stage='mattermost.users', json=missing)
+            labels = {user['id']: mattermost_user_label(user) for user in users or []}
+            # Bulunamayan (silinmiş) kullanıcılar her aramada tekrar sorulmasın diye boş isimle saklanır
+            fetched = {user_id: labels.get(user_id) for user_id in missing}
+            cache.set_many('mattermost_user', fetched, ttl=MATTERMOST_USER_CACHE_TTL)
+            found.update(fetched)
+        except requests.exceptions.RequestException as e:
+            print(f"Warning: Could not resolve {len(missing)} Mattermost users. Error: {e}")
+    
+    return {user_id: name for user_id, name in found.items() if name}
+
+# ==============================================================================
+# 2.5 MATTERMOST TEMBEL THREAD YÜKLEME (ÖNCE ÖNİZLEME, İSTENİNCE TAM KONUŞMA)
+# ==============================================================================
+# Gövdesi henüz çekilmemiş thread önizlemelerinin kayıt tipi
+MATTERMOST_PREVIEW_CONTENT_TYPE = "Mattermost Thread (Önizleme)"
+
+def preview_mattermost_fetch(search_term, search_plan, progress=None, on_rows=None):
+    """
+    Tembel thread yükleme (MATTERMOST_LAZY_THREADS): /posts/{id}/thread çekilmeden, arama sonuçlarından
+    thread önizlemeleri kurar ve SourceResults döndürür.
+    - Önizlemede kök mesaj, aramada eşleşen yanıtlar ve "killed a prey" yanıtları bulunur; aramada gelmeyen
+      kök mesajlar tek bir POST /posts/ids isteğiyle çekilir
+    - Durum, aynı kanallarda sunucu tarafı "killed a prey" aramasıyla belirlenir; DEĞİL ile dışlanan terimler
+      de aynı aramaya eklenir, böylece sorgu önizlemede de doğru doğrulanır (find_mattermost_thread_posts)
+    - Önbellekte önizlemeden eski olmayan tam özeti bulunan thread'ler için tam özet kullanılır; durum araması
+      sınıra (MATTERMOST_STATUS_MAX_PAGES / zaman bütçesi) takılırsa durumu kesinleşmeyen thread'ler tam çekilir
+    Konuşmanın tamamı kullanıcı sonucu açtığında veya dışa aktarırken çekilir (load_full_mattermost_threads).
+    """
+    search_terms = mattermost_search_terms(search_term)
+    deadline = time.monotonic() + MATTERMOST_SEARCH_TIME_BUDGET if MATTERMOST_SEARCH_TIME_BUDGET > 0 else None
+    stop_paging = threading.Event()
+    lock = threading.Lock()
+    thread_posts = {}  # kök ID -> {post ID: post}
+    truncated = []
+    
+    ranking = MattermostThreadRanking()
+    
+    def search_team(team_id, channel_names):
+        for posts in iter_mattermost_search_pages(team_id, channel_names, search_terms, stop_paging):
+            posts = [post for post in posts if post['channel_id'] in TARGET_MATTERMOST_CHANNELS]
+            with lock:
+                for post in posts:
+                    thread_id = post.get('root_id') or post['id']
+                    ranking.add(thread_id, post.get('create_at', 0))
+                    thread_posts.setdefault(thread_id, {})[post['id']] = post
+                if progress:
+                    progress(0, len(thread_posts))
+            if deadline is not None and time.monotonic() > deadline:
+                truncated.append(f"{MATTERMOST_SEARCH_TIME_BUDGET:g} sn zaman sınırı")
+                stop_paging.set()
+            if posts and ranking.is_exhausted(min(post.get('create_at', 0) for post in posts)):
+                break
+    
+    with ThreadPoolExecutor(max_workers=len(search_plan)) as executor:
+        for future in [submit_with_context(executor, search_team, team_id, names) for team_id, names in search_plan.items()]:
+            future.result()
+    
+    # Tam moddaki ve arşivdeki ile aynı sıralamayla sınır içinde kalan thread'ler
+    selected_ids, capped = ranking.selected()
+    if capped:
+        truncated.append(f"ilk {MATTERMOST_SEARCH_MAX_RESULTS} thread")
+    thread_posts = {thread_id: thread_posts[thread_id] for thread_id in selected_ids}
+    
+    # Sadece yanıtı eşleşen thread'lerin kök mesajları
+    missing_roots = [thread_id for thread_id, posts in thread_posts.items() if thread_id not in posts]
+    if missing_roots:
+        root_posts = mattermost_request('POST', "/posts/ids", stage='mattermost.roots', json=missing_roots)
+        for post in root_posts or []:
+            if post['id'] in thread_posts:
+                thread_posts[post['id']][post['id']] = post
+    
+    # Önbellekte tam özeti güncel olan thread'ler için durum araması gerekmez (sürüm kök post'tan okunur)
+    root_versions = {
+        thread_id: mattermost_post_version(posts[thread_id]) for thread_id, posts in thread_posts.items() if thread_id in posts
+    }
+    full_threads = {} if cache_refresh_mode.get() else {
+        thread_id: thread
+        for thread_id, thread in get_entity_cache().get_many('mattermost_thread_summary', list(root_versions)).items()
+        if thread['version'] >= root_versions[thread_id]
+    }
+    lookup_posts = {thread_id: thread_posts[thread_id] for thread_id in root_versions if thread_id not in full_threads}
+    
+    status_terms = " ".join(filter(None, ['"killed a prey"', mattermost_search_terms(search_term, negative=True)]))
+    found_posts, complete = find_mattermost_thread_posts(search_plan, lookup_posts, status_terms, deadline)
+    for post in found_posts:
+        thread_posts[post.get('root_id') or post['id']][post['id']] = post
+    
+    if not complete:
+        # Durum araması sınıra takıldıysa "killed a prey" bulunamayan thread'lerin durumu kesin değildir;
+        # bunlar tam olarak çekilir (en fazla normal moddaki kadar istek)
+        unresolved = [
+            thread_id for thread_id, posts in lookup_posts.items()
+            if not any("killed a prey" in post.get('message', '').lower() for post in posts.values())
+        ]
+        print(f"Mattermost status lookup for '{search_term}' hit its limit; loading {len(unresolved)} threads in full.")
+        full_threads.update(load_full_mattermost_threads(unresolved, root_versions))
+    
+    previews = {}
+    for thread_id in lookup_posts:
+        if thread_id in full_threads:
+            continue
+        preview = summarize_mattermost_thread({"posts": thread_posts[thread_id]})
+        preview['preview'] = True
+        previews[thread_id] = preview
+    get_entity_cache().set_many('mattermost_thread_preview', previews)
+    
+    # Kök mesajı silinmiş/bulunamamış thread'ler atlanır
+    threads = [full_threads.get(thread_id) or previews.get(thread_id) for thread_id in root_versions]
+    
+    collected_data = build_mattermost_rows(threads, search_term)
+    if on_rows and collected_data:
+        on_rows(collected_data)
+    if progress:
+        progress(len(thread_posts), len(thread_posts))
+    
+    print(f"Built {len(previews)} Mattermost thread previews for '{search_term}' in {len(search_plan)} teams "
+          f"({len(missing_roots)} root posts fetched, {len(full_threads)} full threads used).")
+    truncated = truncated[0] if truncated else None
+    if truncated:
+        print(f"Mattermost results for '{search_term}' truncated ({truncated}).")
+    return SourceResults(collected_data, truncated=truncated)
+
+def find_mattermost_thread_posts(search_plan, thread_posts, search_terms, deadline=None):
+    """
+    Verilen thread'lerde search_terms ile eşleşen post'ları, takım başına tek bir (sayfalı) sunucu tarafı aramayla bulur.
+    Arama, en eski kök mesajın tarihinden (saat dilimi farkları için iki gün önceden) sonrası ile sınırlanır ve
+    toplam MATTERMOST_STATUS_MAX_PAGES sayfa ya da deadline (time.monotonic) ile kesilir.
+    (post listesi, arama tamamlandı mı) döner.
+    """
+    root_dates = [
+        posts[thread_id].get('create_at', 0) for thread_id, posts in thread_posts.items() if thread_id in posts
+    ]
+    if not root_dates:
+        return [], True
+    
+    after = datetime.date.fromtimestamp(min(root_dates) / 1000) - datetime.timedelta(days=2)
+    search_terms = f"{search_terms} after:{after.isoformat()}"
+    stop = threading.Event()
+    page_count = 0
+    found_posts = []
+    with perf_span('mattermost.status', items=len(thread_posts)) as span:
+        for team_id, channel_names in search_plan.items():
+            for posts in iter_mattermost_search_pages(team_id, channel_names, search_terms, stop):
+                page_count += 1
+                found_posts.extend(post for post in posts if (post.get('root_id') or post['id']) in thread_posts)
+                if (MATTERMOST_STATUS_MAX_PAGES and page_count >= MATTERMOST_STATUS_MAX_PAGES) or \
+                        (deadline is not None and time.monotonic() > deadline):
+                    stop.set()
+            if stop.is_set():
+                break
+        span['truncated'] = 1 if stop.is_set() else 0
+    return found_posts, not stop.is_set()
+
+def load_full_mattermost_threads(thread_ids, seen_versions=None):
+    """
+    Thread'lerin tam özetlerini {kök ID: özet} döndürür. Önbellekteki özetler fresh_mattermost_threads ile
+    doğrulanır (seen_versions: {kök ID: bilinen en yeni sürüm}, verilmezse önizlemelerin sürümü); güncel olmayanlar
+    paralel /posts/{id}/thread istekleriyle çekilip önbelleğe yazılır. Çekilemeyen thread'ler sonuçta yer almaz.
+    """
+    thread_ids = list(dict.fromkeys(thread_ids))
+    if seen_versions is None:
+        seen_versions = {
+            thread_id: preview['version']
+            for thread_id, preview in get_entity_cache().get_many('mattermost_thread_preview', thread_ids).items()
+        }
+    threads = {} if cache_refresh_mode.get() or not thread_ids else fresh_mattermost_threads(
+        {thread_id: seen_versions.get(thread_id, 0) for thread_id in thread_ids}
+    )
+    missing = [thread_id for thread_id in thread_ids if thread_id not in threads]
+    if not missing:
+        return threads
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(MATTERMOST_THREAD_WORKERS, len(missing)))) as executor:
+        futures = {
+            submit_with_context(executor, mattermost_request, 'GET', f"/posts/{thread_id}/thread", stage='mattermost.thread'): thread_id
+            for thread_id in missing
+        }
+        for future in as_completed(futures):
+            thread_id = futures[future]
+            try:
+                thread = summarize_mattermost_thread(future.result())
+            except Exception as e:
+                print(f"Warning: Could not load Mattermost thread for ID {thread_id}. Error: {e}")
+                continue
+            cache_mattermost_thread(thread_id, thread)
+            if thread:
+                threads[thread_id] = thread
+    return threads
+
+def load_mattermost_conversation(thread_id):
+    """
+    Thread'in tüm mesajlarını (kök mesaj başta) okunabilir metin olarak döndürür; önizleme satırı açıldığında kullanılır
+    """
+    thread = load_full_mattermost_threads([thread_id]).get(thread_id)
+    if thread is None:
+        return "Konuşma yüklenemedi."
+    
+    users = resolve_mattermost_users(post[1] for post in thread['posts'])
+    return "\n\n".join(
+        f"[{datetime.datetime.fromtimestamp(created / 1000).strftime('%Y-%m-%d %H:%M:%S')} - "
+        f"{users.get(author) or f'User {author}'}]:\n{message}"
+        for created, author, message, _ in thread['posts']
+    )
+
+def load_full_mattermost_rows(df, search_term=None):
+    """
+    Tablodaki Mattermost önizleme satırlarını tam thread'lerden yeniden oluşturur (dışa aktarımdan önce).
+    search_term verilmezse df.attrs['search_term'] kullanılır. Tam hâliyle sorguyu sağlamayan thread'ler
+    çıkarılır; çekilemeyenler önizleme olarak kalır.
+    """
+    previews = df['Content_Type'] == MATTERMOST_PREVIEW_CONTENT_TYPE
+    if not previews.any():
+        return df
+    
+    with perf_span('mattermost.hydrate', items=int(previews.sum())):
+        threads = load_full_mattermost_threads(df.loc[previews, 'ID'].tolist())
+        rows = {row.id: row for row in build_mattermost_rows(threads.values(), search_term or df.attrs.get('search_term', ''))}
+        
+        keep = ~previews | ~df['ID'].isin(threads) | df['ID'].isin(rows)
+        df = df[keep].copy()
+        loaded = (df['Content_Type'] == MATTERMOST_PREVIEW_CONTENT_TYPE) & df['ID'].isin(rows)
+        full_df = records_to_frame([rows[thread_id] for thread_id in df.loc[loaded, 'ID']])
+        for column in ("Content_Type", "Description", "Author", "Status", "Search_Text"):
+            df.loc[loaded, column] = full_df[column].to_numpy()
+    return df
+
+# ==============================================================================
+# 3. ANA VERİ YÖNETİM FONKSİYONU (OPTİMİZE EDİLMİŞ)
+# ==============================================================================
+# Platform adı -> veri çekme fonksiyonu
+DATA_SOURCES = {
+    "Redmine": fast_redmine_fetch,
+    "Mattermost": fast_mattermost_fetch
+}
+
+class FetchProgress:
+    """
+    Paralel çalışan kaynakların ilerlemesini thread-safe şekilde tutar
+    """
+    def __init__(self, sources):
+        self.lock = threading.Lock()
+        self.state = {source: {"done": 0, "total": None, "finished": False} for source in sources}
+    
+    def reporter(self, source):
+        def report(done, total):
+            with self.lock:
+                self.state[source]["done"] = done
+                self.state[source]["total"] = total
+        return report
+    
+    def finish(self, source):
+        with self.lock:
+            self.state[source]["finished"] = True
+    
+    def snapshot(self):
+        with self.lock:
+            return {source: dict(values) for source, values in self.state.items()}
+
+def progress_fraction(snapshot):
+    """
+    İlerleme görüntüsünden (FetchProgress.snapshot) 0-1 arası toplam ilerlemeyi hesaplar
+    """
+    if not snapshot:
+        return 1.0
+    fractions = []
+    for values in snapshot.values():
+        if values["finished"]:
+            fractions.append(1.0)
+        elif values["total"]:
+            fractions.append(min(values["done"] / values["total"], 0.99))
+        else:
+            fractions.append(0.0)
+    return sum(fractions) / len(fractions)
+
+def stream_all_data(search_term, platform_filter="Tümü"):
+    """
+    Kaynakları paralel çeker ve olayları geldikçe döndüren bir generator'dır:
+    - ("rows", kaynak, satırlar): yeni eşleşen satırlar (geçici; yedek yola düşülürse tekrar gelebilir)
+    - ("progress", FetchProgress.snapshot()): ilerleme durumu
+    - ("done", kaynak, satırlar): kaynağın kesin ve tam sonuç listesi
+    - ("error", kaynak, mesaj): kaynak hata verdi; ardından boş sonuçlu "done" gelir, diğer kaynaklar devam eder
+    """
+    # Platform filtresine göre veri çekilecek kaynakları seç
+    if platform_filter in DATA_SOURCES:
+        sources = [platform_filter]
+    else:  # "Tümü" seçiliyse
+        sources = list(DATA_SOURCES)
+    print(f"Veri çekilen platformlar: {', '.join(sources)}")
+    
+    progress = FetchProgress(sources)
+    row_events = queue.Queue()
+    
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {
+            submit_with_context(
+                executor, fetch_source_cached, source, search_term, progress.reporter(source),
+                lambda rows, source=source: row_events.put((source, rows))
+            ): source
+            for source in sources
+        }
+        pending = set(futures)
+        while pending:
+            # Biten kaynaklar, kuyruğu boşaltmadan önce belirlenir; böylece "done" olayı o kaynağın
+            # tüm "rows" olaylarından sonra gelir
+            finished = [future for future in pending if future.done()]
+            
+            try:
+                source, rows = row_events.get(timeout=0.1)
+                yield ("rows", source, rows)
+                while True:
+                    source, rows = row_events.get_nowait()
+                    yield ("rows", source, rows)
+            except queue.Empty:
+                pass
+            
+            for future in finished:
+                pending.discard(future)
+                source = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    # Bir kaynağın hatası aramanın tamamını düşürmez; diğer kaynakların sonuçları gösterilir
+                    print(f"!!!! {source.upper()} ERROR: {e!r} !!!!")
+                    yield ("error", source, str(e) or type(e).__name__)
+                    rows = SourceResults()
+                progress.finish(source)
+                print(f"{source} verileri çekildi: {len(rows)} sonuç.")
+                yield ("done", source, rows)
+            
+            yield ("progress", progress.snapshot())
+
+def get_all_data_fast(search_term, platform_filter="Tümü", progress_callback=None, rows_callback=None, trace=None):
+    """
+    Hızlı veri çekme - platform filtresine göre optimize edilmiş versiyon
+    Kaynaklar paralel çekilir; toplam süre en yavaş kaynağın süresi kadardır.
+    Her kaynağın sonucu varlık bazlı önbellekten (fetch_source_cached) gelir; platform filtresi
+    değişse de aynı kaynak tekrar çekilmez.
+    progress_callback verilirse ana thread'de FetchProgress.snapshot() çıktısıyla,
+    rows_callback verilirse yeni eşleşen satırlar geldikçe (kaynak, satırlar) ile çağrılır.
+    trace verilirse (SearchTrace) aramanın tüm zamanlama aralıkları ona eklenir.
+    """
+    print(f"'{search_term}' için hızlı veri çekme başlatılıyor... (Platform: {platform_filter})")
+    
+    trace = trace or SearchTrace(f"Arama: {search_term}")
+    results = {}
+    errors = {}
+    with search_trace_scope(trace):
+        for event in stream_all_data(search_term, platform_filter):
+            if event[0] == "rows":
+                if rows_callback:
+                    rows_callback(event[1], event[2])
+            elif event[0] == "done":
+                results[event[1]] = event[2]
+            elif event[0] == "error":
+                errors[event[1]] = event[2]
+            elif progress_callback:
+                progress_callback(event[1])
+        
+        # Kaynak sırası sabit tutulur (önce Redmine, sonra Mattermost)
+        records = [record for source in DATA_SOURCES if source in results for record in results[source]]
+        combined_df = records_to_frame(records)
+        # Sınıra (sonuç sayısı / süre) takılan kaynaklar: {kaynak: sebep}; arayüz uyarı gösterir
+        combined_df.attrs['truncated'] = {
+            source: rows.truncated for source, rows in results.items() if getattr(rows, 'truncated', None)
+        }
+        # Hata veren kaynaklar: {kaynak: hata mesajı}; arayüz uyarı gösterir
+        combined_df.attrs['errors'] = errors
+        # Önizleme satırları dışa aktarımda tam thread'lerden bu terimle yeniden oluşturulur
+        combined_df.attrs['search_term'] = search_term
+
+    finish_search_trace(trace)
+    print(f"Veri çekme tamamlandı. Toplam {len(combined_df)} sonuç bulundu. ({trace.duration_ms:.0f} ms)")
+    return combined_df
+
+# ==============================================================================
+# 3.1 VARLIK BAZLI ÖNBELLEK (TTL + LRU, OPSİYONEL DİSK)
+# ==============================================================================
+class EntityCache:
+    """
+    İsim alanı (namespace) + anahtar ile saklanan varlık önbelleği.
+    - 'redmine_record': issue ID -> sonuç kaydı (ResultRecord.to_cache)
+    - 'mattermost_thread_summary': kök post ID -> thread özeti (summarize_mattermost_thread);
+      tamamlanmış thread'ler süresiz, devam edenler ttl kadar tutulur
+    - 'mattermost_user': kullanıcı ID -> görünen isim (MATTERMOST_USER_CACHE_TTL)
+    - 'query_result': "kaynak|arama terimi" -> {'ids': eşleşen varlık ID'leri, 'truncated': kısaltma sebebi veya None}
+    Bellekte LRU olarak en fazla max_items kayıt tutulur. path verilirse kayıtlar JSON olarak
+    SQLite dosyasına da yazılır; böylece yeniden başlatmadan sonra ve diğer worker'larda kullanılabilir.
+    Aynı dosyadaki 'leases' tablosu worker'lar arası kira kilitlerini (acquire_lease) tutar.
+    """
+    def __init__(self, path=None, ttl=ENTITY_CACHE_TTL, max_items=ENTITY_CACHE_MAX_ITEMS):
+        self.path = path
+        self.ttl = ttl
+        self.max_items = max_items
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()  # (namespace, key) -> (expires_at, value)
+        
+        if self.path:
+            conn = self.connect()
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entities ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                    "PRIMARY KEY (namespace, key))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS leases ("
+                    "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM entities WHERE expires_at < ?", (time.time(),))
+                conn.commit()
+            finally:
+                conn.close()
+    
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+    
+    def remember(self, memory_key, expires_at, value):
+        with self.lock:
+            self.memory[memory_key] = (expires_at, value)
+            self.memory.move_to_end(memory_key)
+            while len(self.memory) > self.max_items:
+                self.memory.popitem(last=False)
+    
+    def get_many(self, namespace, keys):
+        """
+        Süresi dolmamış kayıtları {anahtar: değer} olarak döndürür; olmayan anahtarlar sonuçta yer almaz
+        """
+        with perf_span(f"cache.{namespace}") as span:
+            found = self.lookup(namespace, keys)
+            span['cache_hits'] = len(found)
+            span['cache_misses'] = len(keys) - len(found)
+        return found
+    
+    def lookup(self, namespace, keys):
+        now = time.time()
+        found = {}
+        missing = []
+        
+        with self.lock:
+            for key in keys:
+                entry = self.memory.get((namespace, str(key)))
+                if entry is not None and entry[0] > now:
+                    self.memory.move_to_end((namespace, str(key)))
+                    found[key] = entry[1]
+                else:
+                    missing.append(key)
+        
+        if missing and self.path:
+            keys_by_text = {str(key): key for key in missing}
+            conn = self.connect()
+            try:
+                text_keys = list(keys_by_text)
+                for start in range(0, len(text_keys), 500):
+                    chunk = text_keys[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT key, value, expires_at FROM entities WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))}) "
+                        "AND expires_at > ?",
+                        [namespace] + chunk + [now]
+                    )
+                    for key, value, expires_at in rows:
+                        decoded = json.loads(value)
+                        found[keys_by_text[key]] = decoded
+                        self.remember((namespace, key), expires_at, decoded)
+            finally:
+                conn.close()
+        
+        return found
+    
+    def get(self, namespace, key):
+        return self.get_many(namespace, [key]).get(key)
+    
+    def get_expiry(self, namespace, key):
+        """
+        Kaydın sona erme zamanını (epoch) döndürür; kayıt yoksa veya süresi dolduysa None
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get((namespace, str(key)))
+        if entry is not None and entry[0] > now:
+            return entry[0]
+        
+        if self.path:
+            conn = self.connect()
+            try:
+                row = conn.execute(
+                    "SELECT expires_at FROM entities WHERE namespace = ? AND key = ? AND expires_at > ?",
+                    (namespace, str(key), now)
+                ).fetchone()
+            finally:
+                conn.close()
+            if row:
+                return row[0]
+        return None
+    
+    def set_many(self, namespace, items, ttl=None):
+        """
+        {anahtar: değer} kayıtlarını önbelleğe yazar
+        """
+        if not items:
+            return
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        for key, value in items.items():
+            self.remember((namespace, str(key)), expires_at, value)
+        
+        if self.path:
+            conn = self.connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entities (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    [(namespace, str(key), json.dumps(value, ensure_ascii=False), expires_at) for key, value in items.items()]
+                )
+                conn.commit()
+            finally:
+                conn.close()
+    
+    def set(self, namespace, key, value, ttl=None):
+        self.set_many(namespace, {key: value}, ttl=ttl)
+    
+    def acquire_lease(self, name, owner, ttl):
+        """
+        Worker'lar arası kira kilidi: kira boşsa, süresi dolduysa veya zaten owner'daysa ttl saniyeliğine
+        alınır (uzatılır) ve True döner. Dosya yoksa önbellek süreçler arasında paylaşılmadığından her zaman True.
+        """
+        if not self.path:
+            return True
+        now = time.time()
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+                if row and row[0] != owner and row[1] > now:
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                    (name, owner, now + ttl)
+                )
+            return True
+        finally:
+            conn.close()
+    
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+        if self.path:
+            conn = self.connect()
+            try:
+                conn.execute("DELETE FROM entities")
+                conn.commit()
+            finally:
+                conn.close()
+
+# True iken (arka plan yenilemesi) varlık önbelleğinden okunmaz; her şey kaynaktan çekilip önbelleğe
+# yeniden yazılır. Eski kayıtlar yenisi yazılana kadar kullanıcılara sunulmaya devam eder.
+cache_refresh_mode = contextvars.ContextVar('cache_refresh_mode', default=False)
+
+@st.cache_resource(show_spinner=False)
+def get_entity_cache():
+    """
+    Süreç boyunca paylaşılan varlık önbelleğini döndürür
+    """
+    return EntityCache(path=ENTITY_CACHE_PATH or None)
+
+def source_uses_query_cache(source):
+    """
+    Arşiv modunda Mattermost her aramada yerel arşivden (arka planda eşitlenen) aranır; sorgu önbelleği
+    arşivden daha eski sonuç döndüreceği için bu kaynakta kullanılmaz
+    """
+    return not (source == "Mattermost" and MATTERMOST_FETCH_MODE == 'archive')
+
+def fetch_source_cached(source, search_term, progress=None, on_rows=None):
+    """
+    Tek bir kaynağın sonuçlarını önbellekten döndürür; yoksa kaynaktan çekip varlıkları önbelleğe yazar.
+    Sorgu kaydı sadece eşleşen ID'leri (ve sonuçlar sınıra takıldıysa sebebini) tutar,
+    satırlar/thread'ler varlık olarak ayrıca saklanır. SourceResults döndürür.
+    cache_refresh_mode açıkken önbellek okunmaz; sonuç kaynaktan çekilip kayıtlar yenilenir.
+    source_uses_query_cache False ise önbellek atlanır, sonuç her seferinde kaynaktan gelir.
+    """
+    # Aynı anlamdaki yazımlar ("#a ve #b", "#a AND #b") tek önbellek kaydını paylaşır
+    search_term = parse_search_query(search_term).canonical()
+    if not source_uses_query_cache(source):
+        with perf_span(f"fetch.{source.lower()}") as span:
+            rows = DATA_SOURCES[source](search_term, progress, on_rows)
+            truncated = getattr(rows, 'truncated', None)
+            span['items'] = len(rows)
+            span['truncated'] = 1 if truncated else 0
+        return SourceResults(rows, truncated=truncated)
+    
+    cache = get_entity_cache()
+    query_key = f"{source}|{search_term}"
+    entity_namespace = 'redmine_record' if source == "Redmine" else 'mattermost_thread_summary'
+    
+    with perf_span(f"fetch.{source.lower()}") as span:
+        query_result = None if cache_refresh_mode.get() else cache.get('query_result', query_key)
+        if query_result is not None:
+            entity_ids = query_result['ids']
+            entities = cache.get_many(entity_namespace, entity_ids)
+            if source == "Mattermost" and len(entities) < len(entity_ids):
+                # Tembel modda gövdesi henüz çekilmemiş thread'lerin önizlemeleri kullanılır
+                entities.update(cache.get_many(
+                    'mattermost_thread_preview', [entity_id for entity_id in entity_ids if entity_id not in entities]
+                ))
+            if len(entities) == len(entity_ids):
+                print(f"{source} results for '{search_term}' served from cache ({len(entity_ids)} entities).")
+                if source == "Redmine":
+                    rows = [ResultRecord.from_cache(entities[entity_id]) for entity_id in entity_ids]
+                else:
+                    rows = build_mattermost_rows([entities[entity_id] for entity_id in entity_ids], search_term)
+                if on_rows and rows:
+                    on_rows(rows)
+                span['cache_hits'] = 1
+                span['items'] = len(rows)
+                span['truncated'] = 1 if query_result['truncated'] else 0
+                return SourceResults(rows, truncated=query_result['truncated'])
+        
+        span['cache_misses'] = 1
+        rows = DATA_SOURCES[source](search_term, progress, on_rows)
+        truncated = getattr(rows, 'truncated', None)
+        span['items'] = len(rows)
+        span['truncated'] = 1 if truncated else 0
+    
+    if source == "Redmine":
+        cache.set_many('redmine_record', {row.id: row.to_cache() for row in rows})
+    cache.set('query_result', query_key, {'ids': [row.id for row in rows], 'truncated': truncated})
+    return SourceResults(rows, truncated=truncated)
+
+# ==============================================================================
+# 3.2 SONUÇ KAYITLARI, TABLO HAZIRLAMA VE ORTAK FİLTRE MOTORU
+# ==============================================================================
+class ResultRecord:
+    """
+    Tek bir arama sonucunun sıkıştırılmış gösterimi (satır başına sözlük yerine).
+    - Platform, durum, tip ve yazar gibi tekrar eden metinler intern edilir
+    - Redmine ID'leri tamsayıdır, tarih duvar saati epoch saniyesi olarak tutulur
+    - "N/A" gibi sabit alanlar saklanmaz, tablo oluşturulurken eklenir
+    """
+    __slots__ = ('source', 'id', 'content_type', 'title', 'description', 'author', 'created', 'channel_id', 'status')
+    
+    def __init__(self, source, record_id, content_type, title, description, author, created,
+                 channel_id=None, status=None):
+        self.source = sys.intern(source)
+        self.id = record_id
+        self.content_type = sys.intern(content_type) if isinstance(content_type, str) else content_type
+        self.title = title
+        self.description = description
+        self.author = sys.intern(author) if isinstance(author, str) else author
+        self.created = created
+        self.channel_id = sys.intern(channel_id) if isinstance(channel_id, str) else channel_id
+        self.status = sys.intern(status) if isinstance(status, str) else status
+    
+    def to_cache(self):
+        """
+        Önbellekte (JSON) saklanacak düz liste
+        """
+        return [getattr(self, name) for name in self.__slots__]
+    
+    @classmethod
+    def from_cache(cls, values):
+        return cls(*values)
+
+class SourceResults(list):
+    """
+    Bir kaynağın sonuç kayıtları; truncated doluysa sonuçlar bir sınır yüzünden eksiktir (sebep metni)
+    """
+    def __init__(self, records=(), truncated=None):
+        super().__init__(records)
+        self.truncated = truncated
+
+def wall_clock_epoch(value):
+    """
+    Saat dilimi bilgisi olmayan datetime'ı aynı duvar saatini gösteren epoch saniyesine çevirir
+    (tabloda gösterilen saat, önceki metin formatıyla aynı kalır)
+    """
+    return calendar.timegm(value.timetuple())
+
+def parse_wall_clock(value, fmt='%Y-%m-%d %H:%M:%S'):
+    """
+    '2024-01-31 10:00:00' biçimli metni duvar saati epoch saniyesine çevirir
+    """
+    if not value:
+        return None
+    return calendar.timegm(time.strptime(value, fmt))
+
+RESULT_COLUMNS = [
+    "Source_Platform", "ID", "Content_Type", "Title", "Description", "Author",
+    "Creation_Date", "Notes", "Attached_Files", "Channel_ID", "Status"
+]
+# Sadece uygulama içinde kullanılan, gösterilmeyen ve dışa aktarılmayan sütunlar
+INTERNAL_COLUMNS = ["Search_Text"]
+PLATFORM_CATEGORIES = ["Redmine", "Mattermost"]
+STATUS_CATEGORIES = ["tamamlandi", "devam_ediyor"]
+
+# Arayüzdeki durum seçenekleri -> Status değeri
+STATUS_FILTER_VALUES = {
+    "Tamamlanan": "tamamlandi",
+    "Devam Eden": "devam_ediyor"
+}
+
+def records_to_frame(records):
+    """
+    ResultRecord listesinden sonuç tablosunu sütun sütun, tek seferde oluşturur.
+    Creation_Date datetime64, Source_Platform/Status kategori olarak gelir; içerik araması için
+    Türkçe kurallarıyla katlanmış Search_Text sütunu da burada bir kez hesaplanır.
+    Böylece her yeniden çalıştırmada tekrar dönüşüm yapılmaz.
+    """
+    with perf_span('frame.build', items=len(records)):
+        titles = [record.title or '' for record in records]
+        descriptions = [record.description or '' for record in records]
+        not_available = np.full(len(records), "N/A", dtype=object)
+        
+        columns = {
+            "Source_Platform": pd.Categorical([record.source for record in records], categories=PLATFORM_CATEGORIES),
+            "ID": [record.id for record in records],
+            "Content_Type": [record.content_type for record in records],
+            "Title": titles,
+            "Description": descriptions,
+            "Author": [record.author for record in records],
+            "Creation_Date": pd.to_datetime([record.created for record in records], unit='s'),
+            "Notes": not_available,
+            "Attached_Files": not_available,
+            "Channel_ID": [record.channel_id or "N/A" for record in records],
+            "Status": pd.Categorical([record.status for record in records], categories=STATUS_CATEGORIES),
+            "Search_Text": [
+                turkish_casefold(f"{title}\n{description}") for title, description in zip(titles, descriptions)
+            ]
+        }
+        return pd.DataFrame(columns, columns=RESULT_COLUMNS + INTERNAL_COLUMNS)
+
+def export_frame(df):
+    """
+    Dışa aktarım için iç sütunları çıkarılmış tabloyu döndürür
+    """
+    return df.drop(columns=[column for column in INTERNAL_COLUMNS if column in df.columns])
+
+def apply_result_filters(df, platform_filter="Tümü", text_filter=None, status_filter="Tümü",
+                         start_date=None, end_date=None, status_filter_keeps_other_platforms=True):
+    """
+    Manuel arama, chatbot ve rapor yollarının ortak filtre motoru.
+    Tüm koşullar tek bir boolean maskede birleştirilir ve tabloya tek seferde uygulanır;
+    hiçbir filtre yoksa tablo kopyalanmadan aynen döner.
+    - text_filter Başlık + Açıklama içinde büyük/küçük harf (ve İ/ı) duyarsız, düz metin olarak aranır
+    - status_filter sadece Mattermost satırlarına uygulanır; status_filter_keeps_other_platforms=False
+      ise durumu olmayan (Redmine) satırlar da elenir
+    - start_date/end_date gün bazındadır, end_date dahildir
+    """
+    with perf_span('filter', rows=len(df)) as span:
+        mask = np.ones(len(df), dtype=bool)
+        
+        if platform_filter and platform_filter != "Tümü":
+            mask &= (df['Source_Platform'] == platform_filter).to_numpy()
+        
+        if text_filter:
+            # Önceden katlanmış metinde düz (regex olmayan) alt metin araması
+            mask &= df['Search_Text'].str.contains(turkish_casefold(text_filter), regex=False).to_numpy()
+        
+        if status_filter in STATUS_FILTER_VALUES:
+            status_match = (df['Status'] == STATUS_FILTER_VALUES[status_filter]).to_numpy()
+            if status_filter_keeps_other_platforms:
+                status_match = status_match | (df['Source_Platform'] != 'Mattermost').to_numpy()
+            mask &= status_match
+        
+        if start_date is not None:
+            mask &= (df['Creation_Date'] >= pd.Timestamp(start_date)).to_numpy()
+        
+        if end_date is not None:
+            mask &= (df['Creation_Date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1)).to_numpy()  # Bitiş gününü dahil et
+        
+        span['items'] = int(mask.sum())
+        if mask.all():
+            return df
+        return df[mask]
+
+# ==============================================================================
+# 3.3 PERFORMANS ÖLÇÜMÜ (ZAMANLAMA ARALIKLARI, JSONL VE PROMETHEUS ÇIKTISI)
+# ==============================================================================
+# O anki aramanın SearchTrace'i; worker thread'lere submit_with_context ile taşınır
+current_search_trace = contextvars.ContextVar('current_search_trace', default=None)
+
+# Aralıklarda sayaç olarak toplanan alanlar
+PERF_COUNTER_FIELDS = ('items', 'bytes', 'cache_hits', 'cache_misses', 'truncated')
+
+class SearchTrace:
+    """
+    Bir aramanın (veya bir ekran çiziminin) zamanlama aralıklarını thread-safe şekilde toplar
+    """
+    def __init__(self, name):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration_ms = None
+        self.lock = threading.Lock()
+        self.spans = []
+    
+    def add(self, span):
+        with self.lock:
+            self.spans.append(span)
+    
+    def summary(self):
+        """
+        Aralıkları aşama bazında toplar (iç içe aşamaların süreleri üst aşamanın süresine de dahildir)
+        """
+        with self.lock:
+            spans = list(self.spans)
+        
+        stages = {}
+        for span in spans:
+            stage = stages.setdefault(span['stage'], {
+                "Aşama": span['stage'], "Adet": 0, "Toplam (ms)": 0.0, "En uzun (ms)": 0.0,
+                "Kayıt": 0, "Bayt": 0, "Önbellek isabet": 0, "Önbellek ıska": 0, "Hata": 0
+            })
+            stage["Adet"] += 1
+            stage["Toplam (ms)"] = round(stage["Toplam (ms)"] + span['duration_ms'], 2)
+            stage["En uzun (ms)"] = max(stage["En uzun (ms)"], span['duration_ms'])
+            stage["Kayıt"] += span.get('items', 0)
+            stage["Bayt"] += span.get('bytes', 0)
+            stage["Önbellek isabet"] += span.get('cache_hits', 0)
+            stage["Önbellek ıska"] += span.get('cache_misses', 0)
+            stage["Hata"] += 1 if 'error' in span else 0
+        return sorted(stages.values(), key=lambda stage: stage["Toplam (ms)"], reverse=True)
+
+class PerfMetrics:
+    """
+    Süreç boyu aşama sayaçları (Prometheus çıktısı için) ve dosya yazımı kilidi
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.stages = {}
+    
+    def add(self, span):
+        with self.lock:
+            counters = self.stages.setdefault(span['stage'], dict.fromkeys(
+                ('calls', 'errors', 'seconds') + PERF_COUNTER_FIELDS, 0
+            ))
+            counters['calls'] += 1
+            counters['errors'] += 1 if 'error' in span else 0
+            counters['seconds'] += span['duration_ms'] / 1000
+            for field in PERF_COUNTER_FIELDS:
+                counters[field] += span.get(field, 0)
+    
+    def prometheus_text(self):
+        """
+        Sayaçları Prometheus metin formatında döndürür
+        """
+        metrics = [
+            ('search_stage_calls_total', 'calls', "Aşamanın çalışma sayısı"),
+            ('search_stage_errors_total', 'errors', "Hata ile biten aşama sayısı"),
+            ('search_stage_duration_seconds_total', 'seconds', "Aşamada geçen toplam süre"),
+            ('search_stage_items_total', 'items', "Aşamada işlenen kayıt sayısı"),
+            ('search_stage_bytes_total', 'bytes', "Aşamada indirilen bayt"),
+            ('search_cache_hits_total', 'cache_hits', "Önbellek isabetleri"),
+            ('search_cache_misses_total', 'cache_misses', "Önbellek ıskaları"),
+            ('search_truncated_total', 'truncated', "Sonuç/süre sınırı yüzünden kısaltılan aramalar")
+        ]
+        with self.lock:
+            stages = {stage: dict(counters) for stage, counters in self.stages.items()}
+        
+        # Her süreç ayrı dosyaya yazdığından seriler pid etiketiyle ayrışır (textfile collector aynı seriyi iki kez kabul etmez)
+        pid = os.getpid()
+        lines = []
+        for metric, field, help_text in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for stage, counters in sorted(stages.items()):
+                lines.append(f'{metric}{{stage="{stage}",pid="{pid}"}} {round(counters[field], 6)}')
+        return "\n".join(lines) + "\n"
+
+@st.cache_resource(show_spinner=False)
+def get_perf_metrics():
+    """
+    Süreç boyunca paylaşılan performans sayaçlarını döndürür
+    """
+    return PerfMetrics()
+
+@contextmanager
+def perf_span(stage, **fields):
+    """
+    Bir aşamanın süresini ölçer. Dönen sözlüğe items, bytes, cache_hits, cache_misses gibi alanlar
+    eklenebilir. Aralık o anki aramanın izine (varsa) ve süreç sayaçlarına yazılır.
+    """
+    span = {"stage": stage, "ts": round(time.time(), 3), **fields}
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception as e:
+        span['error'] = type(e).__name__
+        raise
+    finally:
+        span['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        trace = current_search_trace.get()
+        if trace is not None:
+            trace.add(span)
+        get_perf_metrics().add(span)
+
+@contextmanager
+def search_trace_scope(trace):
+    """
+    Blok içindeki perf_span aralıklarını verilen SearchTrace'e bağlar
+    """
+    token = current_search_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        current_search_trace.reset(token)
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """
+    executor.submit'in aynısı; çağıranın contextvars bağlamını (o anki SearchTrace dahil) worker'a taşır.
+    Bağlamla birlikte Streamlit'in aktif container yığını da taşındığından worker'lardan ilk kez çağrılabilecek
+    st.cache_resource fonksiyonları show_spinner=False ile tanımlanmalıdır.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def perf_metrics_file_path():
+    """
+    Bu sürecin Prometheus dosyası: PERF_METRICS_PATH'in uzantısından önce pid eklenir
+    """
+    root, extension = os.path.splitext(PERF_METRICS_PATH)
+    return f"{root}.{os.getpid()}{extension or '.prom'}"
+
+def rotate_perf_log():
+    """
+    PERF_LOG_PATH, PERF_LOG_MAX_BYTES'a ulaştıysa .1, .2 ... olarak kaydırılır; en eski yedek silinir
+    """
+    try:
+        if not PERF_LOG_MAX_BYTES or os.path.getsize(PERF_LOG_PATH) < PERF_LOG_MAX_BYTES:
+            return
+    except OSError:
+        return
+    if PERF_LOG_BACKUPS <= 0:
+        os.remove(PERF_LOG_PATH)
+        return
+    for index in range(PERF_LOG_BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{PERF_LOG_PATH}.{index}"):
+            os.replace(f"{PERF_LOG_PATH}.{index}", f"{PERF_LOG_PATH}.{index + 1}")
+    os.replace(PERF_LOG_PATH, f"{PERF_LOG_PATH}.1")
+
+def finish_search_trace(trace):
+    """
+    İzi kapatır; aralıkları PERF_LOG_PATH'e JSON satırları olarak ekler (boyut sınırında döndürerek) ve
+    bu sürecin Prometheus dosyasını (perf_metrics_file_path) günceller
+    """
+    trace.duration_ms = round((time.perf_counter() - trace.started) * 1000, 2)
+    metrics = get_perf_metrics()
+    
+    try:
+        with metrics.write_lock:
+            if PERF_LOG_PATH:
+                with trace.lock:
+                    spans = list(trace.spans)
+                rotate_perf_log()
+                with open(PERF_LOG_PATH, 'a', encoding='utf-8') as f:
+                    for span in spans:
+                        f.write(json.dumps({"trace_id": trace.trace_id, "trace": trace.name, **span}, ensure_ascii=False) + "\n")
+            
+            if PERF_METRICS_PATH:
+                # Okuyucu yarım dosya görmesin diye önce geçici dosyaya yazılır
+                metrics_path = perf_metrics_file_path()
+                temp_path = f"{metrics_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(metrics.prometheus_text())
+                os.replace(temp_path, metrics_path)
+    except OSError as e:
+        print(f"Warning: Could not write performance metrics. Error: {e}")
+    
+    return trace
+
+def render_performance_panel(traces):
+    """
+    Verilen izlerin aşama özetlerini katlanabilir "Performans" panelinde gösterir
+    traces: [(başlık, SearchTrace veya None), ...]
+    """
+    traces = [(title, trace) for title, trace in traces if trace is not None]
+    if not traces:
+        return
+    
+    with st.expander("⏱️ Performans", expanded=False):
+        for title, trace in traces:
+            duration = f"{trace.duration_ms:.0f} ms" if trace.duration_ms is not None else "devam ediyor"
+            st.markdown(f"**{title}** ({trace.name}) - toplam {duration}")
+            summary = trace.summary()
+            if summary:
+                st.dataframe(pd.DataFrame(summary), use_container_width=True, hide_index=True)
+            else:
+                st.caption("Ölçülen aşama yok.")
+
+# ==============================================================================
+# 3.4 DIŞA AKTARIM (CSV / EXCEL) - BELLEKTE ÜRETİM VE SONUÇ KÜMESİ ÖNBELLEĞİ
+# ==============================================================================
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache():
+    """
+    Oluşturulmuş dışa aktarım dosyalarının (bayt) süreç boyu önbelleği; anahtar sonuç kümesi özetidir
+    """
+    return EntityCache(path=None, ttl=EXPORT_CACHE_TTL, max_items=EXPORT_CACHE_MAX_ITEMS)
+
+def result_set_hash(df):
     """
-    Hızlı Redmine arama - sadece başlık ve açıklamada arama yapar
+    Sonuç tablosunun içeriğinden kararlı bir özet üretir; aynı sonuçlar aynı özeti verir
     """
-    print(f"Connecting to Redmine ({REDMINE_API_URL})...")
-    collected_data = []
+    row_hashes = pd.util.hash_pandas_object(export_frame(df), index=False).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+def build_csv_export(df):
+    return export_frame(df).to_csv(index=False).encode('utf-8')
+
+def excel_column_values(series):
+    """
+    Sütunu openpyxl'in yazabileceği değerlere çevirir: boş değerler None, metinlerde
+    Excel'in kabul etmediği kontrol karakterleri temizlenir
+    """
+    values = series.astype(object).where(series.notna(), None).to_numpy()
+    if series.dtype.kind == 'M':
+        return values
+    return [ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value for value in values]
+
+def build_excel_export(df):
+    """
+    Tabloyu openpyxl write-only modunda doğrudan bellekteki bir xlsx'e yazar (geçici dosya yok,
+    hücre nesneleri satırlar yazıldıktan sonra tutulmaz)
+    """
+    export_df = export_frame(df)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
     
-    try:
-        redmine = Redmine(REDMINE_API_URL, key=REDMINE_API_KEY)
-        print("Login successful. Fetching all issues for fast search...")
-
-        # Sadece temel verileri çek (journals ve attachments olmadan)
-        issues = redmine.issue.filter(status_id='*')
-        
-        print(f"Total issues fetched: {len(issues)}. Now filtering for '{search_term}'...")
-        
-        for issue in issues:
-            subject = getattr(issue, 'subject', '') or ''
-            description = getattr(issue, 'description', '') or ''
-            
-            is_match = search_term.lower() in subject.lower() or search_term.lower() in description.lower()
-            
-            if is_match:
-                tracker_name = getattr(issue, 'tracker', {}).name
-                status_name = getattr(issue, 'status', {}).name
-                author_name = getattr(issue, 'author', {}).name
-
-                collected_data.append({
-                    "Source_Platform": "Redmine", 
-                    "ID": issue.id,
-                    "Content_Type": f"Tracker: {tracker_name} (Status: {status_name})",
-                    "Title": subject, 
-                    "Description": description,
-                    "Author": author_name, 
-                    "Creation_Date": issue.created_on.strftime('%Y-%m-%d %H:%M:%S'),
-                    "Notes": "N/A", 
-                    "Attached_Files": "N/A",
-                    "Channel_ID": "N/A"
-                })
-            
-    except Exception as e:
-        print(f"!!!! REDMINE ERROR: {e} !!!!")
-        
-    return collected_data
+    header_font = Font(bold=True)
+    header = []
+    for column in export_df.columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+    
+    for row in zip(*(excel_column_values(export_df[column]) for column in export_df.columns)):
+        sheet.append(row)
+    
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+EXPORT_BUILDERS = {
+    "csv": build_csv_export,
+    "xlsx": build_excel_export
+}
+
+def get_export_bytes(kind, df, result_key):
+    """
+    Dosyayı sonuç kümesi özetine göre önbellekten döndürür; yoksa oluşturup önbelleğe yazar
+    """
+    cache = get_export_cache()
+    with perf_span(f"export.{kind}", items=len(df)) as span:
+        data = cache.get(kind, result_key)
+        if data is None:
+            span['cache_misses'] = 1
+            data = EXPORT_BUILDERS[kind](load_full_mattermost_rows(df))
+            cache.set(kind, result_key, data)
+        else:
+            span['cache_hits'] = 1
+        span['bytes'] = len(data)
+    return data
 
 # ==============================================================================
-# 2. MATTERMOST VERİ ÇEKME FONKSİYONU (OPTİMİZE EDİLMİŞ)
+# 3.5 SIK ARANAN TERİMLER İÇİN ARKA PLAN ÖN YÜKLEME
 # ==============================================================================
-def fast_mattermost_fetch(search_term):
-    print(f"Connecting to Mattermost and searching in {len(TARGET_MATTERMOST_CHANNELS)} specific channels...")
-    base_url = MATTERMOST_BASE_URL
-    headers = {"Authorization": f"Bearer {MATTERMOST_TOKEN}"}
-    collected_data = []
-    processed_thread_ids = set()
+class SearchStats:
+    """
+    Terim bazlı arama sıklığı. Her arama skoru 1 artırır, skor PREFETCH_HALF_LIFE yarı ömrüyle azalır;
+    böylece eskiden çok aranıp artık aranmayan terimler zamanla listeden düşer.
+    path verilirse skorlar SQLite'ta tutulur (yeniden başlatmada korunur, worker'lar arasında paylaşılır).
+    """
+    def __init__(self, path=None, half_life=PREFETCH_HALF_LIFE):
+        self.path = path
+        self.half_life = half_life
+        self.lock = threading.Lock()
+        self.scores = {}  # terim -> (skor, son güncelleme zamanı)
+        
+        if self.path:
+            conn = self.connect()
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_stats ("
+                    "term TEXT PRIMARY KEY, score REAL NOT NULL, updated_at REAL NOT NULL)"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+    
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
     
-    # Sadece # ile başlayan aramaları kabul et
-    if not search_term.startswith('#'):
-        print(f"Search term '{search_term}' does not start with '#'. Only hashtag searches are allowed.")
-        return collected_data
+    def decayed(self, score, updated_at, now):
+        return score * 0.5 ** (max(now - updated_at, 0) / self.half_life)
+    
+    def record(self, term):
+        """
+        Bir aramayı sayar
+        """
+        term = (term or '').strip()
+        if not term:
+            return
+        now = time.time()
+        
+        if not self.path:
+            with self.lock:
+                score, updated_at = self.scores.get(term, (0.0, now))
+                self.scores[term] = (self.decayed(score, updated_at, now) + 1, now)
+            return
+        
+        conn = self.connect()
+        try:
+            with conn:
+                # Diğer worker'ların artışları kaybolmasın diye oku-yaz aynı işlemde yapılır
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT score, updated_at FROM search_stats WHERE term = ?", (term,)).fetchone()
+                score = self.decayed(row[0], row[1], now) + 1 if row else 1.0
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_stats (term, score, updated_at) VALUES (?, ?, ?)",
+                    (term, score, now)
+                )
+        finally:
+            conn.close()
     
+    def top(self, n):
+        """
+        Güncel skoru en yüksek n terimi döndürür
+        """
+        now = time.time()
+        if self.path:
+            conn = self.connect()
+            try:
+                rows = conn.execute("SELECT term, score, updated_at FROM search_stats").fetchall()
+            finally:
+                conn.close()
+        else:
+            with self.lock:
+                rows = [(term, score, updated_at) for term, (score, updated_at) in self.scores.items()]
+        
+        ranked = sorted(rows, key=lambda row: self.decayed(row[1], row[2], now), reverse=True)
+        return [term for term, _, _ in ranked[:n]]
+
+@st.cache_resource(show_spinner=False)
+def get_search_stats():
+    """
+    Süreç boyunca paylaşılan arama sıklığı kayıtlarını döndürür (varlık önbelleği dosyasında tutulur)
+    """
+    return SearchStats(path=ENTITY_CACHE_PATH or None)
+
+def record_search(search_term):
     try:
-        teams_response = requests.get(f"{base_url}/users/me/teams", headers=headers)
-        teams_response.raise_for_status()
-        teams = teams_response.json()
-        if not teams: return []
-        team_id = teams[0]['id']
-        
-        # Önce normal arama yap (Mattermost API search)
-        search_url = f"{base_url}/teams/{team_id}/posts/search"
-        payload = {"terms": search_term, "is_or_search": True}
-        search_response = requests.post(search_url, headers=headers, json=payload)
-        search_response.raise_for_status()
-        search_results = search_response.json()
-        
-        print(f"Found {len(search_results.get('posts', {}))} potential posts with '{search_term}'. Processing threads...")
-        
-        # Bulunan thread'leri işle
-        for post in search_results.get('posts', {}).values():
-            if post['channel_id'] not in TARGET_MATTERMOST_CHANNELS:
-                continue
+        get_search_stats().record(parse_search_query(search_term).canonical())
+    except Exception as e:
+        print(f"Warning: Could not record search statistics. Error: {e}")
+
+# Ön yüklemeyi aynı anda tek worker yapar; kirayı tutan süreç her turda yenilediği için kira iki tur sürer
+PREFETCH_LEASE_NAME = 'prefetch'
+PREFETCH_LEASE_TTL = PREFETCH_INTERVAL * 2
 
-            thread_id = post.get('root_id') or post['id']
-            if thread_id in processed_thread_ids: continue
-            processed_thread_ids.add(thread_id)
+def prefetch_popular_searches():
+    """
+    En sık aranan terimlerden önbellek kaydı olmayan veya PREFETCH_REFRESH_MARGIN içinde sona erecek
+    olanları arka planda yeniden çeker. Yenilenen terim sayısını döndürür.
+    - Varlık önbelleği dosyası paylaşılıyorsa sadece kirayı (acquire_lease) alan worker yeniler
+    - Mattermost sadece olumlu terimlerinin hepsi hashtag olan sorgular için yenilenir
+      (düz metin aramaları API'de çok thread döndürür ve rate limit'i tüketir)
+    """
+    cache = get_entity_cache()
+    owner = str(os.getpid())
+    refreshed_count = 0
+    
+    for search_term in get_search_stats().top(PREFETCH_TOP_N):
+        # Kira her terimde alınır/uzatılır; uzun süren turda başka bir worker'a geçmez
+        if not cache.acquire_lease(PREFETCH_LEASE_NAME, owner, PREFETCH_LEASE_TTL):
+            break
+        try:
+            hashtags_only = all(is_hashtag_term(term) for term in parse_search_query(search_term).positive_terms)
+        except ValueError:
+            continue
+        for source in DATA_SOURCES:
+            if not source_uses_query_cache(source) or (source == "Mattermost" and not hashtags_only):
+                continue
+            expires_at = cache.get_expiry('query_result', f"{source}|{search_term}")
+            if expires_at is not None and expires_at - time.time() > PREFETCH_REFRESH_MARGIN:
+                continue
             
+            token = cache_refresh_mode.set(True)
             try:
-                # Tüm thread'i çek
-                thread_response = requests.get(f"{base_url}/posts/{thread_id}/thread", headers=headers)
-                thread_response.raise_for_status()
-                full_thread = thread_response.json()
-                
-                ordered_post_ids = full_thread.get('order', [])
-                if not ordered_post_ids: continue
-                
-                relevant_messages = []
-                root_post = full_thread['posts'][ordered_post_ids[0]]
-                root_date = datetime.datetime.fromtimestamp(root_post['create_at'] / 1000).strftime('%Y-%m-%d %H:%M:%S')
-                root_author = root_post.get('user_id', 'User')
-                
-                # Kök mesajı her zaman ekle (bağlam için)
-                relevant_messages.append(f"--- KONU BAŞLANGICI ---\n[{root_date} - User {root_author}]:\n{root_post.get('message', '')}")
-                
-                # Thread içindeki tüm mesajları kontrol et
-                thread_contains_killed_prey = False
-                
-                # Kök mesajda "killed a prey" var mı?
-                if "killed a prey" in root_post.get('message', '').lower() or "killed a prey:" in root_post.get('message', '').lower():
-                    thread_contains_killed_prey = True
-                
-                # Thread içindeki tüm mesajları kontrol et
-                for post_id in ordered_post_ids[1:]:
-                    reply = full_thread['posts'][post_id]
-                    reply_message = reply.get('message', '')
-                    
-                    # Arama terimi bu mesajda var mı? (bağlam için ekle)
-                    if search_term.lower() in reply_message.lower():
-                        reply_date = datetime.datetime.fromtimestamp(reply['create_at'] / 1000).strftime('%H:%M:%S')
-                        reply_author = reply.get('user_id', 'User')
-                        relevant_messages.append(f"--- İLGİLİ YANIT ---\n[{reply_date} - User {reply_author}]:\n{reply_message}")
-                    
-                    # "killed a prey" bu mesajda var mı?
-                    if "killed a prey" in reply_message.lower() or "killed a prey:" in reply_message.lower():
-                        thread_contains_killed_prey = True
-                        reply_date = datetime.datetime.fromtimestamp(reply['create_at'] / 1000).strftime('%H:%M:%S')
-                        reply_author = reply.get('user_id', 'User')
-                        relevant_messages.append(f"--- İLGİLİ YANIT (KILLED A PREY) ---\n[{reply_date} - User {reply_author}]:\n{reply_message}")
-                
-                # Thread'i ekle (killed a prey durumuna göre)
-                if len(relevant_messages) > 1:  # En az kök mesajı ve bir yanıt var
-                    # Thread'in durumunu belirle
-                    status = "tamamlandi" if thread_contains_killed_prey else "devam_ediyor"
-                    
-                    collected_data.append({
-                        "Source_Platform": "Mattermost", 
-                        "ID": root_post.get('id', 'Unknown'),
-                        "Title": f"Mattermost Konusu: {root_post.get('id', 'Unknown')}",
-                        "Description": "\n\n".join(relevant_messages),
-                        "Author": root_author, 
-                        "Creation_Date": root_date, 
-                        "Content_Type": "Mattermost Thread",
-                        "Channel_ID": root_post.get('channel_id', 'Unknown'),
-                        "Notes": "N/A", 
-                        "Attached_Files": "N/A",
-                        "Status": status  # Durum bilgisini ekle
-                    })
-                
-            except Exception as thread_error:
-                print(f"Warning: Could not process Mattermost thread for ID {thread_id}. Error: {thread_error}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"!!!! MATTERMOST ERROR: {e} !!!!")
-        
-    return collected_data
+                with perf_span('prefetch', source=source) as span:
+                    rows = fetch_source_cached(source, search_term)
+                    span['items'] = len(rows)
+                refreshed_count += 1
+            except Exception as e:
+                print(f"Warning: Prefetch failed for {source} '{search_term}'. Error: {e}")
+            finally:
+                cache_refresh_mode.reset(token)
+    
+    if refreshed_count:
+        print(f"Prefetch: {refreshed_count} popular source queries refreshed.")
+    return refreshed_count
+
+def prefetch_loop():
+    while True:
+        try:
+            prefetch_popular_searches()
+        except Exception as e:
+            print(f"!!!! PREFETCH ERROR: {e} !!!!")
+        time.sleep(PREFETCH_INTERVAL)
+
+@st.cache_resource(show_spinner=False)
+def start_prefetch_scheduler():
+    """
+    Sık aranan terimleri PREFETCH_INTERVAL aralıklarla tazeleyen arka plan thread'ini (süreç başına bir kez) başlatır.
+    Her worker kendi thread'ini başlatır; yenilemeyi o an kirayı tutan worker yapar.
+    """
+    thread = threading.Thread(target=prefetch_loop, name="search-prefetch", daemon=True)
+    thread.start()
+    return thread
 
 # ==============================================================================
-# 3. ANA VERİ YÖNETİM FONKSİYONU (OPTİMİZE EDİLMİŞ)
+# 4. CHATBOT FONKSİYONLARI
 # ==============================================================================
-@st.cache_data(ttl=1800)  # 30 dakika önbellek
-def get_all_data_fast(search_term, platform_filter="Tümü"):
+# Doğal dil sorgusundaki bağlaçlar; "#x değil/hariç" sonradan, "not/without #x" önceden olumsuzlar
+CHATBOT_OPERATOR_WORDS = {'ve': 'AND', 'and': 'AND', 'veya': 'OR', 'yada': 'OR', 'or': 'OR'}
+CHATBOT_POSTFIX_NEGATIONS = ('değil', 'hariç', 'olmayan', 'dışında', 'içermeyen')
+CHATBOT_PREFIX_NEGATIONS = ('not', 'without')
+CHATBOT_DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})|(\d{1,2})[./](\d{1,2})[./](\d{4})')
+CHATBOT_START_WORDS = re.compile(r'\b(sonra|itibaren|beri|since|after|from)\b')
+CHATBOT_END_WORDS = re.compile(r'\b(önce|kadar|before|until)\b')
+
+def build_chatbot_search_term(query):
     """
-    Hızlı veri çekme - platform filtresine göre optimize edilmiş versiyon
+    Sorgudaki hashtag'leri ve bağlaçları (ve/veya/değil...) tek bir mantıksal arama ifadesine çevirir.
+    İfade kurulamazsa hashtag'ler VE ile bağlanır; aranacak hashtag yoksa None döner.
     """
-    print(f"'{search_term}' için hızlı veri çekme başlatılıyor... (Platform: {platform_filter})")
+    parts = []
+    negate_next = False
+    for token in re.findall(r'#\w+|[()]|[^\s()#]+', query):
+        word = token.strip(".,;:!?'\"")
+        if token.startswith('#'):
+            parts.append(f"NOT {token}" if negate_next else token)
+            negate_next = False
+        elif token in ('(', ')'):
+            parts.append(token)
+        elif word in CHATBOT_OPERATOR_WORDS:
+            # Baştaki, art arda gelen veya açılan parantezden sonraki bağlaçlar cümlenin parçasıdır
+            if parts and parts[-1] not in ('AND', 'OR', '('):
+                parts.append(CHATBOT_OPERATOR_WORDS[word])
+        elif word in CHATBOT_PREFIX_NEGATIONS:
+            negate_next = True
+        elif word in CHATBOT_POSTFIX_NEGATIONS and parts and parts[-1].startswith('#'):
+            parts[-1] = f"NOT {parts[-1]}"
     
-    # Platform filtresine göre veri çek
-    if platform_filter == "Redmine":
-        print("Sadece Redmine verileri çekiliyor...")
-        redmine_list = fast_redmine_fetch(search_term)
-        mattermost_list = []
-    elif platform_filter == "Mattermost":
-        print("Sadece Mattermost verileri çekiliyor...")
-        redmine_list = []
-        mattermost_list = fast_mattermost_fetch(search_term)
-    else:  # "Tümü" seçiliyse
-        print("Tüm platformlardan veri çekiliyor...")
-        redmine_list = fast_redmine_fetch(search_term)
-        mattermost_list = fast_mattermost_fetch(search_term)
-    
-    redmine_df = pd.DataFrame(redmine_list)
-    mattermost_df = pd.DataFrame(mattermost_list)
+    while parts and parts[-1] in ('AND', 'OR'):
+        parts.pop()
+    # Bağlaçsız sorguda parantezler sözdizimi sayılmaz; düz metin olarak aranmasınlar diye atılır
+    if not any(part in ('AND', 'OR') or part.startswith('NOT ') for part in parts):
+        parts = [part for part in parts if part not in ('(', ')')]
     
-    combined_df = pd.concat([redmine_df, mattermost_df], ignore_index=True)
+    hashtags = list(dict.fromkeys(re.findall(r'#\w+', query)))
+    for candidate in (" ".join(parts), " ".join(hashtags)):
+        try:
+            return parse_search_query(candidate).canonical()
+        except ValueError:
+            continue
+    return None
 
-    print(f"Veri çekme tamamlandı. Toplam {len(combined_df)} sonuç bulundu.")
-    return combined_df
+def parse_chatbot_dates(query):
+    """
+    Sorgudaki tarih ifadelerinden (başlangıç, bitiş) aralığını çıkarır; gün bazında, bitiş dahildir.
+    - İki tarih: aralık ("2024-01-01 ile 2024-03-31 arası")
+    - Tek tarih: "...'den sonra/itibaren" başlangıç, "...'e kadar/önce" bitiş, yalnızsa o gün
+    - bugün / dün / bu hafta / son N gün
+    """
+    today = datetime.date.today()
+    start_date = end_date = None
+    
+    dates = []
+    for match in CHATBOT_DATE_PATTERN.finditer(query):
+        year, month, day = (match.group(1), match.group(2), match.group(3)) if match.group(1) else (match.group(6), match.group(5), match.group(4))
+        try:
+            dates.append((datetime.date(int(year), int(month), int(day)), match))
+        except ValueError:
+            continue
+    
+    if len(dates) >= 2:
+        start_date, end_date = sorted([dates[0][0], dates[1][0]])
+    elif dates:
+        date, match = dates[0]
+        # "2024-01-01'den sonra" veya "after 2024-01-01"
+        context = query[max(0, match.start() - 12):match.start()] + " " + query[match.end():match.end() + 25]
+        if CHATBOT_START_WORDS.search(context):
+            start_date = date
+        elif CHATBOT_END_WORDS.search(context):
+            end_date = date
+        else:
+            start_date = end_date = date
+    elif 'bugün' in query or 'today' in query:
+        start_date = today
+    elif 'dün' in query or 'yesterday' in query:
+        start_date = today - datetime.timedelta(days=1)
+    elif 'bu hafta' in query or 'this week' in query:
+        start_date = today - datetime.timedelta(days=7)
+    else:
+        last_days = re.search(r'(?:son|last)\s+(\d+)\s+(?:gün|days?)', query)
+        if last_days:
+            start_date = today - datetime.timedelta(days=int(last_days.group(1)))
+    
+    return start_date, end_date
 
-# ==============================================================================
-# 4. CHATBOT FONKSİYONLARI
-# ==============================================================================
 def parse_natural_language_query(query):
     """
     Doğal dil sorgusunu parse eder ve arama parametrelerini çıkarır
@@ -217,16 +2992,11 @@ def parse_natural_language_query(query):
     query = query.lower()
     
     # Varsayılan değerler
-    search_term = None
     platform_filter = "Tümü"
     status_filter = "Tümü"
-    date_filter = None
     
-    # Hashtag arama
-    hashtag_pattern = r'#(\w+)'
-    hashtags = re.findall(hashtag_pattern, query)
-    if hashtags:
-        search_term = f"#{hashtags[0]}"  # İlk hashtag'i al
+    # Hashtag arama: birden fazla hashtag ve/veya/değil ile tek sorguda aranır
+    search_term = build_chatbot_search_term(query)
     
     # Platform filtreleme
     if 'redmine' in query:
@@ -240,166 +3010,188 @@ def parse_natural_language_query(query):
     elif any(word in query for word in ['devam eden', 'ongoing', 'continuing']):
         status_filter = "Devam Eden"
     
-    # Tarih filtreleme (basit)
-    if 'bugün' in query or 'today' in query:
-        date_filter = datetime.date.today()
-    elif 'dün' in query or 'yesterday' in query:
-        date_filter = datetime.date.today() - datetime.timedelta(days=1)
-    elif 'bu hafta' in query or 'this week' in query:
-        date_filter = datetime.date.today() - datetime.timedelta(days=7)
+    # Tarih filtreleme (tek gün, aralık veya göreli)
+    date_filter, end_date_filter = parse_chatbot_dates(query)
     
     return {
         'search_term': search_term,
         'platform_filter': platform_filter,
         'status_filter': status_filter,
         'date_filter': date_filter,
+        'end_date_filter': end_date_filter,
         'original_query': query
     }
 
-def create_word_document(data, query_info):
+# Word (docx) XML'inde izin verilmeyen kontrol karakterleri
+WORD_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+@st.cache_resource(show_spinner=False)
+def get_word_report_template():
     """
-    Arama sonuçlarını Word dokümanına aktarır
+    python-docx'in varsayılan şablonunu (stiller, tema, ayarlar) bir kez paket parçalarına ayırır.
+    (parçalar, document.xml açılış etiketi, sayfa ayarları) döner; parçalar listesinde
+    document.xml'in yeri None ile işaretlenir, içeriği rapor yazılırken akış halinde üretilir.
     """
-    doc = Document()
-    
-    # Başlık
-    title = doc.add_heading('İş Takip Arama Raporu', 0)
-    title.alignment = 1  # Ortalanmış
+    template = io.BytesIO()
+    Document().save(template)
     
-    # Sorgu bilgileri
-    doc.add_heading('Sorgu Bilgileri', level=1)
-    p = doc.add_paragraph()
-    p.add_run('Orijinal Sorgu: ').bold = True
-    p.add_run(query_info['original_query'])
-    
-    p = doc.add_paragraph()
-    p.add_run('Arama Terimi: ').bold = True
-    p.add_run(query_info['search_term'] or 'Belirtilmemiş')
+    parts = []
+    with zipfile.ZipFile(template) as package:
+        for name in package.namelist():
+            if name == 'word/document.xml':
+                document_xml = package.read(name).decode('utf-8')
+                parts.append((name, None))
+            else:
+                parts.append((name, package.read(name)))
     
-    p = doc.add_paragraph()
-    p.add_run('Platform Filtresi: ').bold = True
-    p.add_run(query_info['platform_filter'])
+    document_open = re.search(r'<w:document[^>]*>', document_xml).group(0)
+    section = re.search(r'<w:sectPr[\s>].*</w:sectPr>', document_xml, re.S)
+    return parts, document_open, section.group(0) if section else ''
+
+def word_run(text, bold=False):
+    """
+    Tek bir metin parçası (w:r); satır sonları python-docx'teki gibi w:br olur
+    """
+    text = WORD_INVALID_XML_CHARS.sub('', str(text))
+    lines = '<w:br/>'.join(f'<w:t xml:space="preserve">{xml_escape(line)}</w:t>' for line in text.split('\n'))
+    return f"<w:r>{'<w:rPr><w:b/></w:rPr>' if bold else ''}{lines}</w:r>"
+
+def word_paragraph(*runs, style=None, center=False):
+    """
+    Paragraf (w:p); runs: (metin, kalın mı) çiftleri
+    """
+    properties = ''
+    if style or center:
+        properties = (
+            '<w:pPr>'
+            + (f'<w:pStyle w:val="{style}"/>' if style else '')
+            + ('<w:jc w:val="center"/>' if center else '')
+            + '</w:pPr>'
+        )
+    return f"<w:p>{properties}{''.join(word_run(text, bold) for text, bold in runs)}</w:p>"
+
+def word_heading(text, level):
+    # python-docx add_heading ile aynı stiller: 0 -> Title, n -> Heading n
+    return word_paragraph((text, False), style='Title' if level == 0 else f'Heading{level}', center=level == 0)
+
+def iter_word_report_xml(data, query_info):
+    """
+    Raporun gövdesini XML parçaları halinde üretir.
+    Satırlar platform + duruma göre tek bir groupby ile bir kez gruplanır; her grup sütun dizileri
+    üzerinden yazılır, DataFrame satırları (iterrows) oluşturulmaz.
+    """
+    yield word_heading('İş Takip Arama Raporu', 0)
     
-    p = doc.add_paragraph()
-    p.add_run('Durum Filtresi: ').bold = True
-    p.add_run(query_info['status_filter'])
+    # Sorgu bilgileri
+    yield word_heading('Sorgu Bilgileri', 1)
+    yield word_paragraph(('Orijinal Sorgu: ', True), (query_info['original_query'], False))
+    yield word_paragraph(('Arama Terimi: ', True), (query_info['search_term'] or 'Belirtilmemiş', False))
+    yield word_paragraph(('Platform Filtresi: ', True), (query_info['platform_filter'], False))
+    yield word_paragraph(('Durum Filtresi: ', True), (query_info['status_filter'], False))
+    if query_info['date_filter'] or query_info.get('end_date_filter'):
+        date_range = f"{query_info['date_filter'] or '...'} - {query_info.get('end_date_filter') or '...'}"
+        yield word_paragraph(('Tarih Filtresi: ', True), (date_range, False))
     
-    if query_info['date_filter']:
-        p = doc.add_paragraph()
-        p.add_run('Tarih Filtresi: ').bold = True
-        p.add_run(str(query_info['date_filter']))
+    # (platform, durum) -> satır konumları; Redmine satırlarının durumu boştur
+    groups = data.groupby(
+        [data['Source_Platform'].astype(object), data['Status'].astype(object).fillna('')],
+        sort=False
+    ).indices
+    group_sizes = {key: len(positions) for key, positions in groups.items()}
+    redmine_count = sum(size for (platform, _), size in group_sizes.items() if platform == 'Redmine')
+    mattermost_count = sum(size for (platform, _), size in group_sizes.items() if platform == 'Mattermost')
     
     # İstatistikler
-    doc.add_heading('İstatistikler', level=1)
-    p = doc.add_paragraph()
-    p.add_run(f'Toplam Sonuç: {len(data)}').bold = True
-    
-    redmine_count = len(data[data['Source_Platform'] == 'Redmine'])
-    mattermost_count = len(data[data['Source_Platform'] == 'Mattermost'])
-    
-    p = doc.add_paragraph()
-    p.add_run(f'Redmine Sonuçları: {redmine_count}')
-    
-    p = doc.add_paragraph()
-    p.add_run(f'Mattermost Sonuçları: {mattermost_count}')
+    yield word_heading('İstatistikler', 1)
+    yield word_paragraph((f'Toplam Sonuç: {len(data)}', True))
+    yield word_paragraph((f'Redmine Sonuçları: {redmine_count}', False))
+    yield word_paragraph((f'Mattermost Sonuçları: {mattermost_count}', False))
     
     # Mattermost durum dağılımı
     if mattermost_count > 0:
-        mattermost_data = data[data['Source_Platform'] == 'Mattermost']
-        tamamlanan_count = len(mattermost_data[mattermost_data['Status'] == 'tamamlandi'])
-        devam_eden_count = len(mattermost_data[mattermost_data['Status'] == 'devam_ediyor'])
-        
-        p = doc.add_paragraph()
-        p.add_run('Mattermost Durum Dağılımı:').bold = True
-        
-        p = doc.add_paragraph()
-        p.add_run(f'• Tamamlanan: {tamamlanan_count}')
-        
-        p = doc.add_paragraph()
-        p.add_run(f'• Devam Eden: {devam_eden_count}')
+        yield word_paragraph(('Mattermost Durum Dağılımı:', True))
+        yield word_paragraph((f"• Tamamlanan: {group_sizes.get(('Mattermost', 'tamamlandi'), 0)}", False))
+        yield word_paragraph((f"• Devam Eden: {group_sizes.get(('Mattermost', 'devam_ediyor'), 0)}", False))
     
     # Detaylı Sonuçlar
-    doc.add_heading('Detaylı Sonuçlar', level=1)
+    yield word_heading('Detaylı Sonuçlar', 1)
+    
+    titles = data['Title'].to_numpy()
+    authors = data['Author'].to_numpy()
+    content_types = data['Content_Type'].to_numpy()
+    descriptions = data['Description'].to_numpy()
+    dates = data['Creation_Date'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('N/A').to_numpy()
+    
+    def iter_rows(group_key):
+        positions = groups.get(group_key)
+        if positions is None:
+            return
+        for position in positions:
+            yield titles[position], dates[position], authors[position], content_types[position], descriptions[position]
     
     # Redmine sonuçları
-    redmine_data = data[data['Source_Platform'] == 'Redmine']
-    if not redmine_data.empty:
-        doc.add_heading('Redmine Sonuçları', level=2)
-        for index, row in redmine_data.iterrows():
-            doc.add_heading(f"🔴 {row.get('Title', 'Başlık Yok')}", level=3)
-            
-            p = doc.add_paragraph()
-            p.add_run('📅 Tarih: ').bold = True
-            p.add_run(str(row.get('Creation_Date', 'N/A')))
-            
-            p = doc.add_paragraph()
-            p.add_run('👤 Yazar: ').bold = True
-            p.add_run(str(row.get('Author', 'N/A')))
-            
-            p = doc.add_paragraph()
-            p.add_run('🏷️ Tip: ').bold = True
-            p.add_run(str(row.get('Content_Type', 'N/A')))
-            
-            p = doc.add_paragraph()
-            p.add_run('📝 Açıklama:').bold = True
-            p.add_run('\n' + str(row.get('Description', '')))
-            
-            doc.add_paragraph()  # Boşluk
+    if redmine_count:
+        yield word_heading('Redmine Sonuçları', 2)
+        for title, date, author, content_type, description in iter_rows(('Redmine', '')):
+            yield word_heading(f"🔴 {title or 'Başlık Yok'}", 3)
+            yield word_paragraph(('📅 Tarih: ', True), (date, False))
+            yield word_paragraph(('👤 Yazar: ', True), (author if author is not None else 'N/A', False))
+            yield word_paragraph(('🏷️ Tip: ', True), (content_type if content_type is not None else 'N/A', False))
+            yield word_paragraph(('📝 Açıklama:', True), ('\n' + str(description or ''), False))
+            yield word_paragraph()  # Boşluk
     
     # Mattermost sonuçları
-    mattermost_data = data[data['Source_Platform'] == 'Mattermost']
-    if not mattermost_data.empty:
-        doc.add_heading('Mattermost Sonuçları', level=2)
-        
-        # Tamamlanan işler
-        tamamlanan_data = mattermost_data[mattermost_data['Status'] == 'tamamlandi']
-        if not tamamlanan_data.empty:
-            doc.add_heading('🟢 Tamamlanan İşler', level=3)
-            for index, row in tamamlanan_data.iterrows():
-                doc.add_heading(f"✅ {row.get('Title', 'Başlık Yok')}", level=4)
-                
-                p = doc.add_paragraph()
-                p.add_run('📅 Tarih: ').bold = True
-                p.add_run(str(row.get('Creation_Date', 'N/A')))
-                
-                p = doc.add_paragraph()
-                p.add_run('👤 Yazar: ').bold = True
-                p.add_run(str(row.get('Author', 'N/A')))
-                
-                p = doc.add_paragraph()
-                p.add_run('📝 Mesajlar:').bold = True
-                p.add_run('\n' + str(row.get('Description', '')))
-                
-                doc.add_paragraph()  # Boşluk
-        
-        # Devam eden işler
-        devam_eden_data = mattermost_data[mattermost_data['Status'] == 'devam_ediyor']
-        if not devam_eden_data.empty:
-            doc.add_heading('🔵 Devam Eden İşler', level=3)
-            for index, row in devam_eden_data.iterrows():
-                doc.add_heading(f"⏳ {row.get('Title', 'Başlık Yok')}", level=4)
-                
-                p = doc.add_paragraph()
-                p.add_run('📅 Tarih: ').bold = True
-                p.add_run(str(row.get('Creation_Date', 'N/A')))
-                
-                p = doc.add_paragraph()
-                p.add_run('👤 Yazar: ').bold = True
-                p.add_run(str(row.get('Author', 'N/A')))
-                
-                p = doc.add_paragraph()
-                p.add_run('📝 Mesajlar:').bold = True
-                p.add_run('\n' + str(row.get('Description', '')))
-                
-                doc.add_paragraph()  # Boşluk
+    if mattermost_count:
+        yield word_heading('Mattermost Sonuçları', 2)
+        
+        for status, status_heading, badge in (
+            ('tamamlandi', '🟢 Tamamlanan İşler', '✅'),
+            ('devam_ediyor', '🔵 Devam Eden İşler', '⏳')
+        ):
+            if not group_sizes.get(('Mattermost', status)):
+                continue
+            yield word_heading(status_heading, 3)
+            for title, date, author, _, description in iter_rows(('Mattermost', status)):
+                yield word_heading(f"{badge} {title or 'Başlık Yok'}", 4)
+                yield word_paragraph(('📅 Tarih: ', True), (date, False))
+                yield word_paragraph(('👤 Yazar: ', True), (author if author is not None else 'N/A', False))
+                yield word_paragraph(('📝 Mesajlar:', True), ('\n' + str(description or ''), False))
+                yield word_paragraph()  # Boşluk
     
     # Rapor oluşturma tarihi
-    doc.add_paragraph()
-    p = doc.add_paragraph()
-    p.add_run('Rapor Oluşturma Tarihi: ').bold = True
-    p.add_run(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    yield word_paragraph()
+    yield word_paragraph(('Rapor Oluşturma Tarihi: ', True), (datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False))
+
+def write_word_report(data, query_info, output):
+    """
+    Raporu docx paketi olarak output'a (dosya benzeri nesne) yazar.
+    Şablon parçaları aynen kopyalanır; word/document.xml tüm doküman bellekte kurulmadan
+    iter_word_report_xml'den gelen parçalarla akış halinde sıkıştırılarak yazılır.
+    """
+    parts, document_open, section_xml = get_word_report_template()
     
-    return doc
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, content in parts:
+            if content is not None:
+                package.writestr(name, content)
+                continue
+            
+            with io.TextIOWrapper(package.open(name, 'w'), encoding='utf-8') as document:
+                document.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+                document.write(f"{document_open}<w:body>")
+                for chunk in iter_word_report_xml(data, query_info):
+                    document.write(chunk)
+                document.write(f"{section_xml}</w:body></w:document>")
+    return output
+
+def create_word_document(data, query_info):
+    """
+    Arama sonuçlarını Word dokümanına aktarır; başa sarılmış BytesIO döner
+    """
+    docx_buffer = io.BytesIO()
+    write_word_report(load_full_mattermost_rows(data, query_info['search_term']), query_info, docx_buffer)
+    docx_buffer.seek(0)
+    return docx_buffer
 
 # ==============================================================================
 # 5. STREAMLIT ARAYÜZÜ
@@ -409,6 +3201,7 @@ def main():
     
     st.title('🔍 İş Takip Arama Aracı')
     st.markdown("Redmine ve Mattermost platformlarında iş isimlerine göre arama yapın.")
+    render_redmine_mirror_status()
     
     # Session state ile veri saklama
     if 'search_results' not in st.session_state:
@@ -419,6 +3212,16 @@ def main():
         st.session_state.chat_history = []
     if 'last_results' not in st.session_state:
         st.session_state.last_results = None
+    if 'search_results_key' not in st.session_state:
+        st.session_state.search_results_key = None
+    if 'search_trace' not in st.session_state:
+        st.session_state.search_trace = None
+    if 'last_search_trace' not in st.session_state:
+        st.session_state.last_search_trace = None
+    
+    # Sık aranan terimlerin önbelleğini arka planda sıcak tut
+    if PREFETCH_ENABLED:
+        start_prefetch_scheduler()
     
     # Sekmeler oluştur
     tab1, tab2 = st.tabs(["🔍 Manuel Arama", "🤖 Chatbot Arama"])
@@ -442,7 +3245,11 @@ def manual_search_interface():
         search_term = st.text_input(
             "Aranacak iş ismini girin:",
             placeholder="Örnek: ATP, pharmacircle, yama notu...",
-            value=st.session_state.search_term
+            value=st.session_state.search_term,
+            help='Birden fazla terim tek aramada aranır: "#atp VE #pharmacircle", "#atp VEYA #yama", '
+                 '"#atp DEĞİL #test" (veya "#atp VE -#test"), parantez ve "tırnaklı ifade" kullanılabilir. '
+                 'Operatörler büyük harfle yazılmalıdır; küçük harfli "ve", "not" gibi kelimeler düz metin olarak aranır. '
+                 'Operatör içermeyen aramada parantez ve "-" düz karakterdir.'
         )
     
     with col2:
@@ -493,13 +3300,25 @@ def manual_search_interface():
         st.write("")
         clear_cache = st.button("🔄 Önbelleği Temizle")
         if clear_cache:
-            st.cache_data.clear()
+            get_entity_cache().clear()
+            get_export_cache().clear()
+            get_mattermost_search_plan.clear()
             st.session_state.search_results = None
+            st.session_state.search_results_key = None
             st.rerun()
     
+    # Sorgu sözdizimini veri çekmeden önce doğrula
+    if search_button and search_term:
+        try:
+            parse_search_query(search_term)
+        except ValueError as e:
+            st.error(f"❌ Geçersiz sorgu: {e}")
+            search_button = False
+    
     # Arama yapma
     if search_button and search_term:
         st.session_state.search_term = search_term
+        record_search(search_term)
         
         with st.spinner(f"'{search_term}' için veriler aranıyor... (Bu işlem 1-2 dakika sürebilir)"):
             try:
@@ -507,308 +3326,180 @@ def manual_search_interface():
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                # Platform filtresine göre mesaj göster
-                if platform_filter == "Redmine":
-                    status_text.text("Redmine verileri çekiliyor...")
-                elif platform_filter == "Mattermost":
-                    status_text.text("Mattermost verileri çekiliyor...")
+                # Her kaynağın gerçek ilerlemesini göster
+                def show_progress(snapshot):
+                    progress_bar.progress(int(progress_fraction(snapshot) * 100))
+                    status_text.text(" | ".join(
+                        f"{source}: tamamlandı" if values["finished"]
+                        else f"{source}: {values['done']}/{values['total']}" if values["total"]
+                        else f"{source}: veriler çekiliyor..."
+                        for source, values in snapshot.items()
+                    ))
+                
+                if platform_filter == "Tümü":
+                    status_text.text("Redmine ve Mattermost verileri paralel çekiliyor...")
                 else:
-                    status_text.text("Redmine verileri çekiliyor...")
+                    status_text.text(f"{platform_filter} verileri çekiliyor...")
                 
-                progress_bar.progress(25)
+                # Eşleşmeler geldikçe ilk sonuçları hafif bir tabloda göster
+                live_header = st.empty()
+                live_table = st.empty()
+                live_rows = {}
+                last_draw = [0.0]
                 
-                df = get_all_data_fast(search_term, platform_filter)
+                def show_rows(source, rows):
+                    for row in rows:
+                        live_rows[(source, row.id)] = row
+                    if time.time() - last_draw[0] < 0.5:
+                        return
+                    last_draw[0] = time.time()
+                    live_header.markdown(f"**⏳ İlk sonuçlar geliyor... ({len(live_rows)} adet)**")
+                    live_df = pd.DataFrame(
+                        [(row.source, row.title, row.author, row.created) for row in live_rows.values()],
+                        columns=['Source_Platform', 'Title', 'Author', 'Creation_Date']
+                    )
+                    live_df['Creation_Date'] = pd.to_datetime(live_df['Creation_Date'], unit='s')
+                    live_table.dataframe(live_df, use_container_width=True, hide_index=True)
+                
+                trace = SearchTrace(f"Arama: {search_term}")
+                df = get_all_data_fast(
+                    search_term, platform_filter,
+                    progress_callback=show_progress, rows_callback=show_rows, trace=trace
+                )
+                live_header.empty()
+                live_table.empty()
                 st.session_state.search_results = df
+                st.session_state.search_results_key = result_set_hash(df)
+                st.session_state.search_trace = trace
                 
                 progress_bar.progress(100)
                 status_text.text("Arama tamamlandı!")
                 
                 if df.empty:
                     st.warning(f"'{search_term}' için hiçbir sonuç bulunamadı.")
-                else:
-                    st.success(f"'{search_term}' için {len(df)} sonuç bulundu!")
-                    
-                    # Filtreleme uygula (platform filtresi zaten uygulandı)
-                    filtered_df = df.copy()
-                    
-                    if text_filter:
-                        mask = (filtered_df['Title'].str.contains(text_filter, case=False, na=False) | 
-                               filtered_df['Description'].str.contains(text_filter, case=False, na=False))
-                        filtered_df = filtered_df[mask]
-                    
-                    # Mattermost durum filtresi uygula
-                    if mattermost_status_filter != "Tümü":
-                        filtered_df = filter_mattermost_by_status(filtered_df, mattermost_status_filter)
-                    
-                    # Tarih filtresi uygula
-                    if date_filter_enabled and (start_date is not None or end_date is not None):
-                        # Creation_Date sütununu datetime'a çevir
-                        filtered_df['Creation_Date_dt'] = pd.to_datetime(filtered_df['Creation_Date'], errors='coerce')
-                        
-                        if start_date is not None:
-                            start_date_dt = pd.to_datetime(start_date)
-                            filtered_df = filtered_df[filtered_df['Creation_Date_dt'] >= start_date_dt]
-                        
-                        if end_date is not None:
-                            end_date_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1)  # Bitiş gününü dahil et
-                            filtered_df = filtered_df[filtered_df['Creation_Date_dt'] < end_date_dt]
-                        
-                        # Geçici sütunu sil
-                        filtered_df = filtered_df.drop('Creation_Date_dt', axis=1)
-                    
-                    # Sonuçları göster
-                    st.header("📊 Bulunan Sonuçlar")
-                    st.subheader(f"Filtrelenmiş Sonuçlar ({len(filtered_df)} adet)")
-                    
-                    if not filtered_df.empty:
-                        # Sonuçları tarihe göre sırala
-                        filtered_df = filtered_df.sort_values(by='Creation_Date', ascending=False)
-                        
-                        # Mattermost sonuçları için durum analizi yap
-                        if len(filtered_df[filtered_df['Source_Platform'] == 'Mattermost']) > 0:
-                            mattermost_df = filtered_df[filtered_df['Source_Platform'] == 'Mattermost'].copy()
-                            
-                            # Durumlara göre grupla (Status sütunu zaten fast_mattermost_fetch'te set edildi)
-                            tamamlanan = mattermost_df[mattermost_df['Status'] == 'tamamlandi']
-                            devam_eden = mattermost_df[mattermost_df['Status'] == 'devam_ediyor']
-                            
-                            # Redmine sonuçları
-                            redmine_df = filtered_df[filtered_df['Source_Platform'] == 'Redmine']
-                            
-                            # Sekmeler oluştur
-                            tab1, tab2, tab3 = st.tabs([
-                                f"🔴 Redmine ({len(redmine_df)})",
-                                f"🟢 Tamamlanan ({len(tamamlanan)})",
-                                f"🔵 Devam Eden ({len(devam_eden)})"
-                            ])
-                            
-                            # Redmine sekmesi
-                            with tab1:
-                                if not redmine_df.empty:
-                                    for index, row in redmine_df.iterrows():
-                                        with st.container():
-                                            st.markdown(f"### 🔴 Redmine - {row.get('Title', 'Başlık Yok')}")
-                                            with st.expander("📋 Detayları Gör", expanded=False):
-                                                col1, col2 = st.columns([2, 1])
-                                                with col1:
-                                                    st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                                                    st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                                                    st.markdown(f"**🏷️ Tip:** {row.get('Content_Type', 'N/A')}")
-                                                    st.markdown(f"**🆔 ID:** {row.get('ID', 'N/A')}")
-                                                with col2:
-                                                    st.markdown("**📊 İstatistikler:**")
-                                                    description_length = len(str(row.get('Description', '')))
-                                                    st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
-                                                st.markdown("---")
-                                                st.markdown("**📝 Açıklama:**")
-                                                st.text_area("", value=row.get('Description', ''), height=200, disabled=True)
-                                            st.markdown("---")
-                                else:
-                                    st.info("Redmine sonucu bulunamadı.")
-                            
-                            # Tamamlanan sekmesi (Yeşil)
-                            with tab2:
-                                if not tamamlanan.empty:
-                                    for index, row in tamamlanan.iterrows():
-                                        with st.container():
-                                            st.markdown(f"### 🟢 Tamamlanan - {row.get('Title', 'Başlık Yok')}")
-                                            with st.expander("📋 Detayları Gör", expanded=False):
-                                                col1, col2 = st.columns([2, 1])
-                                                with col1:
-                                                    st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                                                    st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                                                    st.markdown(f"**📺 Kanal ID:** {row.get('Channel_ID', 'N/A')}")
-                                                with col2:
-                                                    st.markdown("**📊 İstatistikler:**")
-                                                    description_length = len(str(row.get('Description', '')))
-                                                    st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
-                                                st.markdown("---")
-                                                st.markdown("**📝 Mesajlar:**")
-                                                st.text_area("", value=row.get('Description', ''), height=200, disabled=True)
-                                            st.markdown("---")
-                                else:
-                                    st.info("Tamamlanan iş bulunamadı.")
-                            
-                            # Devam Eden sekmesi (Mavi)
-                            with tab3:
-                                if not devam_eden.empty:
-                                    for index, row in devam_eden.iterrows():
-                                        with st.container():
-                                            st.markdown(f"### 🔵 Devam Eden - {row.get('Title', 'Başlık Yok')}")
-                                            with st.expander("📋 Detayları Gör", expanded=False):
-                                                col1, col2 = st.columns([2, 1])
-                                                with col1:
-                                                    st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                                                    st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                                                    st.markdown(f"**📺 Kanal ID:** {row.get('Channel_ID', 'N/A')}")
-                                                with col2:
-                                                    st.markdown("**📊 İstatistikler:**")
-                                                    description_length = len(str(row.get('Description', '')))
-                                                    st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
-                                                st.markdown("---")
-                                                st.markdown("**📝 Mesajlar:**")
-                                                st.text_area("", value=row.get('Description', ''), height=200, disabled=True)
-                                            st.markdown("---")
-                                else:
-                                    st.info("Devam eden iş bulunamadı.")
-                        else:
-                            # Sadece Redmine sonuçları varsa normal gösterim
-                            for index, row in filtered_df.iterrows():
-                                with st.container():
-                                    platform_badge = "🔴 Redmine" if row['Source_Platform'] == 'Redmine' else "💬 Mattermost"
-                                    st.markdown(f"### {platform_badge} - {row.get('Title', 'Başlık Yok')}")
-                                    with st.expander("📋 Detayları Gör", expanded=False):
-                                        col1, col2 = st.columns([2, 1])
-                                        with col1:
-                                            st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                                            st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                                            st.markdown(f"**🏷️ Tip:** {row.get('Content_Type', 'N/A')}")
-                                            if row.get('Source_Platform') == 'Redmine':
-                                                st.markdown(f"**🆔 ID:** {row.get('ID', 'N/A')}")
-                                            else:
-                                                st.markdown(f"**📺 Kanal ID:** {row.get('Channel_ID', 'N/A')}")
-                                        with col2:
-                                            st.markdown("**📊 İstatistikler:**")
-                                            description_length = len(str(row.get('Description', '')))
-                                            st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
-                                        st.markdown("---")
-                                        st.markdown("**📝 Açıklama/Mesajlar:**")
-                                        st.text_area("", value=row.get('Description', ''), height=200, disabled=True)
-                                    st.markdown("---")
-                    
-                    # İstatistikler
-                    st.header("📈 İstatistikler")
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Toplam Sonuç", len(df))
-                    
-                    with col2:
-                        redmine_count = len(df[df['Source_Platform'] == 'Redmine'])
-                        st.metric("Redmine Sonuçları", redmine_count)
-                    
-                    with col3:
-                        mattermost_count = len(df[df['Source_Platform'] == 'Mattermost'])
-                        st.metric("Mattermost Sonuçları", mattermost_count)
-                    
-                    # Excel'e kaydetme
-                    if not df.empty:
-                        st.header("💾 Sonuçları İndir")
-                        
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            csv = df.to_csv(index=False)
-                            st.download_button(
-                                label="📊 CSV olarak indir",
-                                data=csv,
-                                file_name=f"{search_term}_arama_sonuclari.csv",
-                                mime="text/csv"
-                            )
-                        
-                        with col2:
-                            # Excel için openpyxl gerekli
-                            try:
-                                output = pd.ExcelWriter('temp.xlsx', engine='openpyxl')
-                                df.to_excel(output, index=False)
-                                output.close()
-                                
-                                with open('temp.xlsx', 'rb') as f:
-                                    excel_data = f.read()
-                                
-                                st.download_button(
-                                    label="📊 Excel olarak indir",
-                                    data=excel_data,
-                                    file_name=f"{search_term}_arama_sonuclari.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                )
-                                
-                                # Geçici dosyayı sil
-                                os.remove('temp.xlsx')
-                                
-                            except Exception as e:
-                                st.error(f"Excel dosyası oluşturulamadı: {e}")
+                    render_truncation_warning(df)
                 
             except Exception as e:
                 st.error(f"Veri çekilirken bir hata oluştu: {e}")
     
-    # Eğer önceden arama yapılmışsa ve sonuçlar varsa, filtreleme uygula
-    elif st.session_state.search_results is not None:
+    # Sonuçlar session state'ten gösterilir; böylece sayfa değiştirme gibi etkileşimlerde görünüm korunur
+    if st.session_state.search_results is not None:
         df = st.session_state.search_results
         
         if not df.empty:
-            st.success(f"'{st.session_state.search_term}' için {len(df)} sonuç bulundu!")
-            
-            # Filtreleme uygula
-            filtered_df = df.copy()
-            
-            # Platform filtresi uygula (eğer değişmişse)
-            if platform_filter != "Tümü":
-                filtered_df = filtered_df[filtered_df['Source_Platform'] == platform_filter]
-            
-            if text_filter:
-                mask = (filtered_df['Title'].str.contains(text_filter, case=False, na=False) | 
-                       filtered_df['Description'].str.contains(text_filter, case=False, na=False))
-                filtered_df = filtered_df[mask]
+            search_term = st.session_state.search_term
+            st.success(f"'{search_term}' için {len(df)} sonuç bulundu!")
+            render_truncation_warning(df)
             
-            # Mattermost durum filtresi uygula
-            if mattermost_status_filter != "Tümü":
-                filtered_df = filter_mattermost_by_status(filtered_df, mattermost_status_filter)
-            
-            # Tarih filtresi uygula
-            if date_filter_enabled and (start_date is not None or end_date is not None):
-                # Creation_Date sütununu datetime'a çevir
-                filtered_df['Creation_Date_dt'] = pd.to_datetime(filtered_df['Creation_Date'], errors='coerce')
-                
-                if start_date is not None:
-                    start_date_dt = pd.to_datetime(start_date)
-                    filtered_df = filtered_df[filtered_df['Creation_Date_dt'] >= start_date_dt]
-                
-                if end_date is not None:
-                    end_date_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1)  # Bitiş gününü dahil et
-                    filtered_df = filtered_df[filtered_df['Creation_Date_dt'] < end_date_dt]
+            # Bu çizimin filtre/gösterim/dışa aktarma süreleri ayrı bir izde toplanır
+            view_trace = SearchTrace("Görüntüleme")
+            with search_trace_scope(view_trace):
+                # Tüm filtreler tek bir maske ile tek geçişte uygulanır
+                filtered_df = apply_result_filters(
+                    df,
+                    platform_filter=platform_filter,
+                    text_filter=text_filter,
+                    status_filter=mattermost_status_filter,
+                    start_date=start_date if date_filter_enabled else None,
+                    end_date=end_date if date_filter_enabled else None
+                )
                 
-                # Geçici sütunu sil
-                filtered_df = filtered_df.drop('Creation_Date_dt', axis=1)
-            
-            # Sonuçları göster
-            st.header("📊 Bulunan Sonuçlar")
-            st.subheader(f"Filtrelenmiş Sonuçlar ({len(filtered_df)} adet)")
-            
-            if not filtered_df.empty:
-                # Sonuçları tarihe göre sırala
-                filtered_df = filtered_df.sort_values(by='Creation_Date', ascending=False)
+                # Sonuçları göster
+                st.header("📊 Bulunan Sonuçlar")
+                st.subheader(f"Filtrelenmiş Sonuçlar ({len(filtered_df)} adet)")
                 
-                for index, row in filtered_df.iterrows():
-                    with st.container():
-                        # Platform badge'i
-                        platform_badge = "🔴 Redmine" if row['Source_Platform'] == 'Redmine' else "💬 Mattermost"
+                if not filtered_df.empty:
+                    # Sonuçları tarihe göre sırala
+                    filtered_df = filtered_df.sort_values(by='Creation_Date', ascending=False)
+                    
+                    # Mattermost sonuçları için durum analizi yap
+                    is_mattermost = (filtered_df['Source_Platform'] == 'Mattermost').to_numpy()
+                    if is_mattermost.any():
+                        # Durumlara göre grupla (Status sütunu zaten fast_mattermost_fetch'te set edildi)
+                        status = filtered_df['Status'].to_numpy()
+                        tamamlanan = filtered_df[is_mattermost & (status == 'tamamlandi')]
+                        devam_eden = filtered_df[is_mattermost & (status == 'devam_ediyor')]
                         
-                        st.markdown(f"### {platform_badge} - {row.get('Title', 'Başlık Yok')}")
+                        # Redmine sonuçları
+                        redmine_df = filtered_df[(filtered_df['Source_Platform'] == 'Redmine').to_numpy()]
                         
-                        with st.expander("📋 Detayları Gör", expanded=False):
-                            col1, col2 = st.columns([2, 1])
-                            
-                            with col1:
-                                st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                                st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                                st.markdown(f"**🏷️ Tip:** {row.get('Content_Type', 'N/A')}")
-                                
-                                if row.get('Source_Platform') == 'Redmine':
-                                    st.markdown(f"**🆔 ID:** {row.get('ID', 'N/A')}")
-                                else:
-                                    st.markdown(f"**📺 Kanal ID:** {row.get('Channel_ID', 'N/A')}")
-                            
-                            with col2:
-                                st.markdown("**📊 İstatistikler:**")
-                                description_length = len(str(row.get('Description', '')))
-                                st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
-                            
-                            st.markdown("---")
-                            st.markdown("**📝 Açıklama/Mesajlar:**")
-                            st.text_area("", value=row.get('Description', ''), height=200, disabled=True)
+                        # Sekmeler oluştur
+                        tab1, tab2, tab3 = st.tabs([
+                            f"🔴 Redmine ({len(redmine_df)})",
+                            f"🟢 Tamamlanan ({len(tamamlanan)})",
+                            f"🔵 Devam Eden ({len(devam_eden)})"
+                        ])
                         
-                        st.markdown("---")
+                        # Redmine sekmesi
+                        with tab1:
+                            if not redmine_df.empty:
+                                render_paginated_results(
+                                    redmine_df, "manual_redmine",
+                                    lambda row, key: render_manual_result_row(row, key, badge="🔴 Redmine", body_label="📝 Açıklama:")
+                                )
+                            else:
+                                st.info("Redmine sonucu bulunamadı.")
+                        
+                        # Tamamlanan sekmesi (Yeşil)
+                        with tab2:
+                            if not tamamlanan.empty:
+                                render_paginated_results(
+                                    tamamlanan, "manual_tamamlanan",
+                                    lambda row, key: render_manual_result_row(row, key, badge="🟢 Tamamlanan", body_label="📝 Mesajlar:")
+                                )
+                            else:
+                                st.info("Tamamlanan iş bulunamadı.")
+                        
+                        # Devam Eden sekmesi (Mavi)
+                        with tab3:
+                            if not devam_eden.empty:
+                                render_paginated_results(
+                                    devam_eden, "manual_devam_eden",
+                                    lambda row, key: render_manual_result_row(row, key, badge="🔵 Devam Eden", body_label="📝 Mesajlar:")
+                                )
+                            else:
+                                st.info("Devam eden iş bulunamadı.")
+                    else:
+                        # Sadece Redmine sonuçları varsa normal gösterim
+                        render_paginated_results(filtered_df, "manual_results", render_manual_result_row)
+                
+                # İstatistikler
+                st.header("📈 İstatistikler")
+                col1, col2, col3 = st.columns(3)
+                
+                platform_counts = df['Source_Platform'].value_counts()
+                
+                with col1:
+                    st.metric("Toplam Sonuç", len(df))
+                
+                with col2:
+                    st.metric("Redmine Sonuçları", int(platform_counts.get('Redmine', 0)))
+                
+                with col3:
+                    st.metric("Mattermost Sonuçları", int(platform_counts.get('Mattermost', 0)))
+                
+                # Excel'e kaydetme
+                st.header("💾 Sonuçları İndir")
+                
+                col1, col2 = st.columns(2)
+                
+                # Dosyalar sadece istendiğinde ve sonuç kümesi başına bir kez oluşturulur
+                result_key = st.session_state.search_results_key or result_set_hash(df)
+                
+                with col1:
+                    render_lazy_download("csv", "📊 CSV olarak indir", df, result_key, f"{search_term}_arama_sonuclari.csv")
+                
+                with col2:
+                    try:
+                        render_lazy_download("xlsx", "📊 Excel olarak indir", df, result_key, f"{search_term}_arama_sonuclari.xlsx")
+                    except Exception as e:
+                        st.error(f"Excel dosyası oluşturulamadı: {e}")
+            
+            finish_search_trace(view_trace)
+            render_performance_panel([
+                ("Son arama", st.session_state.search_trace),
+                ("Bu görüntüleme", view_trace)
+            ])
     
     # Kullanım talimatları
     else:
@@ -825,6 +3516,8 @@ def chatbot_search_interface():
         user_query = st.text_area(
             "Sorgunuzu yazın:",
             placeholder="Örnek: Bana #atp adı altında mattermost kanalında tamamlanan işlerin mesajlarını verir misin?",
+            help="Birden fazla hashtag: '#atp ve #pharmacircle', '#atp veya #yama', '#test hariç'. "
+                 "Tarih: '2024-01-01 ile 2024-03-31 arası', '01.02.2024'den sonra', 'son 30 gün'.",
             height=100
         )
     
@@ -844,27 +3537,24 @@ def chatbot_search_interface():
                 return
             
             # Veri çek
-            df = get_all_data_fast(query_info['search_term'], query_info['platform_filter'])
+            record_search(query_info['search_term'])
+            trace = SearchTrace(f"Chatbot: {query_info['search_term']}")
+            df = get_all_data_fast(query_info['search_term'], query_info['platform_filter'], trace=trace)
+            st.session_state.last_search_trace = trace
             
             if df.empty:
                 st.warning(f"'{query_info['search_term']}' için hiçbir sonuç bulunamadı.")
+                render_truncation_warning(df)
                 return
             
-            # Filtreleme uygula
-            filtered_df = df.copy()
-            
-            # Durum filtresi
-            if query_info['status_filter'] != "Tümü":
-                if query_info['status_filter'] == "Tamamlanan":
-                    filtered_df = filtered_df[filtered_df['Status'] == 'tamamlandi']
-                elif query_info['status_filter'] == "Devam Eden":
-                    filtered_df = filtered_df[filtered_df['Status'] == 'devam_ediyor']
-            
-            # Tarih filtresi
-            if query_info['date_filter']:
-                filtered_df['Creation_Date_dt'] = pd.to_datetime(filtered_df['Creation_Date'], errors='coerce')
-                filtered_df = filtered_df[filtered_df['Creation_Date_dt'].dt.date >= query_info['date_filter']]
-                filtered_df = filtered_df.drop('Creation_Date_dt', axis=1)
+            # Filtreleme uygula (chatbot'ta durum filtresi Redmine sonuçlarını da eler)
+            filtered_df = apply_result_filters(
+                df,
+                status_filter=query_info['status_filter'],
+                start_date=query_info['date_filter'],
+                end_date=query_info['end_date_filter'],
+                status_filter_keeps_other_platforms=False
+            )
             
             # Sonuçları sakla
             st.session_state.last_results = filtered_df
@@ -879,6 +3569,7 @@ def chatbot_search_interface():
             
             # Sonuçları göster
             st.success(f"✅ {len(filtered_df)} sonuç bulundu!")
+            render_truncation_warning(df)
             
             # Özet bilgiler
             col1, col2, col3, col4 = st.columns(4)
@@ -886,69 +3577,59 @@ def chatbot_search_interface():
             with col1:
                 st.metric("Toplam Sonuç", len(filtered_df))
             
+            platform_counts = filtered_df['Source_Platform'].value_counts()
+            
             with col2:
-                redmine_count = len(filtered_df[filtered_df['Source_Platform'] == 'Redmine'])
-                st.metric("Redmine", redmine_count)
+                st.metric("Redmine", int(platform_counts.get('Redmine', 0)))
             
             with col3:
-                mattermost_count = len(filtered_df[filtered_df['Source_Platform'] == 'Mattermost'])
-                st.metric("Mattermost", mattermost_count)
+                st.metric("Mattermost", int(platform_counts.get('Mattermost', 0)))
             
             with col4:
-                if mattermost_count > 0:
-                    mattermost_data = filtered_df[filtered_df['Source_Platform'] == 'Mattermost']
-                    tamamlanan_count = len(mattermost_data[mattermost_data['Status'] == 'tamamlandi'])
-                    st.metric("Tamamlanan", tamamlanan_count)
-                else:
-                    st.metric("Tamamlanan", 0)
+                tamamlanan_count = int(((filtered_df['Source_Platform'] == 'Mattermost') & (filtered_df['Status'] == 'tamamlandi')).sum())
+                st.metric("Tamamlanan", tamamlanan_count)
     
     # Sonuçları göster
     if st.session_state.last_results is not None:
         st.header("📊 Bulunan Sonuçlar")
         
-        # Word dokümanı oluştur ve indir
-        if st.button("📄 Word Dokümanı Oluştur"):
-            with st.spinner("Word dokümanı oluşturuluyor..."):
-                doc = create_word_document(st.session_state.last_results, st.session_state.last_query_info)
-                
-                # Dosyayı kaydet
-                docx_buffer = io.BytesIO()
-                doc.save(docx_buffer)
-                docx_buffer.seek(0)
-                
-                # İndirme butonu
-                st.download_button(
-                    label="📄 Word Dokümanını İndir",
-                    data=docx_buffer.getvalue(),
-                    file_name=f"is_takip_raporu_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
+        view_trace = SearchTrace("Görüntüleme")
+        with search_trace_scope(view_trace):
+            # Word dokümanı oluştur ve indir
+            if st.button("📄 Word Dokümanı Oluştur"):
+                with st.spinner("Word dokümanı oluşturuluyor..."):
+                    with perf_span('export.word', items=len(st.session_state.last_results)) as span:
+                        docx_bytes = create_word_document(st.session_state.last_results, st.session_state.last_query_info).getvalue()
+                        span['bytes'] = len(docx_bytes)
+                    
+                    # İndirme butonu; Streamlit BytesIO verilse de getvalue() ile kopyaladığı için bayt açıkça verilir
+                    st.download_button(
+                        label="📄 Word Dokümanını İndir",
+                        data=docx_bytes,
+                        file_name=f"is_takip_raporu_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    )
+            
+            # Sonuçları tablo olarak göster
+            st.subheader("Detaylı Sonuçlar")
+            
+            # Mattermost ve Redmine ayrı ayrı göster
+            mattermost_data = st.session_state.last_results[st.session_state.last_results['Source_Platform'] == 'Mattermost']
+            redmine_data = st.session_state.last_results[st.session_state.last_results['Source_Platform'] == 'Redmine']
+            
+            if not mattermost_data.empty:
+                st.markdown("**💬 Mattermost Sonuçları:**")
+                render_paginated_results(mattermost_data, "chatbot_mattermost", render_chatbot_result_row)
+            
+            if not redmine_data.empty:
+                st.markdown("**🔴 Redmine Sonuçları:**")
+                render_paginated_results(redmine_data, "chatbot_redmine", render_chatbot_result_row)
         
-        # Sonuçları tablo olarak göster
-        st.subheader("Detaylı Sonuçlar")
-        
-        # Mattermost ve Redmine ayrı ayrı göster
-        mattermost_data = st.session_state.last_results[st.session_state.last_results['Source_Platform'] == 'Mattermost']
-        redmine_data = st.session_state.last_results[st.session_state.last_results['Source_Platform'] == 'Redmine']
-        
-        if not mattermost_data.empty:
-            st.markdown("**💬 Mattermost Sonuçları:**")
-            for index, row in mattermost_data.iterrows():
-                status_emoji = "🟢" if row['Status'] == 'tamamlandi' else "🔵"
-                with st.expander(f"{status_emoji} {row.get('Title', 'Başlık Yok')}", expanded=False):
-                    st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                    st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                    st.markdown(f"**📝 Mesajlar:**")
-                    st.text_area("", value=row.get('Description', ''), height=150, disabled=True, key=f"chatbot_mattermost_{index}")
-        
-        if not redmine_data.empty:
-            st.markdown("**🔴 Redmine Sonuçları:**")
-            for index, row in redmine_data.iterrows():
-                with st.expander(f"🔴 {row.get('Title', 'Başlık Yok')}", expanded=False):
-                    st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
-                    st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
-                    st.markdown(f"**📝 Açıklama:**")
-                    st.text_area("", value=row.get('Description', ''), height=150, disabled=True, key=f"chatbot_redmine_{index}")
+        finish_search_trace(view_trace)
+        render_performance_panel([
+            ("Son arama", st.session_state.last_search_trace),
+            ("Bu görüntüleme", view_trace)
+        ])
     
     # Chat history
     if st.session_state.chat_history:
@@ -960,57 +3641,155 @@ def chatbot_search_interface():
                 st.markdown(f"**Tarih:** {chat['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
 
 # ==============================================================================
-# 6. MATTERMOST İŞ DURUMU ANALİZ FONKSİYONU
+# 5.1 SAYFALI SONUÇ GÖSTERİMİ
 # ==============================================================================
-def analyze_mattermost_status(thread_data):
+RESULT_PAGE_SIZES = [10, 25, 50, 100]
+
+def render_paginated_results(df, key_prefix, render_row):
     """
-    Mattermost thread'inin durumunu belirler
-    Artık durum bilgisi DataFrame'de Status sütununda var
+    Sonuçları sayfa sayfa gösterir; widget'lar sadece görünen sayfadaki satırlar için oluşturulur.
+    render_row(row, key) her satır için çağrılır; key satıra özel widget anahtarı önekidir
+    (key_prefix'in ilk parçası + kaynak + ID, örn. "manual_Redmine_42").
     """
-    if thread_data is None or 'Status' not in thread_data:
-        return "devam_ediyor"
+    total_count = len(df)
+    if total_count == 0:
+        return
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Sayfa başına sonuç:", RESULT_PAGE_SIZES, index=1, key=f"{key_prefix}_page_size")
+    
+    page_count = (total_count + page_size - 1) // page_size
+    # Sayfa numarası sadece session state ile yönetilir (widget'a ayrıca varsayılan değer verilmez);
+    # ilk çizimde ve filtre değişip sonuç sayısı azaldığında geçersiz kalan numara 1'e çekilir
+    page_key = f"{key_prefix}_page"
+    if page_key not in st.session_state or st.session_state[page_key] > page_count:
+        st.session_state[page_key] = 1
     
-    status = thread_data['Status']
-    if pd.isna(status) or status == "":
-        return "devam_ediyor"
+    with col2:
+        page = st.number_input("Sayfa:", min_value=1, max_value=page_count, step=1, key=page_key)
+    
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_count)
+    with col3:
+        st.write("")
+        st.caption(f"{total_count} sonuçtan {start + 1}-{end} arası gösteriliyor (Sayfa {page}/{page_count})")
     
-    return status
+    # Satır anahtarları kaynak + ID'den üretilir; satır başka bir sayfaya/sekmeye geçse de durumu korunur
+    with perf_span('render', key=key_prefix, items=end - start):
+        for _, row in df.iloc[start:end].iterrows():
+            render_row(row, f"{key_prefix.split('_')[0]}_{row['Source_Platform']}_{row['ID']}")
 
-# ==============================================================================
-# 7. MATTERMOST DURUM FİLTRELEME FONKSİYONU
-# ==============================================================================
-def filter_mattermost_by_status(df, status_filter):
+def render_redmine_mirror_status():
     """
-    Mattermost sonuçlarını durumlarına göre filtreler
+    Ayna modunda Redmine sonuçlarının ne kadar güncel olduğunu (son eşitlemeden bu yana geçen süre) gösterir
     """
-    if status_filter == "Tümü":
-        return df
-    
-    # Sadece Mattermost sonuçlarını al
-    mattermost_df = df[df['Source_Platform'] == 'Mattermost'].copy()
-    
-    if mattermost_df.empty:
-        return df
+    if REDMINE_FETCH_MODE != 'mirror':
+        return
+    try:
+        last_sync = redmine_mirror_last_sync()
+    except Exception as e:
+        print(f"Warning: Could not read Redmine mirror status. Error: {e}")
+        return
+    if last_sync is None:
+        st.caption("🗄️ Redmine yerel aynası hazırlanıyor; Redmine aramaları şimdilik sunucu üzerinden yapılıyor.")
+        return
+    minutes = int(max(time.time() - last_sync, 0) // 60)
+    age = "az önce" if minutes == 0 else f"{minutes} dk önce" if minutes < 120 else f"{minutes // 60} saat önce"
+    st.caption(f"🗄️ Redmine sonuçları yerel aynadan gelir; ayna {age} eşitlendi.")
+
+def render_truncation_warning(df):
+    """
+    Sonuçları eksik olan kaynaklar için uyarı gösterir: hata veren (df.attrs['errors']) ve
+    sonuç/süre sınırına takılan (df.attrs['truncated']) kaynaklar (get_all_data_fast)
+    """
+    for source, message in df.attrs.get('errors', {}).items():
+        st.warning(f"⚠️ {source} verileri alınamadı, sonuçlar sadece diğer kaynaklardan gösteriliyor. Hata: {message}")
+    for source, reason in df.attrs.get('truncated', {}).items():
+        st.warning(
+            f"⚠️ {source} sonuçları kısaltıldı ({reason}); daha eski eşleşmeler gösterilmiyor. "
+            "Aramayı daraltmayı (ör. VE ile ek terim) deneyin."
+        )
+
+def render_lazy_download(kind, label, df, result_key, file_name):
+    """
+    İndirme butonu; dosya bu sonuç kümesi için henüz oluşturulmadıysa önce "hazırla" butonu gösterilir
+    ve dosya sadece tıklanınca oluşturulur. Her yeniden çalıştırmada tekrar üretilmez.
+    """
+    data = get_export_cache().get(kind, result_key)
+    if data is None and st.button(f"{label.split(' ', 1)[0]} {kind.upper()} dosyasını hazırla", key=f"prepare_{kind}"):
+        with st.spinner(f"{kind.upper()} dosyası hazırlanıyor..."):
+            data = get_export_bytes(kind, df, result_key)
     
-    # Status sütunu zaten fast_mattermost_fetch'te set edildi, tekrar hesaplamaya gerek yok
+    if data is not None:
+        st.download_button(label=label, data=data, file_name=file_name, mime=EXPORT_MIME_TYPES[kind], key=f"download_{kind}")
+
+def render_result_body(row, key, body_label, height=200):
+    """
+    Açıklama/mesaj metnini sadece kullanıcı istediğinde gönderir (büyük metinler sayfa yüküne eklenmez)
+    """
+    st.markdown(f"**{body_label}**")
+    # Önizleme satırlarında konuşmanın tamamı sadece açıldığında çekilir
+    preview = row.get('Content_Type') == MATTERMOST_PREVIEW_CONTENT_TYPE
+    if st.checkbox("Tüm konuşmayı yükle" if preview else "Tam metni yükle", key=f"{key}_load_body"):
+        if preview:
+            # Yüklenen konuşma oturumda tutulur; sonraki yeniden çalıştırmalarda tekrar doğrulanıp çekilmez
+            if f"{key}_conversation" not in st.session_state:
+                st.session_state[f"{key}_conversation"] = load_mattermost_conversation(row['ID'])
+            body = st.session_state[f"{key}_conversation"]
+        else:
+            body = row.get('Description', '')
+        st.text_area(body_label, value=body, height=height, disabled=True,
+                     key=f"{key}_body", label_visibility="collapsed")
+
+def render_manual_result_row(row, key, badge=None, body_label="📝 Açıklama/Mesajlar:"):
+    """
+    Manuel arama sonuç satırı: başlık + detay paneli
+    """
+    if badge is None:
+        badge = "🔴 Redmine" if row['Source_Platform'] == 'Redmine' else "💬 Mattermost"
     
-    # Durum filtresini uygula
-    if status_filter == "Tamamlanan":
-        filtered_df = mattermost_df[mattermost_df['Status'] == 'tamamlandi']
-    elif status_filter == "Devam Eden":
-        filtered_df = mattermost_df[mattermost_df['Status'] == 'devam_ediyor']
+    with st.container():
+        st.markdown(f"### {badge} - {row.get('Title', 'Başlık Yok')}")
+        
+        with st.expander("📋 Detayları Gör", expanded=False):
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
+                st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
+                st.markdown(f"**🏷️ Tip:** {row.get('Content_Type', 'N/A')}")
+                
+                if row.get('Source_Platform') == 'Redmine':
+                    st.markdown(f"**🆔 ID:** {row.get('ID', 'N/A')}")
+                else:
+                    st.markdown(f"**📺 Kanal ID:** {row.get('Channel_ID', 'N/A')}")
+            
+            with col2:
+                st.markdown("**📊 İstatistikler:**")
+                description_length = len(str(row.get('Description', '')))
+                st.markdown(f"• Açıklama uzunluğu: {description_length} karakter")
+            
+            st.markdown("---")
+            render_result_body(row, key, body_label)
+        
+        st.markdown("---")
+
+def render_chatbot_result_row(row, key):
+    """
+    Chatbot sonuç satırı: durum ikonlu tek bir açılır panel
+    """
+    if row['Source_Platform'] == 'Mattermost':
+        icon = "🟢" if row.get('Status') == 'tamamlandi' else "🔵"
+        body_label = "📝 Mesajlar:"
     else:
-        filtered_df = mattermost_df
-    
-    # Status sütununu kaldır
-    if 'Status' in filtered_df.columns:
-        filtered_df = filtered_df.drop('Status', axis=1)
-    
-    # Redmine sonuçlarını da ekle
-    redmine_df = df[df['Source_Platform'] == 'Redmine']
-    final_df = pd.concat([redmine_df, filtered_df], ignore_index=True)
+        icon = "🔴"
+        body_label = "📝 Açıklama:"
     
-    return final_df
+    with st.expander(f"{icon} {row.get('Title', 'Başlık Yok')}", expanded=False):
+        st.markdown(f"**📅 Tarih:** {row.get('Creation_Date', 'N/A')}")
+        st.markdown(f"**👤 Yazar:** {row.get('Author', 'N/A')}")
+        render_result_body(row, key, body_label, height=150)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Testlerin ortak düzeni: benchmark.py'deki yerel Redmine/Mattermost taklidi ve ona yönlendirilmiş uygulama modülü.
+Uygulama config değerlerini import anında okuduğu için modül sadece app fixture'ı üzerinden import edilir.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import benchmark
+
+
+@pytest.fixture(scope="session")
+def benchmark_server():
+    data = benchmark.BenchmarkData(benchmark.generate_issues(200, 1), benchmark.generate_posts(300, 5, 1))
+    server, url = benchmark.start_benchmark_server(data)
+    benchmark.configure_environment(url, tempfile.mkdtemp())
+    # Arka plan eşitleme/ön yükleme thread'leri olmadan, her aramada sunucuya gidilir
+    os.environ.update({"REDMINE_FETCH_MODE": "search", "MATTERMOST_FETCH_MODE": "api", "PREFETCH_ENABLED": "0"})
+    yield data
+    server.shutdown()
+
+
+@pytest.fixture
+def app(benchmark_server):
+    import interactive_search_app
+    return interactive_search_app
@@ -0,0 +1,50 @@
+"""
+Varlık bazlı önbellek (EntityCache) ve kaynak sonuçlarının önbellekten sunulması.
+"""
+
+
+def test_archive_mode_skips_query_cache(app, monkeypatch):
+    cache = app.EntityCache()
+    calls = []
+    
+    def archive_fetch(search_term, progress=None, on_rows=None):
+        calls.append(search_term)
+        return []
+    
+    monkeypatch.setattr(app, "get_entity_cache", lambda: cache)
+    monkeypatch.setattr(app, "MATTERMOST_FETCH_MODE", "archive")
+    monkeypatch.setitem(app.DATA_SOURCES, "Mattermost", archive_fetch)
+    for _ in range(2):
+        app.fetch_source_cached("Mattermost", "#atp")
+    assert calls == ["#atp", "#atp"]
+    assert cache.get('query_result', "Mattermost|#atp") is None
+
+
+def test_entries_expire_after_ttl(app, tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "time", lambda: now[0])
+    cache = app.EntityCache(path=str(tmp_path / "entity_cache.db"), ttl=60)
+    cache.set('redmine_record', 1, {'id': 1})
+    cache.set('redmine_record', 2, {'id': 2}, ttl=300)
+    assert cache.get_many('redmine_record', [1, 2]) == {1: {'id': 1}, 2: {'id': 2}}
+    
+    now[0] += 61
+    assert cache.get_many('redmine_record', [1, 2]) == {2: {'id': 2}}
+    assert cache.get_expiry('redmine_record', 1) is None
+    assert cache.get_expiry('redmine_record', 2) == 1300.0
+
+
+def test_memory_is_lru_bounded_and_disk_keeps_evicted(app, tmp_path):
+    memory_only = app.EntityCache(max_items=2)
+    for key in ("a", "b"):
+        memory_only.set('query_result', key, key)
+    memory_only.get('query_result', "a")  # "a" en son kullanılan olur, sıradaki çıkacak olan "b"
+    memory_only.set('query_result', "c", "c")
+    assert memory_only.get_many('query_result', ["a", "b", "c"]) == {"a": "a", "c": "c"}
+    
+    on_disk = app.EntityCache(path=str(tmp_path / "entity_cache.db"), max_items=1)
+    on_disk.set_many('query_result', {"a": "a", "b": "b"})
+    assert list(on_disk.memory) == [('query_result', "b")]
+    # Bellekten düşen kayıt diskten okunur; başka bir worker'ın önbelleği de aynı kaydı görür
+    assert on_disk.get('query_result', "a") == "a"
+    assert app.EntityCache(path=str(tmp_path / "entity_cache.db")).get('query_result', "b") == "b"
@@ -0,0 +1,43 @@
+"""
+İlk aramanın (süreç önbellekleri boşken) Streamlit arayüzü üzerinden hatasız tamamlandığını doğrular.
+Sunucu olarak benchmark.py'deki yerel Redmine/Mattermost taklidi kullanılır.
+"""
+from streamlit.testing.v1 import AppTest
+
+
+def app_script():
+    import interactive_search_app
+    interactive_search_app.main()
+
+
+def run_search(search_term):
+    at = AppTest.from_function(app_script, default_timeout=60)
+    at.run()
+    at.text_input[0].input(search_term)
+    next(button for button in at.button if button.label == "🔍 Ara").click()
+    at.run()
+    return at
+
+
+def test_first_search_after_cache_clear(benchmark_server):
+    import streamlit as st
+
+    # Yeni süreçteki ilk arama ve "Önbelleği Temizle" sonrası arama aynı durumdadır
+    for _ in range(2):
+        st.cache_resource.clear()
+        at = run_search("#atp")
+        assert not at.exception
+        assert not [error.value for error in at.error]
+        assert any("sonuç bulundu" in success.value for success in at.success)
+
+
+def test_failing_source_keeps_other_results(benchmark_server, monkeypatch):
+    import interactive_search_app as app
+
+    def failing_fetch(search_term, progress=None, on_rows=None):
+        raise RuntimeError("Mattermost kapalı")
+
+    monkeypatch.setitem(app.DATA_SOURCES, "Mattermost", failing_fetch)
+    df = app.get_all_data_fast("#rapor")
+    assert set(df['Source_Platform']) == {"Redmine"}
+    assert df.attrs['errors'] == {"Mattermost": "Mattermost kapalı"}
@@ -0,0 +1,39 @@
+"""
+Mattermost arşiv, tam API ve tembel (önizleme) modlarının aynı sonuç kümesini döndürmesi.
+"""
+import pytest
+
+
+@pytest.fixture
+def mattermost_mode(app, monkeypatch):
+    if not app.mattermost_archive_is_ready():
+        app.sync_mattermost_archive()
+    # Sınırın sıralamadan sonra uygulandığını görmek için sonuçlardan az tutulur
+    monkeypatch.setattr(app, "MATTERMOST_SEARCH_MAX_RESULTS", 20)
+    monkeypatch.setattr(app, "MATTERMOST_SEARCH_PAGE_SIZE", 10)
+    monkeypatch.setattr(app, "MATTERMOST_SEARCH_TIME_BUDGET", 0)
+    monkeypatch.setattr(app, "MATTERMOST_STATUS_MAX_PAGES", 0)
+    
+    def fetch(mode, lazy, search_term):
+        app.get_entity_cache().clear()
+        monkeypatch.setattr(app, "MATTERMOST_FETCH_MODE", mode)
+        monkeypatch.setattr(app, "MATTERMOST_LAZY_THREADS", lazy)
+        rows = app.fast_mattermost_fetch(search_term)
+        return [(row.id, row.status) for row in rows], rows.truncated
+    return fetch
+
+
+@pytest.mark.parametrize("search_term", ["rapor", "#atp", "#atp VEYA #yama", "rapor DEĞİL #atp"])
+def test_modes_return_same_threads(mattermost_mode, search_term):
+    archive = mattermost_mode('archive', False, search_term)
+    assert archive[0]
+    assert mattermost_mode('api', False, search_term) == archive
+    assert mattermost_mode('api', True, search_term) == archive
+
+
+def test_ranking_keeps_newest_threads(app):
+    ranking = app.MattermostThreadRanking(limit=2)
+    for thread_id, created in [("c", 10), ("a", 30), ("b", 30), ("c", 40), ("d", 5)]:
+        ranking.add(thread_id, created)
+    assert ranking.selected() == (["c", "a"], True)
+    assert ranking.is_exhausted(20) and not ranking.is_exhausted(30)
@@ -0,0 +1,57 @@
+"""
+Mattermost thread özetlerinin kök ID ile önbelleklenmesi ve güncellik doğrulaması (fresh_mattermost_threads).
+"""
+import pytest
+
+
+def summary(thread_id, version, status):
+    return {'id': thread_id, 'version': version, 'status': status}
+
+
+@pytest.fixture
+def thread_cache(app, monkeypatch):
+    cache = app.EntityCache()
+    requests_made = []
+    root_posts = {}
+    
+    def fake_request(method, path, stage=None, json=None):
+        requests_made.append(list(json))
+        if root_posts.get('error'):
+            raise app.requests.exceptions.ConnectionError("bağlantı yok")
+        return [root_posts[thread_id] for thread_id in json if thread_id in root_posts]
+    
+    monkeypatch.setattr(app, "get_entity_cache", lambda: cache)
+    monkeypatch.setattr(app, "mattermost_request", fake_request)
+    return cache, root_posts, requests_made
+
+
+def test_completed_threads_are_used_without_recheck(app, thread_cache):
+    cache, _, requests_made = thread_cache
+    app.cache_mattermost_thread("done", summary("done", 100, "tamamlandi"))
+    assert cache.get_expiry('mattermost_thread_summary', "done") == float('inf')
+    assert app.fresh_mattermost_threads({"done": 100}) == {"done": summary("done", 100, "tamamlandi")}
+    # Aramada özetten yeni bir post görüldüyse tamamlanmış özet de geçersizdir
+    assert app.fresh_mattermost_threads({"done": 150}) == {}
+    assert requests_made == []
+
+
+def test_in_progress_threads_are_rechecked_by_root_version(app, thread_cache):
+    _, root_posts, requests_made = thread_cache
+    app.cache_mattermost_thread("same", summary("same", 100, "devam_ediyor"))
+    app.cache_mattermost_thread("replied", summary("replied", 100, "devam_ediyor"))
+    app.cache_mattermost_thread("deleted", summary("deleted", 100, "devam_ediyor"))
+    root_posts.update({
+        "same": {'id': "same", 'create_at': 50, 'update_at': 100},
+        "replied": {'id': "replied", 'create_at': 50, 'update_at': 60, 'last_reply_at': 120},
+    })
+    
+    fresh = app.fresh_mattermost_threads({"same": 90, "replied": 90, "deleted": 90})
+    assert list(fresh) == ["same"]
+    assert requests_made == [["same", "replied", "deleted"]]
+
+
+def test_recheck_failure_refetches_in_progress_threads(app, thread_cache):
+    _, root_posts, _ = thread_cache
+    app.cache_mattermost_thread("open", summary("open", 100, "devam_ediyor"))
+    root_posts['error'] = True
+    assert app.fresh_mattermost_threads({"open": 100}) == {}
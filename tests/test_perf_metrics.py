@@ -0,0 +1,36 @@
+"""
+Performans izlerinin JSONL günlüğü (boyut sınırında döndürme) ve süreç bazlı Prometheus dosyası.
+"""
+import os
+
+
+def finish_trace(app):
+    trace = app.SearchTrace("test")
+    with app.search_trace_scope(trace):
+        with app.perf_span("test.stage") as span:
+            span['items'] = 3
+    return app.finish_search_trace(trace)
+
+
+def test_perf_outputs_are_off_by_default(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    finish_trace(app)
+    assert os.listdir(tmp_path) == []
+
+
+def test_perf_log_rotates_at_size_limit(app, tmp_path, monkeypatch):
+    log_path = str(tmp_path / "search_metrics.jsonl")
+    monkeypatch.setattr(app, "PERF_LOG_PATH", log_path)
+    monkeypatch.setattr(app, "PERF_LOG_MAX_BYTES", 200)
+    monkeypatch.setattr(app, "PERF_LOG_BACKUPS", 2)
+    for _ in range(10):
+        finish_trace(app)
+    assert sorted(os.listdir(tmp_path)) == ["search_metrics.jsonl", "search_metrics.jsonl.1", "search_metrics.jsonl.2"]
+    assert all(os.path.getsize(tmp_path / name) < 400 for name in os.listdir(tmp_path))
+
+
+def test_prometheus_file_is_per_process(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "PERF_METRICS_PATH", str(tmp_path / "search_metrics.prom"))
+    finish_trace(app)
+    metrics_path = tmp_path / f"search_metrics.{os.getpid()}.prom"
+    assert f'search_stage_items_total{{stage="test.stage",pid="{os.getpid()}"}}' in metrics_path.read_text(encoding='utf-8')
@@ -0,0 +1,41 @@
+"""
+Sık aranan terimlerin arka plan ön yüklemesi: worker'lar arası kira ve kaynak seçimi.
+"""
+
+
+def test_lease_is_held_by_one_owner(app, tmp_path):
+    path = str(tmp_path / "entity_cache.db")
+    first, second = app.EntityCache(path=path), app.EntityCache(path=path)
+    assert first.acquire_lease('prefetch', '1', ttl=60)
+    assert not second.acquire_lease('prefetch', '2', ttl=60)
+    assert first.acquire_lease('prefetch', '1', ttl=60)
+    # Süresi dolan kira başka bir worker'a geçer
+    assert first.acquire_lease('prefetch', '1', ttl=-1)
+    assert second.acquire_lease('prefetch', '2', ttl=60)
+
+
+def test_prefetch_skips_without_lease(app, tmp_path, monkeypatch):
+    cache = app.EntityCache(path=str(tmp_path / "entity_cache.db"))
+    stats = app.SearchStats()
+    stats.record("#atp")
+    fetched = []
+    monkeypatch.setattr(app, "get_entity_cache", lambda: cache)
+    monkeypatch.setattr(app, "get_search_stats", lambda: stats)
+    monkeypatch.setattr(app, "fetch_source_cached", lambda source, term: fetched.append((source, term)) or [])
+    
+    cache.acquire_lease(app.PREFETCH_LEASE_NAME, 'another-worker', ttl=60)
+    assert app.prefetch_popular_searches() == 0
+    assert fetched == []
+
+
+def test_prefetch_mattermost_only_for_hashtags(app, monkeypatch):
+    stats = app.SearchStats()
+    for term in ("#atp", "yama notu"):
+        stats.record(term)
+    fetched = []
+    monkeypatch.setattr(app, "get_entity_cache", lambda: app.EntityCache())
+    monkeypatch.setattr(app, "get_search_stats", lambda: stats)
+    monkeypatch.setattr(app, "fetch_source_cached", lambda source, term: fetched.append((source, term)) or [])
+    
+    assert app.prefetch_popular_searches() == 3
+    assert sorted(fetched) == [("Mattermost", "#atp"), ("Redmine", "#atp"), ("Redmine", "yama notu")]
@@ -0,0 +1,56 @@
+"""
+Çok terimli arama sorgusu ayrıştırıcısı (parse_search_query) ve chatbot sorgu dönüşümü.
+"""
+import pytest
+
+
+@pytest.mark.parametrize("text, message", [
+    ("NOT #atp", "en az bir aranan"),
+    ("#atp DEĞİL", "bir terim bekleniyordu"),
+    ("#atp OR", "bir terim bekleniyordu"),
+    ("(#atp OR #yama", "Kapanmamış parantez"),
+    ("#atp OR #yama)", r"Beklenmeyen '\)'"),
+])
+def test_invalid_operator_query_raises(app, text, message):
+    with pytest.raises(ValueError, match=message):
+        app.parse_search_query(text)
+
+
+@pytest.mark.parametrize("text", ["yama ve test", "yama veya test", "yama not", "ATP (test)", "ATP (", "-foo"])
+def test_query_without_operators_is_literal(app, text):
+    query = app.parse_search_query(text)
+    assert query.is_single
+    assert query.texts == (text,)
+
+
+def test_operators_enable_parentheses_and_negation(app):
+    query = app.parse_search_query("#atp VE -#test VEYA (#yama AND NOT #eski)")
+    assert query.terms == ('#atp', '#test', '#yama', '#eski')
+    assert query.positive_terms == ('#atp', '#yama')
+    assert query.matches([True, False, False, False])
+    assert not query.matches([True, True, False, False])
+    assert query.matches([False, True, True, False])
+
+
+@pytest.mark.parametrize("text, canonical", [
+    ("#atp", "#atp"),
+    ("#atp #yama", "#atp AND #yama"),
+    ("#atp VEYA #yama VE DEĞİL #test", "#atp OR (#yama AND NOT #test)"),
+    ("(#atp OR #yama) AND #test", "(#atp OR #yama) AND #test"),
+    ("#atp -foo", '#atp AND "-foo"'),
+    ('"NOT" AND #atp', '"NOT" AND #atp'),
+])
+def test_canonical_is_stable(app, text, canonical):
+    assert app.parse_search_query(text).canonical() == canonical
+    assert app.parse_search_query(canonical).canonical() == canonical
+
+
+@pytest.mark.parametrize("query, search_term", [
+    ("#atp değil", "#atp"),
+    ("#atp veya #yama", "#atp OR #yama"),
+    ("#atp ve #yama hariç", "#atp AND NOT #yama"),
+    ("(#atp) raporu", "#atp"),
+    ("hashtag yok", None),
+])
+def test_chatbot_search_term(app, query, search_term):
+    assert app.build_chatbot_search_term(query) == search_term
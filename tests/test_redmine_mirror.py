@@ -0,0 +1,65 @@
+"""
+Redmine yerel aynası: eşitleme, silinen issue'ların temizlenmesi ve Türkçe katlanmış trigram araması.
+"""
+import pytest
+
+
+@pytest.fixture
+def mirror(app, benchmark_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "REDMINE_MIRROR_PATH", str(tmp_path / "redmine_mirror.db"))
+    app.sync_redmine_mirror(force=True)
+    return benchmark_server
+
+
+def test_reconcile_removes_deleted_issues(app, mirror, monkeypatch):
+    deleted = mirror.issues[-1]
+    monkeypatch.setattr(mirror, "issues", mirror.issues[:-1])
+    monkeypatch.delitem(mirror.issues_by_id, deleted['id'])
+    
+    # Sunucudaki issue sayısı aynadakinden az olduğu için eşitleme tam listeyle yapılır
+    app.sync_redmine_mirror(force=True)
+    conn = app.open_redmine_mirror()
+    try:
+        ids = {row[0] for row in conn.execute("SELECT id FROM issues")}
+        fts_ids = {row[0] for row in conn.execute("SELECT rowid FROM issues_fts")}
+    finally:
+        conn.close()
+    assert deleted['id'] not in ids and deleted['id'] not in fts_ids
+    assert ids == {issue['id'] for issue in mirror.issues}
+
+
+def test_mirror_search_runs_without_network(app, mirror, monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError("ayna modunda arama sunucuya gitmemeli")
+    
+    monkeypatch.setattr(app, "REDMINE_FETCH_MODE", "mirror")
+    monkeypatch.setattr(app, "start_redmine_mirror_sync", lambda: None)
+    monkeypatch.setattr(app, "redmine_server_search", no_network)
+    monkeypatch.setattr(app, "sync_redmine_mirror", no_network)
+    assert app.redmine_mirror_last_sync() is not None
+    assert app.fast_redmine_fetch("rapor")
+
+
+@pytest.mark.parametrize("search_term, ids", [
+    ("ılık", [1, 2, 3]),
+    ("ILIK", [1, 2, 3]),
+    ("İlik", [1, 2, 3]),
+    ("yaması", [2]),
+    ("li", [1, 2, 3, 4]),
+    ("ılık DEĞİL yama", [1, 3]),
+    ('"ılık su"', [1]),
+])
+def test_mirror_search_folds_turkish_case(app, tmp_path, monkeypatch, search_term, ids):
+    monkeypatch.setattr(app, "REDMINE_MIRROR_PATH", str(tmp_path / "redmine_mirror.db"))
+    conn = app.open_redmine_mirror()
+    try:
+        app.upsert_redmine_mirror_rows(conn, [
+            (1, "ILIK su", "", "Bug", "New", "Ali", None, None),
+            (2, "Rapor", "İlik YAMASI", "Bug", "New", "Ali", None, None),
+            (3, "ılıktı", "", "Bug", "New", "Ali", None, None),
+            (4, "Liste", "", "Bug", "New", "Ali", None, None),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    assert [row.id for row in app.search_redmine_mirror(search_term)] == ids
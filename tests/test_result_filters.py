@@ -0,0 +1,44 @@
+"""
+Manuel arama, chatbot ve rapor yollarının ortak filtre motoru (apply_result_filters).
+"""
+import datetime
+
+import pytest
+
+
+def timestamp(day):
+    return datetime.datetime(2024, 1, day, 12, 0).replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+@pytest.fixture
+def results(app):
+    return app.records_to_frame([
+        app.ResultRecord("Redmine", 1, "Bug", "ILIK su", "Yama notu", "Ali", timestamp(1)),
+        app.ResultRecord("Mattermost", "t1", "Mattermost Thread", "İlik rapor", "", "Ayşe", timestamp(5),
+                         channel_id="c1", status="tamamlandi"),
+        app.ResultRecord("Mattermost", "t2", "Mattermost Thread", "Rapor", "ılık", "Veli", timestamp(10),
+                         channel_id="c1", status="devam_ediyor"),
+    ])
+
+
+def test_no_filters_returns_same_frame(app, results):
+    assert app.apply_result_filters(results) is results
+
+
+def test_text_filter_is_turkish_case_insensitive(app, results):
+    assert list(app.apply_result_filters(results, text_filter="ılık")['ID']) == [1, "t1", "t2"]
+    assert list(app.apply_result_filters(results, text_filter="YAMA")['ID']) == [1]
+
+
+def test_status_filter_keeps_or_drops_other_platforms(app, results):
+    assert list(app.apply_result_filters(results, status_filter="Tamamlanan")['ID']) == [1, "t1"]
+    assert list(app.apply_result_filters(
+        results, status_filter="Devam Eden", status_filter_keeps_other_platforms=False
+    )['ID']) == ["t2"]
+
+
+def test_platform_and_date_filters_combine(app, results):
+    filtered = app.apply_result_filters(
+        results, platform_filter="Mattermost", start_date=datetime.date(2024, 1, 5), end_date=datetime.date(2024, 1, 5)
+    )
+    assert list(filtered['ID']) == ["t1"]